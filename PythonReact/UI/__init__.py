@@ -10,8 +10,14 @@ directly X.org, Mir or Wayland.
 """
 
 from .renderedobject import *
+from .lazycontent import *
+from .diff import *
+from .interner import *
 from .events import *
 from .element import *
+from .rendering import *
+from .scheduler import *
+from .pureelement import *
 from .container import *
 from .button import *
 from .label import *
@@ -22,3 +28,8 @@ from .separator import *
 from .image import *
 from .frame import *
 from .form import *
+from .deferred import *
+from .document import *
+from .slot import *
+from .virtuallist import *
+from .table import *
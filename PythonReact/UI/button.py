@@ -61,10 +61,16 @@ class Button(UI.Container):
     def set_click_event(self, onclick):
         """Sets the button's onclick event."""
         self._onclick = onclick
+        self.mark_dirty()
 
     def emit_click_event(self, *args, **kwargs):
-        """Calls the button's onclick event"""
-        return self._onclick(*args, **kwargs)
+        """Calls the button's onclick event.
+
+        The state updates done by the handler are batched (see
+        UI.batched_updates).
+        """
+        with UI.batched_updates():
+            return self._onclick(*args, **kwargs)
 
     def emit(self, event_name, *args, **kwargs):
         """Override of UI.Element.emit"""
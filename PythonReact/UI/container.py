@@ -22,27 +22,58 @@ class Container(UI.Element):
 
         The optional arguments are:
 
-        * "items": A list with the block childs.
+        * "items": A list with the block childs. It can also be any other
+        iterable, like a generator, or an UI.LazyContent: then the items
+        are created and rendered only when the rendered container is
+        converted (see UI.LazyContent).
         * "style": the element's style classes (inherited)
         """
         super().__init__(*args, **kwargs)
 
         # Get the arguments or, it's default values
-        self._items = super().register_argument("items", [])
+        items = super().register_argument("items", [])
+        if isinstance(items, (list, tuple)):
+            self._items = list(items)
+            for item in self._items:
+                UI.Element.add_parent(item, self)
+        elif isinstance(items, UI.LazyContent):
+            self._items = items
+        else:
+            self._items = UI.LazyContent(items)
 
     def get_items(self):
-        """Gets all container childs in a list."""
+        """Gets all container childs in a list (or an UI.LazyContent)."""
         return self._items
 
+    def is_lazy(self):
+        """Returns True if the items are an UI.LazyContent."""
+        return isinstance(self._items, UI.LazyContent)
+
     def add(self, *elements):
         """Adds an element to this block."""
 
-        for element in elements:
-            self._items.append(element)
+        if self.is_lazy():
+            self._items = self._items + list(elements)
+            for element in elements:
+                UI.Element.add_parent(element, self)
+        else:
+            for element in elements:
+                self._items.append(element)
+                UI.Element.add_parent(element, self)
+        self.mark_dirty()
 
     def get_rendered_items(self):
-        """Like get_items, but the returned list contains the rendered items"""
-        return [i.render() for i in self._items]
+        """Like get_items, but the returned list contains the rendered items.
+
+        When called from a render method, the items may be rendered after
+        this method returns (see UI.render_items).
+
+        If the items are lazy, returns an UI.LazyContent that renders each
+        item when it's iterated.
+        """
+        if self.is_lazy():
+            return self._items.map(_render_item)
+        return UI.render_items(self._items)
 
     def render(self):
         # First: get the RenderedObject arguments:
@@ -63,3 +94,9 @@ class Container(UI.Element):
             inner_content = rendered_items
         )
         return result
+
+def _render_item(item):
+    """Renders item if it's an element (see Container.get_rendered_items)."""
+    if isinstance(item, UI.Element):
+        return UI.render_tree(item)
+    return item
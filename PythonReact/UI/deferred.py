@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Deferred element, a wrapper for slow elements.
+
+When an abstract tree is streamed (see engines.html.TreeToHTML.iter_html),
+the deferred elements are not rendered in place: a placeholder is sent
+instead, and the element is rendered and sent at the end of the document.
+So a slow element does not delay the rest of the document.
+
+The wrapped element is not saved in the properties of the rendered
+object, they only have an unique id (the "deferred" property), so the
+rendered tree can still be exported to XML, JSON or binary, compared and
+hashed. The element is kept apart, see deferred_element.
+"""
+
+import itertools
+
+from PythonReact import UI
+
+__all__ = ["Deferred", "deferred_element"]
+
+# The ids of the rendered deferred elements
+_ids = itertools.count(1)
+
+class Deferred(UI.Element):
+    """Represents the Deferred element, a wrapper for slow elements.
+
+    The wrapped element is not rendered when the Deferred element is
+    rendered, but when the engine converts it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new Deferred.
+
+        The optional arguments are:
+
+        * "element": The wrapped element.
+        * "fallback": An element (or a string) displayed in the
+        placeholder, until the wrapped element is ready.
+        """
+        super().__init__(*args, **kwargs)
+
+        # Get the arguments or, it's default values
+        self._element = super().register_argument("element", None)
+        self._fallback = super().register_argument("fallback", "")
+
+        if self._element is not None:
+            UI.Element.add_parent(self._element, self)
+        if isinstance(self._fallback, UI.Element):
+            UI.Element.add_parent(self._fallback, self)
+
+    def get_element(self):
+        """Gets the wrapped element"""
+        return self._element
+
+    def render(self):
+        # First: get the RenderedObject arguments:
+        arguments = self.extend_properties({})
+        # Each result is different: the wrapped element may be changed
+        # without changing the fallback
+        arguments["deferred"] = next(_ids)
+
+        # Only the fallback is rendered now
+        if isinstance(self._fallback, UI.Element):
+            rendered_items = UI.render_items([self._fallback])
+        else:
+            rendered_items = [self._fallback]
+
+        # Render this block and return
+        result = UI.RenderedObject(
+            tag_name = "deferred",
+            properties = arguments,
+            inner_content = rendered_items
+        )
+
+        # The wrapped element is not a property, see deferred_element
+        result._element = self._element
+        return result
+
+def deferred_element(node):
+    """Returns the element wrapped by a rendered Deferred element.
+
+    node is the RenderedObject (with the "deferred" tag) returned by
+    Deferred.render. The element is saved in node, but not in it's
+    properties: it's not exported, compared, hashed nor pickled. Returns
+    None if the Deferred element have no element, or if node was copied
+    (like with pickle).
+    """
+    return node._element
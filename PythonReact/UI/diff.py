@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the diff engine for RenderedObject trees.
+
+The diff function compares two RenderedObject trees (generally, two
+renders of the same element) and returns the list of patches that
+transforms the old tree into the new one. The patches can be applied
+to a tree using apply_patches, or sent to other process (like a web
+browser) that holds a copy of the old tree.
+
+The patch operations are:
+
+PATCH_INSERT - Inserts the node "value" at "path".
+PATCH_REMOVE - Removes the node at "path".
+PATCH_REPLACE - Replaces the node at "path" with the node "value".
+PATCH_SET_ATTRIBUTE - Sets the attribute "name" of the node at "path"
+to "value".
+PATCH_REMOVE_ATTRIBUTE - Removes the attribute "name" of the node at
+"path".
+PATCH_SET_TEXT - Replaces the text node at "path" with the text "value".
+PATCH_MOVE - Moves the node at "path" to the index "value" of the same
+parent (the index is counted after removing the node).
+
+A path is a tuple with the indexes of the childs from the root to the
+node (the root's path is the empty tuple). The nodes with lazy childs
+(see UI.LazyContent) are never compared: they are always replaced. The patches must be applied
+in order, and each path refers to the tree as it is after applying all
+the previous patches.
+"""
+
+import bisect
+
+from PythonReact import UI
+
+__all__ = [
+    "PATCH_INSERT", "PATCH_REMOVE", "PATCH_REPLACE", "PATCH_SET_ATTRIBUTE",
+    "PATCH_REMOVE_ATTRIBUTE", "PATCH_SET_TEXT", "PATCH_MOVE",
+    "Patch", "diff", "apply_patches",
+]
+
+PATCH_INSERT = "insert"
+PATCH_REMOVE = "remove"
+PATCH_REPLACE = "replace"
+PATCH_SET_ATTRIBUTE = "set-attribute"
+PATCH_REMOVE_ATTRIBUTE = "remove-attribute"
+PATCH_SET_TEXT = "set-text"
+PATCH_MOVE = "move"
+
+class Patch:
+    """Represents one change between two RenderedObject trees.
+
+    See the module documentation for the meaning of each operation.
+    """
+
+    __slots__ = ("op", "path", "name", "value")
+
+    def __init__(self, op, path, name = None, value = None):
+        """Creates the new Patch.
+
+        op is one of the PATCH_*, path is a tuple of indexes, name is the
+        attribute name (only for the attribute patches) and value is the
+        new node, text or attribute value.
+        """
+        self.op = op
+        self.path = path
+        self.name = name
+        self.value = value
+
+    def __eq__(self, other):
+        if not isinstance(other, Patch):
+            return NotImplemented
+        return (
+            (self.op == other.op) and (self.path == other.path) and
+            (self.name == other.name) and (self.value == other.value)
+        )
+
+    def __repr__(self):
+        return "Patch(" + repr(self.op) + ", " + repr(self.path) + ", " + \
+            repr(self.name) + ", " + repr(self.value) + ")"
+
+def diff(old, new):
+    """Compares the old and new RenderedObject trees.
+
+    Returns a list of Patch that transforms old into new. Nodes with the
+    same tag name are updated in place (only the changed attributes and
+    childs generate patches). The childs are matched by their "key"
+    property (see the "key" argument of UI.Element) if they have one, and
+    by position otherwise.
+
+    Subtrees that are the same object in both trees are not compared, so
+    reusing the RenderedObjects of the unchanged elements makes the diff
+    faster. Each node is visited at most once, so the time is linear in
+    the size of the trees.
+    """
+    patches = []
+    # Each item of the stack is a tuple (old node, new node, path)
+    stack = [(old, new, ())]
+    while stack:
+        old_node, new_node, path = stack.pop()
+        if old_node is new_node:
+            continue
+
+        old_is_node = isinstance(old_node, UI.RenderedObject)
+        new_is_node = isinstance(new_node, UI.RenderedObject)
+
+        if old_is_node and new_is_node and \
+           (old_node.tag_name() == new_node.tag_name()) and \
+           (type(old_node.inner_content()) is list) and \
+           (type(new_node.inner_content()) is list):
+            _diff_properties(old_node, new_node, path, patches)
+            _diff_childs(old_node, new_node, path, patches, stack)
+        elif (not old_is_node) and (not new_is_node):
+            if (type(old_node) is not type(new_node)) or (old_node != new_node):
+                patches.append(Patch(PATCH_SET_TEXT, path, value = new_node))
+        else:
+            patches.append(Patch(PATCH_REPLACE, path, value = new_node))
+
+    return patches
+
+def _diff_properties(old_node, new_node, path, patches):
+    """Appends the patches for the attributes of two nodes."""
+    old_properties = old_node.properties()
+    new_properties = new_node.properties()
+    for key, value in new_properties.items():
+        if (key not in old_properties) or (old_properties[key] != value):
+            patches.append(Patch(PATCH_SET_ATTRIBUTE, path, key, value))
+    for key in old_properties:
+        if key not in new_properties:
+            patches.append(Patch(PATCH_REMOVE_ATTRIBUTE, path, key))
+
+def _diff_childs(old_node, new_node, path, patches, stack):
+    """Appends the patches for the childs of two nodes.
+
+    The pairs of childs that should be compared are pushed to stack.
+    """
+    old_childs = old_node.inner_content()
+    new_childs = new_node.inner_content()
+
+    if _have_keys(old_childs) or _have_keys(new_childs):
+        if _diff_keyed_childs(old_childs, new_childs, path, patches, stack):
+            return
+
+    common = min(len(old_childs), len(new_childs))
+
+    # The extra old childs are removed from the last to the first, so the
+    # indexes of the others does not change
+    for index in range(len(old_childs) - 1, common - 1, -1):
+        patches.append(Patch(PATCH_REMOVE, path + (index,)))
+    for index in range(common, len(new_childs)):
+        patches.append(Patch(PATCH_INSERT, path + (index,), value = new_childs[index]))
+
+    # The stack is LIFO: push in reverse order, so the patches are in
+    # document order
+    for index in range(common - 1, -1, -1):
+        stack.append((old_childs[index], new_childs[index], path + (index,)))
+
+def _have_keys(childs):
+    """Returns True if at least one child has a "key" property."""
+    for child in childs:
+        if isinstance(child, UI.RenderedObject) and ("key" in child.properties()):
+            return True
+    return False
+
+def _child_keys(childs):
+    """Returns a list with the key of each child.
+
+    The childs with a "key" property are identified by it, the others
+    by their position among the childs without key.
+
+    Returns None if two childs have the same key.
+    """
+    keys = []
+    unkeyed = 0
+    for child in childs:
+        if isinstance(child, UI.RenderedObject) and ("key" in child.properties()):
+            keys.append((True, child.properties()["key"]))
+        else:
+            keys.append((False, unkeyed))
+            unkeyed += 1
+    if len(set(keys)) != len(keys):
+        return None
+    return keys
+
+def _diff_keyed_childs(old_childs, new_childs, path, patches, stack):
+    """Like _diff_childs, but matches the childs by their keys.
+
+    The old childs without a match are removed, the new ones are inserted
+    and the others are moved. Only the childs that are not in the longest
+    increasing subsequence (of their old indexes) are moved, so moving a
+    few childs in a big list generates a few patches.
+
+    Returns False (and does nothing) if the keys can not be used.
+    """
+    old_keys = _child_keys(old_childs)
+    new_keys = _child_keys(new_childs)
+    if (old_keys is None) or (new_keys is None):
+        return False
+
+    old_index_of = {key: index for index, key in enumerate(old_keys)}
+    # sources[j] is the old index of the new child j, or -1 if it's new
+    sources = [old_index_of.get(key, -1) for key in new_keys]
+
+    # Remove the old childs without a match, from the last to the first
+    matched = set(sources)
+    for index in range(len(old_childs) - 1, -1, -1):
+        if index not in matched:
+            patches.append(Patch(PATCH_REMOVE, path + (index,)))
+
+    # The positions of the childs are computed (without building the list
+    # of current childs) from the unplaced matched childs, which keep
+    # their old order, and the placed childs (the ones already walked
+    # below). Each placed child is just after the unplaced childs whose
+    # old index is lower than it's bound: it's old index if it never
+    # moves, or the bound of the child it was placed before.
+    count = len(old_childs)
+    unplaced = _Counter(count + 1)
+    placed = _Counter(count + 1)
+    # The number of current childs
+    total = 0
+    for index in matched:
+        if index != -1:
+            unplaced.add(index, 1)
+            total += 1
+    stable = _longest_increasing_subsequence([i for i in sources if i != -1])
+
+    # Walk the new childs from the last to the first, placing each child
+    # before the next one (the anchor). The stable childs are already in
+    # the right order, so they never move.
+    anchor_bound = None
+    for index in range(len(new_childs) - 1, -1, -1):
+        source = sources[index]
+        if source == -1:
+            if anchor_bound is None:
+                position = total
+                bound = count
+            else:
+                position = unplaced.count_below(anchor_bound)
+                bound = anchor_bound
+            total += 1
+            patches.append(Patch(PATCH_INSERT, path + (position,),
+                                 value = new_childs[index]))
+        elif source in stable:
+            bound = source
+            unplaced.add(source, -1)
+        else:
+            old_position = unplaced.count_below(source) + \
+                placed.count_below(source + 1)
+            unplaced.add(source, -1)
+            if anchor_bound is None:
+                position = total - 1
+                bound = count
+            else:
+                position = unplaced.count_below(anchor_bound)
+                bound = anchor_bound
+            patches.append(Patch(PATCH_MOVE, path + (old_position,),
+                                 value = position))
+        placed.add(bound, 1)
+        anchor_bound = bound
+
+    # Now the childs are in their new order, compare the matched ones
+    for index in range(len(new_childs) - 1, -1, -1):
+        if sources[index] != -1:
+            stack.append((old_childs[sources[index]], new_childs[index],
+                          path + (index,)))
+
+    return True
+
+class _Counter:
+    """Counts integers in range(size) (a Fenwick tree).
+
+    Both add and count_below run in O(log size) time.
+    """
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size):
+        self._tree = [0] * (size + 1)
+
+    def add(self, value, delta):
+        """Adds delta to the count of value."""
+        tree = self._tree
+        index = value + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & (-index)
+
+    def count_below(self, value):
+        """Returns the count of the integers lower than value."""
+        tree = self._tree
+        result = 0
+        index = value
+        while index > 0:
+            result += tree[index]
+            index -= index & (-index)
+        return result
+
+def _longest_increasing_subsequence(sequence):
+    """Returns a set with the items of a longest increasing subsequence.
+
+    sequence is a list of distinct integers. Runs in O(n log n) time.
+    """
+    # tails[k] is the index (in sequence) of the smallest tail of all
+    # increasing subsequences of length k + 1
+    tails = []
+    tail_values = []
+    previous = [-1] * len(sequence)
+    for index, value in enumerate(sequence):
+        position = bisect.bisect_left(tail_values, value)
+        if position > 0:
+            previous[index] = tails[position - 1]
+        if position == len(tails):
+            tails.append(index)
+            tail_values.append(value)
+        else:
+            tails[position] = index
+            tail_values[position] = value
+
+    result = set()
+    index = tails[-1] if tails else -1
+    while index != -1:
+        result.add(sequence[index])
+        index = previous[index]
+    return result
+
+def apply_patches(tree, patches):
+    """Applies the patches (a list of Patch) to the RenderedObject tree.
+
+    The tree is modified in place (so, if it's shared with other
+    tree, the other tree will be modified too).
+
+    Returns the patched tree, which is a different object only if the
+    root was replaced.
+    """
+    for patch in patches:
+        op = patch.op
+        if op == PATCH_SET_ATTRIBUTE:
+            _locate(tree, patch.path).properties()[patch.name] = patch.value
+        elif op == PATCH_REMOVE_ATTRIBUTE:
+            del _locate(tree, patch.path).properties()[patch.name]
+        elif len(patch.path) == 0:
+            # Only replaces can change the root
+            tree = patch.value
+        else:
+            childs = _locate(tree, patch.path[:-1]).inner_content()
+            index = patch.path[-1]
+            if op == PATCH_INSERT:
+                childs.insert(index, patch.value)
+            elif op == PATCH_REMOVE:
+                del childs[index]
+            elif (op == PATCH_REPLACE) or (op == PATCH_SET_TEXT):
+                childs[index] = patch.value
+            elif op == PATCH_MOVE:
+                childs.insert(patch.value, childs.pop(index))
+            else:
+                raise ValueError("Unknown patch operation " + str(op))
+    return tree
+
+def _locate(tree, path):
+    """Returns the node of tree at path.
+
+    The node (or it's childs) will be changed, so the cached hashes (see
+    RenderedObject.__hash__) and fingerprints (see
+    engines.html.FragmentCache) of the nodes in the path are cleared.
+    """
+    node = tree
+    node._hash = None
+    node._fingerprint = None
+    for index in path:
+        node = node.inner_content()[index]
+        node._hash = None
+        node._fingerprint = None
+    return node
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Document element, the root of a full page.
+
+The Document declares the head of the page (title, meta tags, stylesheets
+and scripts) and contains the body element. The head does not depend on
+the body, so the engines can send it before rendering the body (see
+engines.html.TreeToHTML.iter_document): the browser starts downloading the
+stylesheets and scripts while the body is rendered.
+"""
+
+from PythonReact import UI
+
+class Document(UI.Element):
+    """Represents the Document element, the root of a full page."""
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new Document.
+
+        The optional arguments are:
+
+        * "title": The title of the page.
+        * "body": The element displayed in the page.
+        * "lang": The language of the page, like "en".
+        * "charset": The character encoding of the page, "utf-8" by default.
+        * "meta": A dictionary with the meta tags (name: content).
+        * "stylesheets": A list with the URLs of the stylesheets.
+        * "scripts": A list with the URLs of the scripts. The scripts are
+        downloaded at the same time as the page, and executed after it's
+        loaded (in order).
+        * "preload": A list of (URL, type) pairs with other resources used
+        by the page, like ("logo.png", "image") or ("font.woff2", "font").
+        """
+        super().__init__(*args, **kwargs)
+
+        # Get the arguments or, it's default values
+        self._title = super().register_argument("title", "")
+        self._body = super().register_argument("body", "")
+        self._lang = super().register_argument("lang", None)
+        self._charset = super().register_argument("charset", "utf-8")
+        self._meta = dict(super().register_argument("meta", {}))
+        self._stylesheets = list(super().register_argument("stylesheets", []))
+        self._scripts = list(super().register_argument("scripts", []))
+        self._preload = list(super().register_argument("preload", []))
+
+        if isinstance(self._body, UI.Element):
+            UI.Element.add_parent(self._body, self)
+
+    def extend_properties(self, arguments):
+        """Overload of UI.Element.extend_properties"""
+
+        arguments = super().extend_properties(arguments)
+
+        if self._lang is not None:
+            arguments["lang"] = self._lang
+
+        return arguments
+
+    def set_title(self, title):
+        """Sets the page's title"""
+        self._title = title
+        self.mark_dirty()
+
+    def get_title(self):
+        """Gets the page's title"""
+        return self._title
+
+    def set_body(self, body):
+        """Sets the element displayed in the page"""
+        if isinstance(self._body, UI.Element) and (self._body is not body):
+            UI.Element.remove_parent(self._body, self)
+        self._body = body
+        if isinstance(body, UI.Element):
+            UI.Element.add_parent(body, self)
+        self.mark_dirty()
+
+    def get_body(self):
+        """Gets the element displayed in the page"""
+        return self._body
+
+    def set_meta(self, name, content):
+        """Sets the content of the meta tag name"""
+        self._meta[name] = content
+        self.mark_dirty()
+
+    def get_meta(self):
+        """Gets the meta tags as a dictionary"""
+        return self._meta
+
+    def add_stylesheet(self, url):
+        """Adds a stylesheet to the page"""
+        self._stylesheets.append(url)
+        self.mark_dirty()
+
+    def get_stylesheets(self):
+        """Gets the list of stylesheets"""
+        return self._stylesheets
+
+    def add_script(self, url):
+        """Adds a script to the page"""
+        self._scripts.append(url)
+        self.mark_dirty()
+
+    def get_scripts(self):
+        """Gets the list of scripts"""
+        return self._scripts
+
+    def add_preload(self, url, kind):
+        """Adds a resource to preload"""
+        self._preload.append((url, kind))
+        self.mark_dirty()
+
+    def get_preload(self):
+        """Gets the list of resources to preload"""
+        return self._preload
+
+    def render_head(self):
+        """Renders the head of the page.
+
+        The head never contains elements, so the returned RenderedObject
+        is always complete.
+        """
+        head = [UI.RenderedObject("meta", {"charset": self._charset}, [])]
+        for name, content in self._meta.items():
+            # The "name" property is the id of the nodes
+            head.append(UI.RenderedObject("meta", {"meta-name": name, "content": content}, []))
+        head.append(UI.RenderedObject("document-title", {}, [self._title]))
+        for url in self._stylesheets:
+            head.append(UI.RenderedObject("stylesheet", {"href": url}, []))
+        for url, kind in self._preload:
+            head.append(UI.RenderedObject("preload", {"href": url, "as": kind}, []))
+        for url in self._scripts:
+            head.append(UI.RenderedObject("script", {"src": url}, []))
+
+        return UI.RenderedObject("document-head", {}, head)
+
+    def render(self):
+        # First: get the RenderedObject arguments:
+        arguments = self.extend_properties({})
+
+        # The body is the only element
+        body = UI.RenderedObject("document-body", {}, UI.render_items([self._body]))
+
+        # Render this block and return
+        result = UI.RenderedObject(
+            tag_name = "document",
+            properties = arguments,
+            inner_content = [self.render_head(), body]
+        )
+        return result
@@ -28,12 +28,23 @@ class Element:
 
         * "style": A list of strings containing the element's class names.
         * "name": A string containing the element's name (or ID).
+        * "key": A value that identifies the element between it's siblings.
+          When a container is rendered again, the childs with the same key
+          are matched (see UI.diff), even if they changed of position.
         """
 
         self._args = kwargs
         self._kargs = []
-        self._styles = self.register_argument("style", [])
+        # The lists are copied, so the element never shares them with the
+        # caller (or with other elements)
+        self._styles = list(self.register_argument("style", []))
         self._name = self.register_argument("name", "")
+        self._key = self.register_argument("key", None)
+        # The containers of this element and the dirty flag (see mark_dirty)
+        self._parents = []
+        self._dirty = True
+        # The state, see set_state
+        self._state = {}
 
     def register_argument(self, name, otherwise):
         """Gets and registers a keyword name.
@@ -85,6 +96,8 @@ class Element:
 
         arguments["style"] = self.class_list_as_css_string()
         arguments["name"] = self.get_name()
+        if self._key is not None:
+            arguments["key"] = self._key
 
         return arguments
 
@@ -98,6 +111,7 @@ class Element:
     def add_class(self, class_):
         """Adds a new class style to this element"""
         self._styles.append(str(class_))
+        self.mark_dirty()
 
     def remove_class(self, class_):
         """Removes a class from the class style of this element
@@ -111,6 +125,7 @@ class Element:
         except ValueError:
             return False
         else:
+            self.mark_dirty()
             return True
 
     def have_class(self, class_):
@@ -139,10 +154,122 @@ class Element:
     def set_name(self, name):
         """Sets the element's name or ID"""
         self._name = name
+        self.mark_dirty()
+
+    def get_key(self):
+        """Returns the element's key (None if it doesn't have one)"""
+        return self._key
 
     def set_class_list(self, lst):
         """Sets the element's style classes to lst (a list)"""
-        self._styles = lst
+        self._styles = list(lst)
+        self.mark_dirty()
+
+    def add_parent(self, parent):
+        """Registers parent (an Element) as a container of this element.
+
+        The containers call this method for each one of their childs,
+        so the changes of the childs can mark the containers as dirty.
+        """
+        parents = getattr(self, "_parents", None)
+        if parents is None:
+            parents = self._parents = []
+        for registered in parents:
+            if registered is parent:
+                return
+        parents.append(parent)
+
+    def remove_parent(self, parent):
+        """Unregisters parent (an Element) as a container of this element.
+
+        The containers call this method when a child is replaced or
+        removed, so the old child does not keep them alive, and it's
+        changes do not render them again.
+        """
+        parents = getattr(self, "_parents", None)
+        if parents is None:
+            return
+        for index, registered in enumerate(parents):
+            if registered is parent:
+                del parents[index]
+                return
+
+    def get_parents(self):
+        """Returns a list with the containers of this element"""
+        return list(getattr(self, "_parents", []))
+
+    def mark_dirty(self):
+        """Marks this element and all it's containers as dirty.
+
+        A dirty element changed after it's last render, so it must be
+        rendered again. All the setters of the elements call this method,
+        so it only needs to be called when the element's state is changed
+        directly (for example, using the list returned by get_items).
+        """
+        marked = set()
+        work = [self]
+        while work:
+            element = work.pop()
+            if id(element) in marked:
+                continue
+            marked.add(id(element))
+            element._dirty = True
+            work.extend(getattr(element, "_parents", []))
+
+    def is_dirty(self):
+        """Returns True if this element changed after it's last render.
+
+        The elements are dirty until they are rendered by a container
+        (or by UI.render_tree).
+        """
+        return getattr(self, "_dirty", True)
+
+    def get_state(self):
+        """Returns the element's state (a dictionary).
+
+        The state should be changed only with set_state.
+        """
+        state = getattr(self, "_state", None)
+        if state is None:
+            state = self._state = {}
+        return state
+
+    def set_state(self, changes = None, **kwargs):
+        """Updates the element's state.
+
+        changes (a dictionary) and the keyword arguments are the new
+        values of the state. The update is queued in the current
+        scheduler (see UI.Scheduler): inside an event handler (or any
+        UI.batched_updates block) all the updates are applied together
+        when the handler returns, and the tree is rendered again only
+        once. Outside a batch, the update is applied immediately.
+        """
+        updates = dict(changes or {})
+        updates.update(kwargs)
+        UI.get_scheduler().enqueue(self, updates)
+
+    def __getstate__(self):
+        """Returns the element's state, for pickle.
+
+        The containers of the element and the RenderedObject of the last
+        render are not included, so an element can be sent to other
+        process without sending all the tree.
+        """
+        state = self.__dict__.copy()
+        state["_parents"] = []
+        state["_rendered"] = None
+        return state
+
+    def should_update(self):
+        """Determines if this element must be rendered again.
+
+        When a container renders it's childs, the childs for which this
+        method returns False are not rendered again, the RenderedObject
+        of their last render is reused instead (see UI.PureElement).
+
+        Returns True by default (the element is always rendered).
+        """
+        return True
 
     def render(self):
         """Renders the current Element.
@@ -153,6 +280,25 @@ class Element:
         # The Element is abstract, so we can't render it
         return UI.NULL_NODE
 
+    async def render_async(self):
+        """Renders the current Element asynchronously.
+
+        Elements that need to load data (like a request to a server)
+        should override this method, awaiting the data and then calling
+        the super method:
+
+            async def render_async(self):
+                self._data = await load_data()
+                return await super().render_async()
+
+        The childs are rendered with their render_async methods, all at
+        the same time, so the time of the render is the time of the
+        slowest element instead of the sum of all of them.
+
+        Returns a RenderedObject, like render.
+        """
+        return await UI.render_pending_async(UI.render_shallow(self))
+
     def emit(self, event_name, *args, **kwargs):
         """Emits the event event_name to this element.
 
@@ -55,14 +55,21 @@ class Entry(UI.Element):
     def set_value(self, value):
         """Sets the entry's value"""
         self._value = value
+        self.mark_dirty()
 
     def set_value_changed_event(self, onclick):
         """Sets the entry's onvaluechanged event."""
         self._onclick = onclick
+        self.mark_dirty()
 
     def emit_value_changed_event(self, *args, **kwargs):
-        """Calls the entry's onvaluechanged event"""
-        return self._onvaluechanged(*args, **kwargs)
+        """Calls the entry's onvaluechanged event.
+
+        The state updates done by the handler are batched (see
+        UI.batched_updates).
+        """
+        with UI.batched_updates():
+            return self._onvaluechanged(*args, **kwargs)
 
     def emit(self, event_name, *args, **kwargs):
         """Override of UI.Element.emit"""
@@ -50,15 +50,21 @@ class Form(UI.Container):
     def set_submit_event(self, onsubmit):
         """Sets the form's onsubmit event."""
         self._onsubmit = onsubmit
+        self.mark_dirty()
 
     def emit_submit_event(self, *args, **kwargs):
-        """Calls the form's onsubmit event"""
-        return self._onsubmit(*args, **kwargs)
+        """Calls the form's onsubmit event.
+
+        The state updates done by the handler are batched (see
+        UI.batched_updates).
+        """
+        with UI.batched_updates():
+            return self._onsubmit(*args, **kwargs)
 
     def emit(self, event_name, *args, **kwargs):
         """Override of UI.Element.emit"""
         if event_name == UI.EVENT_NAME_SUBMIT:
-            return self.emit_onsubmit_event(*args, **kwargs)
+            return self.emit_submit_event(*args, **kwargs)
 
         return super().emit(event_name, *args, **kwargs)
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Interner class, which shares equal RenderedObject subtrees.
+
+Pages often contain many equal subtrees (like thousands of equal buttons
+or separators), and each one is a different RenderedObject, with it's own
+properties dictionary and childs list. An Interner replaces the equal
+subtrees by a single instance, which reduces the memory used by the tree
+and makes the comparisons (see RenderedObject.__eq__ and UI.diff) of the
+shared subtrees O(1).
+
+The interned trees share their nodes, so they must not be modified (for
+example, with UI.apply_patches): a change to a shared node would change
+all the trees that contain it.
+"""
+
+from PythonReact import UI
+
+__all__ = ["Interner"]
+
+class Interner:
+    """Represents a table of interned (shared) RenderedObjects.
+
+    The table keeps the interned nodes alive until it's cleared, so the
+    same Interner can be used for many trees (like the renders of
+    different requests) and their equal subtrees are shared too.
+    """
+
+    def __init__(self):
+        """Creates the new Interner."""
+        self.clear()
+
+    def clear(self):
+        """Removes all the interned nodes and resets the statistics."""
+        self._table = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def intern(self, tree):
+        """Interns all the subtrees of tree.
+
+        Returns a tree equal to tree, where each subtree is the interned
+        instance of the subtree. The nodes of tree are never modified:
+        the nodes whose childs were replaced are copied.
+
+        The nodes with unhashable properties or with childs that are not
+        strings or RenderedObjects (like pending elements) can not be
+        interned, but their childs are. The nodes with lazy childs (see
+        UI.LazyContent) are not interned, and their childs are not
+        iterated.
+        """
+        if type(tree) is not UI.RenderedObject:
+            return tree
+
+        # The interned node of each node of tree (by id), the same node
+        # may appear many times in the tree
+        done = {}
+        table = self._table
+        # Post-order: each item of the stack is a pair (node, True if
+        # the childs of node are done)
+        stack = [(tree, False)]
+        while stack:
+            node, childs_done = stack.pop()
+            if id(node) in done:
+                continue
+            childs = node._inner_content
+            if type(childs) is not list:
+                # The lazy childs (see UI.LazyContent) are not iterated
+                done[id(node)] = node
+                continue
+            if not childs_done:
+                stack.append((node, True))
+                for child in childs:
+                    if (type(child) is UI.RenderedObject) and (id(child) not in done):
+                        stack.append((child, False))
+                continue
+
+            new_childs = []
+            # The key of a node contains the ids of it's interned childs,
+            # so it's only computed for the direct childs
+            child_keys = []
+            internable = True
+            for child in childs:
+                if type(child) is UI.RenderedObject:
+                    child = done[id(child)]
+                    if type(child._inner_content) is not list:
+                        internable = False
+                    child_keys.append(id(child))
+                elif type(child) is str:
+                    child_keys.append(child)
+                else:
+                    internable = False
+                new_childs.append(child)
+
+            if any(a is not b for a, b in zip(childs, new_childs)):
+                canonical = UI.RenderedObject(node._tag_name, node._properties, new_childs)
+            else:
+                canonical = node
+
+            if internable:
+                # The types are in the key because equal values of
+                # different types (like 1 and True) are written differently
+                properties = tuple([
+                    (name, type(value), value) for name, value in node._properties.items()
+                ])
+                key = (node._tag_name, properties, tuple(child_keys))
+                try:
+                    found = table.get(key)
+                except TypeError:
+                    # Unhashable properties
+                    found = canonical
+                else:
+                    if found is None:
+                        table[key] = canonical
+                        found = canonical
+                        self._misses += 1
+                    else:
+                        self._hits += 1
+                canonical = found
+            done[id(node)] = canonical
+
+        return done[id(tree)]
+
+    def cache_info(self):
+        """Returns a dictionary with the statistics of the interner.
+
+        The keys are "hits" (the nodes replaced by an interned node),
+        "misses" (the new interned nodes) and "entries".
+        """
+        return {"hits": self._hits, "misses": self._misses, "entries": len(self._table)}
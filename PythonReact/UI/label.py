@@ -34,6 +34,7 @@ class Label(UI.Container):
     def set_label(self, text):
         """Sets the label's inner text"""
         self._label = text
+        self.mark_dirty()
 
     def get_label(self):
         """Gets the label's inner text"""
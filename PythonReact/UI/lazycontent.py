@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the LazyContent class, a lazy list of childs.
+
+A LazyContent can be used as the items of a Container (see
+Container.__init__) and as the inner content of a RenderedObject, instead
+of a list. The childs are created (and rendered) only when the content is
+iterated, one by one, so a container with a very long list of childs
+(like the rows of a big query) can be streamed (see
+engines.html.TreeToHTML.iter_html) without keeping all the childs in
+memory.
+"""
+
+import itertools
+
+__all__ = ["LazyContent"]
+
+class LazyContent:
+    """Represents a lazy list of childs.
+
+    The source of the childs can be:
+
+    * A function that returns an iterable: the function is called each
+    time the content is iterated, so the content can be iterated many
+    times.
+    * An iterable (like a range or a list): it's iterated each time.
+    * An iterator (like a generator): it can be iterated only once, the
+    next iterations raise a RuntimeError.
+
+    Unlike a list, a LazyContent have no length and can not be indexed:
+    the consumers that need them must convert it to a list (which creates
+    all the childs).
+    """
+
+    __slots__ = ("_source", "_function", "_one_shot", "_consumed")
+
+    def __init__(self, source = (), function = None):
+        """Creates the new LazyContent.
+
+        source is the source of the childs (see above) and function is a
+        function applied to each child when it's iterated (or None).
+        """
+        self._source = source
+        self._function = function
+        # The iterators (but not the other lazy contents) can be iterated
+        # only once, see is_one_shot
+        self._one_shot = (not callable(source)) and \
+            (not isinstance(source, LazyContent)) and (iter(source) is source)
+        self._consumed = False
+
+    def __iter__(self):
+        source = self._source
+        if callable(source):
+            source = source()
+        elif self._one_shot:
+            if self._consumed:
+                raise RuntimeError("The lazy content was already consumed")
+            self._consumed = True
+        return self._iterate(source, self._function)
+
+    @staticmethod
+    def _iterate(source, function):
+        if function is None:
+            for item in source:
+                yield item
+        else:
+            for item in source:
+                yield function(item)
+
+    def is_one_shot(self):
+        """Returns True if this content can be iterated only once.
+
+        It's True if the source is an iterator, or if it's made of
+        contents (see map, __add__ and __radd__) with iterators.
+        """
+        if self._one_shot:
+            return True
+        source = self._source
+        if isinstance(source, LazyContent):
+            return source.is_one_shot()
+        return False
+
+    def map(self, function):
+        """Returns a new LazyContent with function applied to each child."""
+        return LazyContent(self, function)
+
+    def __add__(self, other):
+        """Returns a new LazyContent with the childs of other after these."""
+        return self._chain(self, other)
+
+    def __radd__(self, other):
+        """Returns a new LazyContent with the childs of other before these.
+
+        So the elements that render a list of their own childs before
+        the items (like Label) can use lazy items.
+        """
+        return self._chain(other, self)
+
+    @staticmethod
+    def _chain(first, second):
+        """Returns a new LazyContent with the childs of first and second."""
+        result = LazyContent(lambda: itertools.chain(first, second))
+        # The chain is called again on each iteration, but the one-shot
+        # parts are consumed by the first one
+        result._one_shot = _is_one_shot(first) or _is_one_shot(second)
+        return result
+
+def _is_one_shot(childs):
+    """Returns True if childs (a list or any iterable) can be iterated only once."""
+    if isinstance(childs, LazyContent):
+        return childs.is_one_shot()
+    return iter(childs) is childs
@@ -43,6 +43,7 @@ class Link(UI.Label):
     def set_href(self, href):
         """Sets the label's hyperreference"""
         self._href = href
+        self.mark_dirty()
 
     def get_href(self):
         """Gets the label's hyperreference"""
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the PureElement class, a base for memoized elements.
+
+A pure element always renders the same RenderedObject for the same inputs
+(arguments and state), so it only needs to be rendered again when it's
+inputs change.
+"""
+
+from PythonReact import UI
+
+class PureElement(UI.Element):
+    """Represents an Element whose render depends only of it's inputs.
+
+    When a PureElement is rendered as a child of a container, it's
+    inputs (see render_inputs) are compared with the inputs of the last
+    render, and if they are equal, the last RenderedObject is reused
+    instead of rendering the element again.
+
+    The PureElement can be mixed with other elements, like:
+
+        class Footer(UI.PureElement, UI.Container):
+            ...
+
+    The inputs are compared shallowly, the changes inside the child
+    elements are detected because they mark their containers as dirty.
+    """
+
+    # Attributes that are not inputs of the render
+    NOT_INPUTS = (
+        "_rendered", "_memo_inputs", "_memo_hits", "_memo_misses",
+        "_parents", "_dirty"
+    )
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new PureElement.
+
+        The arguments are passed to the next class (like UI.Element or
+        UI.Container).
+        """
+        super().__init__(*args, **kwargs)
+
+        self._rendered = None
+        self._memo_inputs = None
+        self._memo_hits = 0
+        self._memo_misses = 0
+
+    def render_inputs(self):
+        """Returns the inputs of the render.
+
+        By default, the inputs are all the attributes of the element (the
+        lists and dictionaries are copied, so changing them later is
+        detected). Override this method for a cheaper or more precise
+        comparison, the returned value is compared using ==.
+        """
+        inputs = {}
+        for name, value in self.__dict__.items():
+            if name in PureElement.NOT_INPUTS:
+                continue
+            if isinstance(value, list):
+                value = tuple(value)
+            elif isinstance(value, dict):
+                value = dict(value)
+            inputs[name] = value
+        return inputs
+
+    def should_update(self):
+        """Override of UI.Element.should_update.
+
+        Returns False if the inputs are equal to the inputs of the last
+        render and the element is not dirty (see UI.Element.mark_dirty).
+        """
+        inputs = self.render_inputs()
+        if (self._rendered is not None) and (not self.is_dirty()) and \
+           (inputs == self._memo_inputs):
+            self._memo_hits += 1
+            return False
+
+        self._memo_misses += 1
+        self._memo_inputs = inputs
+        return True
+
+    def cache_info(self):
+        """Returns a dictionary with the "hits" and "misses" counters.
+
+        A hit is a render that reused the last RenderedObject, and a
+        miss is a render that rendered the element again.
+        """
+        return {"hits": self._memo_hits, "misses": self._memo_misses}
@@ -10,51 +10,203 @@ The NULL_NODE object represents the result of render an object that is not
 renderizable, or it can not be rendered.
 """
 
+from types import GeneratorType
+
+from PythonReact import UI
+
+__all__ = ["RenderedObject", "NULL_NODE"]
+
+# Returned by next when a lazy content ends
+_END = object()
+
+# Number of pieces buffered by RenderedObject.write_xml before writing
+# them to the file
+WRITE_BUFFER_PARTS = 1024
+
 class RenderedObject:
     """Represents the result of render a component.
 
     This class can be exported to XML and XHTML.
+
+    The RenderedObjects are created very often, so they only store the
+    three needed attributes, the cached hash, the cached fingerprint (see
+    engines.html.FragmentCache) and the wrapped element of the deferred
+    elements (see UI.deferred_element) using __slots__, and the
+    constructor does not check it's arguments. Set RenderedObject.debug to True for enable
+    the checks (see RenderedObject.validate).
     """
 
-    def __init__(self, *args, **kwargs):
-        """Creates the new RenderedObject from the keywords arguments.
+    __slots__ = ("_tag_name", "_properties", "_inner_content", "_hash", "_fingerprint", "_element")
+
+    # When True, every new RenderedObject is validated
+    debug = False
+
+    def __init__(self, tag_name = None, properties = None, inner_content = None):
+        """Creates the new RenderedObject.
 
-        The arguments should containt these values:
+        The arguments can be passed as positional arguments (faster) or
+        as keyword arguments:
 
         * \"tag_name\": A string containing the XML tag name (should be valid).
         * \"properties\": A dictionary containing the XML attributes.
         * \"inner_content\": A list of strings or RenderedObject. If an item is
           a string, it's parsed as a XML TextNode, if is a RenderedObject,
-          is rendered to XML instead.
+          is rendered to XML instead. It can also be an UI.LazyContent,
+          which is iterated when the object is exported.
+        """
+        self._tag_name = tag_name
+        self._properties = properties
+        self._inner_content = inner_content
+        self._hash = None
+        self._fingerprint = None
+        self._element = None
+
+        if RenderedObject.debug:
+            self.validate()
+
+    def validate(self):
+        """Checks the attributes of this object.
+
+        Raises a KeyError if an attribute is missing and a ValueError
+        if an attribute have an invalid type.
         """
-        self._props = kwargs # Object with all passed properties
-        # Try to get the needed attributes:
-        self._tag_name = self._try_to_access("tag_name")
-        self._properties = self._try_to_access("properties")
-        self._inner_content = self._try_to_access("inner_content")
+        for key in ("tag_name", "properties", "inner_content"):
+            if getattr(self, "_" + key) is None:
+                raise KeyError("The key " + key + " is required")
 
         # Type checks
         if type(self._tag_name) != str:
             raise ValueError("The tag_name attribute should be a string")
         if type(self._properties) != dict:
             raise ValueError("The properties attribute should be a dictionary")
-        if type(self._inner_content) != list:
+        if (type(self._inner_content) != list) and \
+           (not isinstance(self._inner_content, UI.LazyContent)):
             raise ValueError("the inner_content attribute should be a list")
 
-    def _try_to_access(self, key):
-        """Tries to access to a key in the self._props.
+    def __eq__(self, other):
+        """Compares the structure of two RenderedObjects.
+
+        Two RenderedObjects are equal if they have the same tag name,
+        properties and childs (compared recursively, without recursion).
+        The lazy childs (see UI.LazyContent) are iterated, except if they
+        can be iterated only once (like a generator): then the nodes are
+        compared by identity, so comparing a tree never consumes it.
+        The interned trees (see UI.Interner) are compared in O(1), because
+        their equal subtrees are the same object.
+        """
+        if self is other:
+            return True
+        if type(other) is not RenderedObject:
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if (a._tag_name != b._tag_name) or (a._properties != b._properties):
+                return False
+            if _is_one_shot(a._inner_content) or _is_one_shot(b._inner_content):
+                # The nodes are not the same object (see above)
+                return False
+            achilds = _as_list(a._inner_content)
+            bchilds = _as_list(b._inner_content)
+            if len(achilds) != len(bchilds):
+                return False
+            for achild, bchild in zip(achilds, bchilds):
+                if achild is bchild:
+                    continue
+                if (type(achild) is RenderedObject) and (type(bchild) is RenderedObject):
+                    stack.append((achild, bchild))
+                elif achild != bchild:
+                    return False
+        return True
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
 
-        key is a string containing the key name to access.
+    def __hash__(self):
+        """Returns a hash of the structure of this object.
 
-        This function returns the result.
+        The hash of each node is computed from the hashes of it's childs,
+        and it's cached in the node, so the next hashes of the subtree
+        (and of the trees that share it, see UI.Interner) are O(1). So a
+        tree must not be changed after it's hashed, except with
+        UI.apply_patches (which clears the cached hashes of the changed
+        nodes).
 
-        If fails, raises a KeyError.
+        Like __eq__, it iterates the lazy childs (see UI.LazyContent),
+        except the ones that can be iterated only once: the hashes of
+        their nodes are based on the identity of the nodes. The hashes of
+        the nodes with lazy childs (and of their ancestors) are never
+        cached.
         """
-        # dict.get returns None when the key not exist
-        result = self._props.get(key)
-        if result is None:
-            raise KeyError("The key " + key + " is required")
-        return result
+        if self._hash is not None:
+            return self._hash
+        # The hashes of the nodes with lazy descendants (by id), they are
+        # kept here instead of in the nodes
+        uncached = {}
+        # The lazy childs already iterated (by id of their node)
+        lazy_childs = {}
+        # Post-order: each item of the stack is a pair (node, True if the
+        # childs of node are done)
+        stack = [(self, False)]
+        while stack:
+            node, childs_done = stack.pop()
+            if (node._hash is not None) or (id(node) in uncached):
+                continue
+            childs = node._inner_content
+            lazy = type(childs) is not list
+            if lazy and _is_one_shot(childs):
+                # Like __eq__, the one-shot childs are never iterated
+                uncached[id(node)] = object.__hash__(node)
+                continue
+            if lazy:
+                # The lazy childs are iterated only once
+                if id(node) not in lazy_childs:
+                    lazy_childs[id(node)] = list(childs)
+                childs = lazy_childs[id(node)]
+            if not childs_done:
+                stack.append((node, True))
+                for child in childs:
+                    if type(child) is RenderedObject:
+                        stack.append((child, False))
+                continue
+            properties = 0
+            # The properties are compared as a dictionary (the order does
+            # not matter), so they are combined with xor
+            for key, value in node._properties.items():
+                properties ^= hash((key, _hash_value(value)))
+            child_hashes = []
+            for child in childs:
+                if type(child) is RenderedObject:
+                    child_hash = child._hash
+                    if child_hash is None:
+                        lazy = True
+                        child_hash = uncached[id(child)]
+                    child_hashes.append(child_hash)
+                else:
+                    child_hashes.append(_hash_value(child))
+            result = hash((node._tag_name, properties, tuple(child_hashes)))
+            if lazy:
+                uncached[id(node)] = result
+            else:
+                node._hash = result
+        if self._hash is not None:
+            return self._hash
+        return uncached[id(self)]
+
+    def __getstate__(self):
+        # The cached hash and fingerprint are not saved (the hashes of the
+        # strings change between processes), and neither the deferred
+        # element (see UI.deferred_element)
+        return (self._tag_name, self._properties, self._inner_content)
+
+    def __setstate__(self, state):
+        self._tag_name, self._properties, self._inner_content = state
+        self._hash = None
+        self._fingerprint = None
+        self._element = None
 
     def to_xml_string(self):
         """Exports this object to a XML string.
@@ -62,31 +214,83 @@ class RenderedObject:
         Returns an XML ready-to-parse string representing this
         RenderedObject.
         """
-        # First: the <tagName
-        xmlstr = "<" + self._tag_name + " "
-        # For all properties, translate it to a string of the form
-        # propertyName=propertyValue and append it to the xmlstr
-        for key, value in self._properties.items():
-            xmlstr += key + "=\"" + str(value) + "\" "
-        # If not have childs (innerContent) return a tag of the form
-        # <tagName attributes... /> instead of <tagName attributes...></tagName>
-        if len(self._inner_content) == 0:
-            xmlstr += "/>"
-            return xmlstr
-        # If have childs (innerContent) then:
-        # Close the start tag
-        xmlstr += ">"
-        # Iterate over the childrens and stringify them
-        for child in self._inner_content:
-            if type(child) == str:
-                xmlstr += child
-            elif type(child) == RenderedObject:
-                xmlstr += child.to_xml_string()
-            else:
-                xmlstr += str(child)
-        # And close the end tag
-        xmlstr += "</" + self._tag_name + ">"
-        return xmlstr
+        parts = []
+        self._write_xml(parts.append)
+        return "".join(parts)
+
+    def write_xml(self, fp):
+        """Exports this object to XML, writing it to fp.
+
+        fp is any object with a write method (a file, a socket file or
+        a io.StringIO). The written XML is the same as the returned by
+        to_xml_string, but it's written in small pieces instead of
+        building the full string.
+        """
+        parts = []
+
+        def append(part):
+            parts.append(part)
+            if len(parts) >= WRITE_BUFFER_PARTS:
+                fp.write("".join(parts))
+                parts.clear()
+
+        self._write_xml(append)
+        if parts:
+            fp.write("".join(parts))
+
+    def _write_xml(self, append):
+        """Exports this object to XML.
+
+        append is a function that receives each piece of the XML string,
+        the pieces are never joined here, so the childs does not copy the
+        same strings again and again.
+
+        The tree is walked using an explicit stack (not recursion), so
+        the depth of the tree is only limited by the available memory.
+        """
+        # The stack contains the pending nodes and strings (text nodes
+        # and end tags), the last pushed is the next to be written.
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if type(node) == str:
+                append(node)
+                continue
+            if type(node) == GeneratorType:
+                # The lazy childs are written one by one
+                child = next(node, _END)
+                if child is not _END:
+                    stack.append(node)
+                    stack.append(_xml_child(child))
+                continue
+            inner_content = node._inner_content
+            if type(inner_content) != list:
+                append("<" + node._tag_name + " ")
+                for key, value in node._properties.items():
+                    append(key + "=\"" + str(value) + "\" ")
+                append(">")
+                stack.append("</" + node._tag_name + ">")
+                stack.append(iter(inner_content))
+                continue
+            # First: the <tagName
+            append("<" + node._tag_name + " ")
+            # For all properties, translate it to a string of the form
+            # propertyName=propertyValue and append it
+            for key, value in node._properties.items():
+                append(key + "=\"" + str(value) + "\" ")
+            # If not have childs (innerContent) write a tag of the form
+            # <tagName attributes... /> instead of <tagName attributes...></tagName>
+            if len(inner_content) == 0:
+                append("/>")
+                continue
+            # If have childs (innerContent) then:
+            # Close the start tag
+            append(">")
+            # The end tag is written after all childs, so it's pushed
+            # first, and the childs are pushed in reverse order
+            stack.append("</" + node._tag_name + ">")
+            for child in reversed(inner_content):
+                stack.append(_xml_child(child))
 
     def __str__(self):
         """Converts this object to a string.
@@ -96,20 +300,17 @@ class RenderedObject:
         Like to_xml_string, but never renders the RenderedObject childrens.
         """
         # Opens the tag (<tagName)
-        xmlstr = "<" + self._tag_name + " "
+        parts = ["<", self._tag_name, " "]
         # Add the XML properties
         for key, value in self._properties.items():
-            xmlstr += key + "=\"" + str(value) + "\" "
+            parts.append(key + "=\"" + str(value) + "\" ")
         # If not have childs, close the tag using />
-        if len(self._inner_content) == 0:
-            xmlstr += "/>"
-            return xmlstr
+        if (type(self._inner_content) == list) and (len(self._inner_content) == 0):
+            parts.append("/>")
+            return "".join(parts)
         # If have childs, only display "<...>" for save space
-        xmlstr += ">"
-        if len(self._inner_content) > 0:
-            xmlstr += "<...>"
-        xmlstr += "</" + self._tag_name + ">"
-        return xmlstr
+        parts.append("><...></" + self._tag_name + ">")
+        return "".join(parts)
 
     def to_tree_string(self, indentchar = "    "):
         """Converts this object to a string.
@@ -117,36 +318,61 @@ class RenderedObject:
         The difference between to_xml_string and to_tree_string is that
         toTreeString returns a Tree-based representation, instead of
         a ready-to-parse XML string.
+
+        Each level of the tree is indented with one more indentchar.
+        """
+        parts = []
+        self._write_tree(parts.append, indentchar)
+        return "".join(parts)
+
+    def _write_tree(self, append, indentchar):
+        """Like _write_xml, but for to_tree_string.
+
+        Each nesting level is indented with one more indentchar.
         """
         # The format of the TreeString is:
         #    tagName(attributes):
         #        childs....
-        # Starts with the tagName:
-        treestr = self._tag_name + " ("
-        # Append all attributes using the key="value" format:
-        for key, value in self._properties.items():
-            treestr += key + "=\"" + str(value) + "\" "
-        # Close the parentesis of the attributes
-        treestr += ")"
-        # If not have childs, return the string
-        if len(self._inner_content) == 0:
-            return treestr
-        # Else, append a colon
-        treestr += ":"
-        # And start to iterate over the childs
-        for child in self._inner_content:
-            # If we append the newline at the start of the loop,
-            # we can avoid trailing newlines
-            treestr += "\n"
-            # Now, stringify the child (like toXMLString):
-            if type(child) == str:
-                treestr += indentchar + "\"" + child + "\""
-            elif type(child) == RenderedObject:
-                treestr += indentchar + child.to_tree_string(indentchar * 2)
-            else:
-                treestr += indentchar + str(child)
-        # Done (return)
-        return treestr
+        # The stack contains (node, depth) pairs and strings (already
+        # formatted text nodes, newlines and indentation).
+        stack = [(self, 0)]
+        while stack:
+            item = stack.pop()
+            if type(item) == str:
+                append(item)
+                continue
+            node, depth = item
+            if type(node) == GeneratorType:
+                # The lazy childs are written one by one
+                child = next(node, _END)
+                if child is not _END:
+                    stack.append(item)
+                    stack.append(_tree_child(child, depth))
+                    stack.append("\n" + indentchar * depth)
+                continue
+            # Starts with the tagName:
+            append(node._tag_name + " (")
+            # Append all attributes using the key="value" format:
+            for key, value in node._properties.items():
+                append(key + "=\"" + str(value) + "\" ")
+            # Close the parentesis of the attributes
+            append(")")
+            inner_content = node._inner_content
+            if type(inner_content) != list:
+                append(":")
+                stack.append((iter(inner_content), depth + 1))
+                continue
+            # If not have childs, continue with the next node
+            if len(inner_content) == 0:
+                continue
+            # Else, append a colon
+            append(":")
+            # And push the childs in reverse order. If we write the
+            # newline before each child, we can avoid trailing newlines
+            indent = "\n" + indentchar * (depth + 1)
+            for child in reversed(inner_content):
+                stack.append(_tree_child(child, depth + 1))
+                stack.append(indent)
 
     def inner_content(self):
         """Returns a list of the child elements of this object"""
@@ -160,6 +386,42 @@ class RenderedObject:
         """Returns the object's tag name as a string"""
         return self._tag_name
 
+def _xml_child(child):
+    """Returns the item pushed by _write_xml for child."""
+    if (type(child) == str) or (type(child) == RenderedObject):
+        return child
+    return str(child)
+
+def _tree_child(child, depth):
+    """Returns the item pushed by _write_tree for child (at depth)."""
+    # Stringify the child (like toXMLString):
+    if type(child) == str:
+        return "\"" + child + "\""
+    elif type(child) == RenderedObject:
+        return (child, depth)
+    return str(child)
+
+def _as_list(childs):
+    """Returns childs as a list (see UI.LazyContent)."""
+    if type(childs) == list:
+        return childs
+    return list(childs)
+
+def _is_one_shot(childs):
+    """Returns True if childs can be iterated only once (see UI.LazyContent)."""
+    if type(childs) is list:
+        return False
+    if isinstance(childs, UI.LazyContent):
+        return childs.is_one_shot()
+    return iter(childs) is childs
+
+def _hash_value(value):
+    """Returns the hash of value, or the hash of it's type if unhashable."""
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(type(value).__name__)
+
 # The NULL_NODE is explained at the start of the file
 NULL_NODE = RenderedObject(
     tag_name = "None",
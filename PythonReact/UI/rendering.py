@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the functions for render trees of elements.
+
+The render of an element tree is done without recursion: when a container
+renders it's childs (see Container.get_rendered_items), the childs are not
+rendered immediately, instead, they are rendered later by the outermost
+render, using an explicit stack. Because this, the depth of the element
+tree is only limited by the available memory.
+
+The same mechanism is used by the asynchronous render (see
+Element.render_async): each element is rendered with render_shallow,
+and then it's pending childs are rendered concurrently.
+
+The render state is per-thread, so many threads can render at the same
+time, even the same element tree (while no thread changes it): the
+RenderedObject of an element is saved in the element only when it's
+complete, and the saved RenderedObjects are never modified.
+"""
+
+import asyncio
+import threading
+
+from PythonReact import UI
+
+__all__ = [
+    "render_items", "render_tree", "render_shallow", "find_pending",
+    "render_pending_async"
+]
+
+# The render state is per-thread (see the module documentation)
+_state = threading.local()
+
+def render_items(elements):
+    """Renders all elements in the list "elements".
+
+    Returns a list with the RenderedObject of each element, in the same
+    order.
+
+    If this function is called while rendering other tree (generally, from
+    the render method of an element), the elements are not rendered now:
+    the returned list contains the elements themselves, and they will be
+    rendered (and replaced by their RenderedObjects) by the outermost
+    render before it returns. If you need the complete RenderedObject
+    inside a render method, use render_tree instead.
+    """
+    if getattr(_state, "rendering", False):
+        return list(elements)
+
+    items = list(elements)
+    _state.rendering = True
+    try:
+        _resolve(items)
+    finally:
+        _state.rendering = False
+    return items
+
+def render_tree(element, incremental = False):
+    """Renders element and all it's childs.
+
+    Unlike render_items, the returned RenderedObject is always complete,
+    even when called while rendering other tree.
+
+    If incremental is True, only the dirty elements (see
+    Element.mark_dirty) are rendered again: the RenderedObjects of the
+    last render are reused for all the other elements. Because the
+    changes of an element mark it's containers as dirty, only the paths
+    from the root to the changed elements are rendered.
+    """
+    rendering = getattr(_state, "rendering", False)
+    previous_incremental = getattr(_state, "incremental", False)
+    _state.rendering = False
+    _state.incremental = incremental
+    try:
+        return render_items([element])[0]
+    finally:
+        _state.rendering = rendering
+        _state.incremental = previous_incremental
+
+def _resolve(items):
+    """Renders all the elements pending in items and in it's childs.
+
+    items is a list, and every UI.Element found (in items or in the inner
+    content of the rendered objects) is replaced by it's RenderedObject.
+    The elements are rendered in pre-order, like a recursive render.
+
+    The elements whose should_update method returns False (or that are
+    not dirty, in an incremental render) are not rendered, their last
+    RenderedObject is used instead.
+
+    If a render raises an exception, the elements rendered (or being
+    rendered) are marked as dirty again, because their results are not
+    saved.
+    """
+    incremental = getattr(_state, "incremental", False)
+    # The rendered elements and their results. The results are saved in
+    # the elements only when they are complete.
+    rendered = []
+    try:
+        _resolve_walk(items, incremental, rendered)
+    except BaseException:
+        for element, result in rendered:
+            element._dirty = True
+        raise
+
+    for element, result in rendered:
+        element._rendered = result
+
+def _resolve_walk(items, incremental, rendered):
+    """Implements _resolve, appending the rendered elements (and their
+    results) to rendered."""
+    # Each item of the stack is a pair (list, index of the next item
+    # to inspect)
+    stack = [(items, 0)]
+    while stack:
+        lst, index = stack.pop()
+        while index < len(lst):
+            child = lst[index]
+            index += 1
+            if isinstance(child, UI.Element):
+                last = _reusable(child, incremental)
+                if last is not None:
+                    # The last RenderedObject is already complete
+                    lst[index - 1] = last
+                    continue
+                element = child
+                # The element is clean before the render, so the changes
+                # done while rendering it are not lost
+                element._dirty = False
+                try:
+                    child = element.render()
+                except BaseException:
+                    element._dirty = True
+                    raise
+                lst[index - 1] = child
+                rendered.append((element, child))
+            if isinstance(child, UI.RenderedObject) and \
+               (type(child.inner_content()) is list):
+                # Continue with the childs of this node, and then with
+                # it's next siblings (the lazy childs, see UI.LazyContent,
+                # are rendered when they are iterated)
+                stack.append((lst, index))
+                stack.append((child.inner_content(), 0))
+                break
+
+def _reusable(element, incremental):
+    """Returns the last RenderedObject of element if it can be reused.
+
+    Returns None if the element must be rendered again.
+    """
+    last = getattr(element, "_rendered", None)
+    if incremental and (last is not None) and (not element.is_dirty()):
+        return last
+    if (not element.should_update()) and (last is not None):
+        return last
+    return None
+
+def render_shallow(element):
+    """Renders element, but not it's childs.
+
+    Returns the RenderedObject of element, which contains the child
+    elements themselves instead of their RenderedObjects (see
+    render_items). The pending childs can be rendered later with
+    render_pending_async.
+    """
+    rendering = getattr(_state, "rendering", False)
+    _state.rendering = True
+    try:
+        return element.render()
+    finally:
+        _state.rendering = rendering
+
+def find_pending(rendered):
+    """Returns a list of (list, index) pairs with the pending elements.
+
+    rendered is a RenderedObject returned by render_shallow, and each
+    pair is the list (an inner content) and the index of one pending
+    element.
+    """
+    found = []
+    work = [rendered]
+    while work:
+        node = work.pop()
+        childs = node.inner_content()
+        if type(childs) is not list:
+            # The lazy childs are rendered when they are iterated
+            continue
+        for index, child in enumerate(childs):
+            if isinstance(child, UI.Element):
+                found.append((childs, index))
+            elif isinstance(child, UI.RenderedObject):
+                work.append(child)
+    return found
+
+async def render_pending_async(rendered):
+    """Renders all the pending elements of rendered, concurrently.
+
+    rendered is a RenderedObject returned by render_shallow. The pending
+    elements are rendered with their render_async methods (at the same
+    time, using asyncio.gather) and replaced by their RenderedObjects.
+
+    Returns rendered, which is complete now.
+    """
+    pending = find_pending(rendered)
+    renders = []
+    for childs, index in pending:
+        element = childs[index]
+        last = _reusable(element, False)
+        if last is not None:
+            childs[index] = last
+        else:
+            element._dirty = False
+            renders.append((childs, index, element))
+
+    try:
+        results = await asyncio.gather(*[
+            element.render_async() for childs, index, element in renders
+        ])
+    except BaseException:
+        # The results are not saved, so the elements are still dirty
+        for childs, index, element in renders:
+            element._dirty = True
+        raise
+    for (childs, index, element), result in zip(renders, results):
+        childs[index] = result
+        element._rendered = result
+    return rendered
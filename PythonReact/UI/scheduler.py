@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Scheduler class, which batches the state updates.
+
+The changes done with Element.set_state inside a batch (generally, an
+event handler) are queued, and applied all together when the batch ends.
+Then, the trees of the updated elements are rendered again in a single
+(incremental) pass, so each element is rendered at most once, no matter
+how many updates were done.
+
+Each thread has it's own scheduler, see get_scheduler.
+"""
+
+import contextlib
+import threading
+
+from PythonReact import UI
+
+__all__ = ["Scheduler", "get_scheduler", "batched_updates"]
+
+_local = threading.local()
+
+class Scheduler:
+    """Represents a queue of state updates.
+
+    The on_render attribute is a function (or None) that is called as
+    on_render(root, rendered_object) for each tree rendered after
+    applying the updates.
+
+    The max_passes attribute is the maximum number of passes of flush:
+    the updates queued while the trees are rendered (by the render
+    methods or by on_render) are applied in the next pass, so an element
+    that always updates it's state when rendered would be rendered
+    forever.
+    """
+
+    def __init__(self, on_render = None, max_passes = 100):
+        """Creates the new Scheduler.
+
+        on_render and max_passes are the initial values of the on_render
+        and max_passes attributes.
+        """
+        self.on_render = on_render
+        self.max_passes = max_passes
+        self._depth = 0
+        self._flushing = False
+        # Maps the id of the elements to (element, changes) pairs, the
+        # order of the updates is preserved
+        self._pending = {}
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Returns a context manager that batches the updates.
+
+        The updates done inside the "with" block are applied when the
+        outermost batch ends. The batches can be nested.
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.flush()
+
+    def is_batching(self):
+        """Returns True if the updates are being batched."""
+        return (self._depth > 0) or self._flushing
+
+    def enqueue(self, element, changes):
+        """Queues an update of the state of element.
+
+        changes is a dictionary with the new state values. If no batch
+        is active, the update is applied immediately.
+        """
+        entry = self._pending.get(id(element))
+        if entry is None:
+            self._pending[id(element)] = (element, dict(changes))
+        else:
+            entry[1].update(changes)
+
+        if not self.is_batching():
+            self.flush()
+
+    def flush(self):
+        """Applies all the queued updates and renders the updated trees.
+
+        The updated elements (and their containers) are marked as dirty,
+        and then each tree containing at least one updated element is
+        rendered incrementally, starting from it's root. So the
+        containers are always rendered before their childs, and no
+        element is rendered twice.
+
+        Returns a list of (root, rendered_object) pairs. Raises a
+        RuntimeError (and discards the queued updates) if the updates are
+        not applied after max_passes passes.
+        """
+        if self._flushing:
+            return []
+
+        results = []
+        passes = 0
+        self._flushing = True
+        try:
+            # The render methods and the on_render handlers may queue
+            # more updates
+            while self._pending:
+                passes += 1
+                if passes > self.max_passes:
+                    self._pending.clear()
+                    raise RuntimeError(
+                        "The state updates were not applied after " +
+                        str(self.max_passes) + " passes, an element may be "
+                        "updating it's state each time it's rendered"
+                    )
+                pending = list(self._pending.values())
+                self._pending.clear()
+
+                for element, changes in pending:
+                    element.get_state().update(changes)
+                    element.mark_dirty()
+
+                for root in _roots([element for element, changes in pending]):
+                    rendered = UI.render_tree(root, incremental = True)
+                    results.append((root, rendered))
+                    if self.on_render is not None:
+                        self.on_render(root, rendered)
+        finally:
+            self._flushing = False
+        return results
+
+def _roots(elements):
+    """Returns a list with the roots of the trees of elements.
+
+    A root is an element without containers.
+    """
+    roots = []
+    seen = set()
+    work = list(reversed(elements))
+    while work:
+        element = work.pop()
+        if id(element) in seen:
+            continue
+        seen.add(id(element))
+        parents = element.get_parents()
+        if parents:
+            work.extend(reversed(parents))
+        else:
+            roots.append(element)
+    return roots
+
+def get_scheduler():
+    """Returns the scheduler of the current thread."""
+    scheduler = getattr(_local, "scheduler", None)
+    if scheduler is None:
+        scheduler = _local.scheduler = Scheduler()
+    return scheduler
+
+def batched_updates():
+    """Returns a context manager that batches the updates.
+
+    Like get_scheduler().batch().
+    """
+    return get_scheduler().batch()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Slot element, a hole in a template.
+
+A template is an element tree where most of the content never changes.
+The Slot elements mark the parts that change between renders, so the
+engines can convert the rest of the tree only once (see
+engines.html.TreeToHTML.compile).
+"""
+
+from PythonReact import UI
+
+class Slot(UI.Element):
+    """Represents the Slot element, a hole in a template.
+
+    When the tree is rendered normally, the slot displays it's default
+    content.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new Slot.
+
+        The optional arguments are:
+
+        * "slot": The name of the slot, used to fill it.
+        * "default": An element (or a string) displayed when the slot is
+        not filled.
+        * "style": the element's style classes (inherited)
+        """
+        super().__init__(*args, **kwargs)
+
+        # Get the arguments or, it's default values
+        self._slot = super().register_argument("slot", "")
+        self._default = super().register_argument("default", "")
+
+        if isinstance(self._default, UI.Element):
+            UI.Element.add_parent(self._default, self)
+
+    def extend_properties(self, arguments):
+        """Overload of UI.Element.extend_properties"""
+
+        arguments = super().extend_properties(arguments)
+
+        arguments["slot"] = self._slot
+
+        return arguments
+
+    def get_slot(self):
+        """Gets the slot's name"""
+        return self._slot
+
+    def set_default(self, default):
+        """Sets the default content"""
+        if isinstance(self._default, UI.Element) and (self._default is not default):
+            UI.Element.remove_parent(self._default, self)
+        self._default = default
+        if isinstance(default, UI.Element):
+            UI.Element.add_parent(default, self)
+        self.mark_dirty()
+
+    def get_default(self):
+        """Gets the default content"""
+        return self._default
+
+    def render(self):
+        # First: get the RenderedObject arguments:
+        arguments = self.extend_properties({})
+
+        # Render this block and return
+        result = UI.RenderedObject(
+            tag_name = "slot",
+            properties = arguments,
+            inner_content = UI.render_items([self._default])
+        )
+        return result
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Table element, a table of column-oriented data.
+
+The Table does not create an element (nor a RenderedObject) for each cell
+when it's rendered: the rows of the rendered table are a TableRows, a lazy
+content (see UI.LazyContent) that creates the row nodes only when it's
+iterated. The HTML engine does not iterate it: it converts all the rows
+at once, formatting the values with a row template (see
+engines.html.TreeToHTML).
+
+The columns can be any sequence, array.array and (if installed) NumPy
+arrays.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from PythonReact import UI
+
+__all__ = ["Table", "TableRows"]
+
+class TableRows(UI.LazyContent):
+    """Represents the rows of a rendered table (a lazy content).
+
+    Each time it's iterated, it creates one "table-row" node (with a
+    "table-cell" node for each column) for each row.
+    """
+
+    __slots__ = ("_columns",)
+
+    def __init__(self, columns):
+        """Creates the new TableRows.
+
+        columns is a list with the values of each column, all of them with
+        the same length.
+        """
+        self._columns = columns
+        super().__init__(self._create_rows)
+
+    def get_columns(self):
+        """Returns the list with the values of each column."""
+        return self._columns
+
+    def get_row_count(self):
+        """Returns the number of rows."""
+        if len(self._columns) == 0:
+            return 0
+        return len(self._columns[0])
+
+    @staticmethod
+    def row_node(cells):
+        """Returns the "table-row" node of cells (a list of strings)."""
+        return UI.RenderedObject("table-row", {}, [
+            UI.RenderedObject("table-cell", {}, [cell]) for cell in cells
+        ])
+
+    def _create_rows(self):
+        """Creates the row nodes (used as the lazy content source)."""
+        row_node = TableRows.row_node
+        for values in zip(*self._columns):
+            yield row_node([str(value) for value in values])
+
+class Table(UI.Element):
+    """Represents the Table element, a table of column-oriented data.
+
+    The data is stored by columns (for example, the columns of a query),
+    and the rows are never converted to elements.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new Table.
+
+        The optional arguments are:
+
+        * "columns": The columns of the table, a list of (header, values)
+        pairs or a dictionary from the headers to the values. The values
+        are a sequence (like a list or a tuple), an array.array or a NumPy
+        array, and all the columns must have the same length.
+        * "style": the element's style classes (inherited)
+        """
+        super().__init__(*args, **kwargs)
+
+        # Get the arguments or, it's default values
+        self._headers = []
+        self._columns = []
+        self.set_columns(super().register_argument("columns", []))
+
+    def set_columns(self, columns):
+        """Sets the columns of the table (see the "columns" argument).
+
+        Raises a ValueError if the columns have different lengths.
+        """
+        if isinstance(columns, dict):
+            columns = columns.items()
+        headers = []
+        values = []
+        for header, column in columns:
+            headers.append(str(header))
+            values.append(_column_values(column))
+        for column in values:
+            if len(column) != len(values[0]):
+                raise ValueError("All the columns must have the same length")
+        self._headers = headers
+        self._columns = values
+        self.mark_dirty()
+
+    def get_headers(self):
+        """Gets the headers of the columns"""
+        return self._headers
+
+    def get_columns(self):
+        """Gets the values of the columns"""
+        return self._columns
+
+    def get_row_count(self):
+        """Gets the number of rows"""
+        if len(self._columns) == 0:
+            return 0
+        return len(self._columns[0])
+
+    def render(self):
+        # First: get the RenderedObject arguments:
+        arguments = self.extend_properties({})
+
+        head = UI.RenderedObject("table-head", {}, [
+            UI.RenderedObject("table-row", {}, [
+                UI.RenderedObject("table-header", {}, [header])
+                for header in self._headers
+            ])
+        ])
+        body = UI.RenderedObject("table-body", {}, TableRows(self._columns))
+
+        # Render this block and return
+        result = UI.RenderedObject(
+            tag_name = "table",
+            properties = arguments,
+            inner_content = [head, body]
+        )
+        return result
+
+def _column_values(column):
+    """Returns the values of column as a sequence of Python values."""
+    if (numpy is not None) and isinstance(column, numpy.ndarray):
+        # The NumPy scalars are slower to format than the Python ones
+        return column.tolist()
+    if not hasattr(column, "__len__"):
+        return list(column)
+    return column
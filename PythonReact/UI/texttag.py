@@ -90,7 +90,9 @@ class TextTag(UI.Element):
 
     def set_text(self, text):
         """Sets the texttag's inner text"""
+        self._detach_text(text)
         self._text = text
+        self.mark_dirty()
 
     def get_text(self):
         """Gets the texttag's inner text"""
@@ -104,8 +106,19 @@ class TextTag(UI.Element):
         method will return tag.
         """
 
+        self._detach_text(tag)
         self._text = tag
         self._mixed = True
+        UI.Element.add_parent(tag, self)
+        self.mark_dirty()
+
+    def _detach_text(self, text):
+        """Unregisters this tag as container of the mixed tag.
+
+        Called before the mixed tag is replaced by text.
+        """
+        if isinstance(self._text, UI.Element) and (self._text is not text):
+            UI.Element.remove_parent(self._text, self)
 
     def render(self):
         # First: get the RenderedObject arguments:
@@ -114,7 +127,7 @@ class TextTag(UI.Element):
         # The rendered items of the box
         txt = self._text
         if self._mixed:
-            txt = txt.render()
+            txt = UI.render_items([txt])[0]
         rendered_items = [txt]
 
         # Render this block and return
@@ -67,10 +67,12 @@ class TextView(UI.Container):
         def set_text(self, text):
             """Sets the node's raw text content"""
             self._text = text
+            self.mark_dirty()
 
         def set_format(self, fmt):
             """Sets the node's formatter"""
             self._fmt = fmt
+            self.mark_dirty()
 
         def render(self):
             # First: get the RenderedObject arguments:
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the VirtualList container, a list of many rows.
+
+The VirtualList only creates and renders the rows of a window (from
+"offset", at most "limit" rows). The other rows are replaced by two
+spacers (one before the window and other after it) with the height of
+the missing rows, so the list has the same size as the full list and the
+client can request other windows when the user scrolls.
+"""
+
+from PythonReact import UI
+
+class VirtualList(UI.Container):
+    """Represents the VirtualList container, a list of many rows.
+
+    The rows are created by a function (the row factory) which receives
+    the index of a row and returns it's element. The rows are created
+    lazily (see UI.LazyContent), when the rendered list is converted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Creates the new VirtualList.
+
+        The optional arguments are:
+
+        * "count": The number of rows of the full list.
+        * "row_factory": A function that receives the index of a row and
+        returns it's element.
+        * "offset": The index of the first rendered row.
+        * "limit": The maximum number of rendered rows, or None for all the
+        rows after offset.
+        * "row_height": The height of each row (in pixels), used for the
+        size of the spacers.
+        * "style": the element's style classes (inherited)
+        """
+        super().__init__(*args, **kwargs)
+
+        # Get the arguments or, it's default values
+        self._count = super().register_argument("count", 0)
+        self._row_factory = super().register_argument("row_factory", None)
+        self._offset = super().register_argument("offset", 0)
+        self._limit = super().register_argument("limit", None)
+        self._row_height = super().register_argument("row_height", 20)
+
+        self._items = UI.LazyContent(self._create_rows)
+
+    def extend_properties(self, arguments):
+        """Overload of UI.Element.extend_properties"""
+
+        arguments = super().extend_properties(arguments)
+
+        start, end = self.get_window()
+        arguments["count"] = self._count
+        arguments["offset"] = start
+        arguments["limit"] = end - start
+        arguments["row_height"] = self._row_height
+
+        return arguments
+
+    def get_window(self):
+        """Gets the rendered rows, as a pair (first index, last index + 1)"""
+        start = min(max(self._offset, 0), self._count)
+        if self._limit is None:
+            return (start, self._count)
+        return (start, min(start + max(self._limit, 0), self._count))
+
+    def set_window(self, offset, limit = None):
+        """Sets the offset and the limit (see get_window)"""
+        self._offset = offset
+        self._limit = limit
+        self.mark_dirty()
+
+    def set_count(self, count):
+        """Sets the number of rows of the full list"""
+        self._count = count
+        self.mark_dirty()
+
+    def get_count(self):
+        """Gets the number of rows of the full list"""
+        return self._count
+
+    def get_offset(self):
+        """Gets the index of the first rendered row"""
+        return self._offset
+
+    def get_limit(self):
+        """Gets the maximum number of rendered rows"""
+        return self._limit
+
+    def get_row_height(self):
+        """Gets the height of each row"""
+        return self._row_height
+
+    def _create_rows(self):
+        """Creates the rows of the window (used by the lazy items)."""
+        start, end = self.get_window()
+        for index in range(start, end):
+            yield self._row_factory(index)
+
+    def _render_rows(self, start, end):
+        """Returns an UI.LazyContent with the rendered rows from start to
+        end (the rows are created when it's iterated)."""
+        row_factory = self._row_factory
+        return UI.LazyContent(range(start, end),
+                              lambda index: UI.render_tree(row_factory(index)))
+
+    def render(self):
+        # First: get the RenderedObject arguments:
+        arguments = self.extend_properties({})
+
+        # The spacers and the rows use the same window, even if it's
+        # changed before the rows are created
+        start, end = arguments["offset"], arguments["offset"] + arguments["limit"]
+        before = UI.RenderedObject("spacer", {"height": start * self._row_height}, [])
+        after = UI.RenderedObject("spacer", {"height": (self._count - end) * self._row_height}, [])
+
+        # The rows are rendered when the list is converted
+        rendered_items = [before] + self._render_rows(start, end) + [after]
+
+        # Render this block and return
+        result = UI.RenderedObject(
+            tag_name = "virtual-list",
+            properties = arguments,
+            inner_content = rendered_items
+        )
+        return result
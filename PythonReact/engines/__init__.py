@@ -6,3 +6,5 @@ directly draws, converts or render in any form the document.
 """
 
 from .html import *
+from .binary import *
+from .json import *
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""The binary engine converts a RenderedObject tree to a compact binary
+format, and loads it back (see TreeToBinary and BinaryTree).
+"""
+
+from .treetobinary import *
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the TreeToBinary and BinaryTree classes.
+
+TreeToBinary converts a RenderedObject tree to a compact binary format,
+which can be saved to disk or sent to other processes, and BinaryTree
+reads it (lazily: only the read nodes are decoded).
+
+Unlike to_xml_string, the conversion is lossless: the property values and
+the childs can be strings, integers, floats, booleans or None, and they
+are loaded with the same type (the childs can also be RenderedObjects).
+Other values raise a ValueError.
+
+The format is (all the integers are unsigned LEB128 varints, except the
+offsets):
+
+* The magic bytes MAGIC.
+* The string table: the number of strings, and each string as it's length
+in bytes and it's UTF-8 bytes. The tag names, the property names and the
+strings values are saved only once, and referenced by their index.
+* The number of nodes, and the offset table: the offset of each node from
+the start of the node array, as a 4 bytes little-endian integer.
+* The node array: for each node (in pre-order, the root is the first),
+the index of it's tag name, the number of properties, each property (the
+index of the name and the value), the number of childs and each child.
+
+Each value (of a property or a child) is a type byte (see the T_*
+constants) followed by the index of the string (T_STR), the integer
+(T_INT, zigzag encoded), the float (T_FLOAT, 8 bytes little-endian) or the
+index of the node (T_NODE). A node that appears many times in the tree
+(like the nodes shared by a UI.Interner) is saved only once.
+"""
+
+import struct
+
+from PythonReact import UI
+
+__all__ = ["TreeToBinary", "BinaryTree", "MAGIC"]
+
+# The first bytes of the format, the last one is the version
+MAGIC = b"PRBT\x01"
+
+# The types of the values
+T_STR = 0
+T_INT = 1
+T_FLOAT = 2
+T_TRUE = 3
+T_FALSE = 4
+T_NONE = 5
+T_NODE = 6
+
+_FLOAT = struct.Struct("<d")
+_OFFSET = struct.Struct("<I")
+
+def _write_varint(out, value):
+    """Appends the unsigned varint value to out (a bytearray)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, position):
+    """Reads an unsigned varint, returns (value, next position)."""
+    byte = data[position]
+    if byte < 0x80:
+        return (byte, position + 1)
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        position += 1
+        byte = data[position]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (result, position + 1)
+        shift += 7
+
+class TreeToBinary:
+    """The TreeToBinary class exports a RenderedObject tree to the binary
+    format.
+    """
+
+    def to_bytes(self, tree):
+        """Converts tree to the binary format, returns a bytes object."""
+        if type(tree) is not UI.RenderedObject:
+            raise ValueError("The root of the tree should be a RenderedObject")
+
+        # First: number the nodes in pre-order (each node only once). The
+        # lazy childs (see UI.LazyContent) are created now
+        nodes = []
+        childs_of = {}
+        indexes = {}
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if id(node) in indexes:
+                continue
+            indexes[id(node)] = len(nodes)
+            nodes.append(node)
+            childs = node._inner_content
+            if type(childs) is not list:
+                childs = childs_of[id(node)] = list(childs)
+            for child in reversed(childs):
+                if (type(child) is UI.RenderedObject) and (id(child) not in indexes):
+                    stack.append(child)
+
+        strings = {}
+
+        def string_index(text):
+            index = strings.get(text)
+            if index is None:
+                index = strings[text] = len(strings)
+            return index
+
+        def write_value(out, value, child = True):
+            kind = type(value)
+            if kind is str:
+                out.append(T_STR)
+                _write_varint(out, string_index(value))
+            elif (kind is UI.RenderedObject) and child:
+                out.append(T_NODE)
+                _write_varint(out, indexes[id(value)])
+            elif kind is bool:
+                out.append(T_TRUE if value else T_FALSE)
+            elif kind is int:
+                out.append(T_INT)
+                # Zigzag: the small negative integers are small too
+                _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+            elif kind is float:
+                out.append(T_FLOAT)
+                out += _FLOAT.pack(value)
+            elif value is None:
+                out.append(T_NONE)
+            else:
+                raise ValueError("Can not convert a " + kind.__name__ + " to binary")
+
+        # Then: the node array
+        body = bytearray()
+        offsets = bytearray()
+        for node in nodes:
+            offsets += _OFFSET.pack(len(body))
+            _write_varint(body, string_index(node._tag_name))
+            properties = node._properties
+            _write_varint(body, len(properties))
+            for key, value in properties.items():
+                _write_varint(body, string_index(key))
+                write_value(body, value, False)
+            childs = childs_of.get(id(node), node._inner_content)
+            _write_varint(body, len(childs))
+            for child in childs:
+                write_value(body, child)
+
+        # And finally, join the sections
+        out = bytearray(MAGIC)
+        _write_varint(out, len(strings))
+        for text in strings:
+            encoded = text.encode("utf-8")
+            _write_varint(out, len(encoded))
+            out += encoded
+        _write_varint(out, len(nodes))
+        out += offsets
+        out += body
+        return bytes(out)
+
+    def write(self, tree, fp):
+        """Converts tree to the binary format and writes it to fp.
+
+        fp is any object with a write method that accepts bytes (like a
+        file opened in binary mode).
+        """
+        fp.write(self.to_bytes(tree))
+
+class BinaryTree:
+    """Represents a tree in the binary format, read lazily.
+
+    The nodes are decoded only when they are read, so a big tree can be
+    opened (even from a mmap.mmap) and only a part of it loaded.
+
+    The nodes are identified by their index, the root is the node 0.
+    """
+
+    def __init__(self, data):
+        """Creates the new BinaryTree.
+
+        data is a bytes-like object (bytes, bytearray, memoryview or
+        mmap.mmap) with the binary format. It's not copied, so it must
+        not be changed while the BinaryTree is used.
+        """
+        # The bytes are indexed faster than a memoryview
+        if not isinstance(data, bytes):
+            data = memoryview(data)
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError("The data is not in the binary tree format")
+        self._data = data
+
+        # The string table: only the positions are read now
+        count, position = _read_varint(data, len(MAGIC))
+        self._string_positions = []
+        for i in range(count):
+            length, position = _read_varint(data, position)
+            self._string_positions.append((position, position + length))
+            position += length
+        self._strings = [None] * count
+
+        self._node_count, position = _read_varint(data, position)
+        self._offsets = position
+        self._nodes = position + self._node_count * _OFFSET.size
+
+    def __len__(self):
+        """Returns the number of nodes."""
+        return self._node_count
+
+    def _string(self, index):
+        text = self._strings[index]
+        if text is None:
+            start, end = self._string_positions[index]
+            text = self._strings[index] = str(self._data[start:end], "utf-8")
+        return text
+
+    def _read_value(self, kind, position):
+        """Reads a value of type kind (except strings and nodes), returns
+        (value, next position)."""
+        data = self._data
+        if kind == T_INT:
+            value, position = _read_varint(data, position)
+            return ((value >> 1) if not (value & 1) else -((value + 1) >> 1), position)
+        elif kind == T_FLOAT:
+            return (_FLOAT.unpack_from(data, position)[0], position + _FLOAT.size)
+        elif kind == T_TRUE:
+            return (True, position)
+        elif kind == T_FALSE:
+            return (False, position)
+        elif kind == T_NONE:
+            return (None, position)
+        raise ValueError("Unknown value type " + str(kind))
+
+    def _read_node(self, index):
+        """Decodes the node index, returns (tag name, properties, childs).
+
+        The child nodes are returned as _NodeIndex objects.
+        """
+        if not (0 <= index < self._node_count):
+            raise IndexError("Node index out of range")
+        data = self._data
+        strings = self._strings
+        position = self._nodes + _OFFSET.unpack_from(data, self._offsets + index * _OFFSET.size)[0]
+
+        # The small varints (one byte) and the strings are read inline,
+        # they are the most common values
+        tag = data[position]
+        if tag < 0x80:
+            position += 1
+        else:
+            tag, position = _read_varint(data, position)
+        text = strings[tag]
+        tag = self._string(tag) if text is None else text
+        count = data[position]
+        if count < 0x80:
+            position += 1
+        else:
+            count, position = _read_varint(data, position)
+        properties = {}
+        for i in range(count):
+            key = data[position]
+            if key < 0x80:
+                position += 1
+            else:
+                key, position = _read_varint(data, position)
+            text = strings[key]
+            key = self._string(key) if text is None else text
+            kind = data[position]
+            position += 1
+            if kind == T_STR:
+                value = data[position]
+                if value < 0x80:
+                    position += 1
+                else:
+                    value, position = _read_varint(data, position)
+                text = strings[value]
+                properties[key] = self._string(value) if text is None else text
+            else:
+                properties[key], position = self._read_value(kind, position)
+        count = data[position]
+        if count < 0x80:
+            position += 1
+        else:
+            count, position = _read_varint(data, position)
+        childs = []
+        append = childs.append
+        for i in range(count):
+            kind = data[position]
+            position += 1
+            if (kind == T_STR) or (kind == T_NODE):
+                value = data[position]
+                if value < 0x80:
+                    position += 1
+                else:
+                    value, position = _read_varint(data, position)
+                if kind == T_STR:
+                    text = strings[value]
+                    append(self._string(value) if text is None else text)
+                else:
+                    append(_NodeIndex(value))
+            else:
+                value, position = self._read_value(kind, position)
+                append(value)
+        return (tag, properties, childs)
+
+    def tag_name(self, index = 0):
+        """Returns the tag name of the node index"""
+        return self._read_node(index)[0]
+
+    def properties(self, index = 0):
+        """Returns a dictionary with the properties of the node index"""
+        return self._read_node(index)[1]
+
+    def child_nodes(self, index = 0):
+        """Returns a list with the indexes of the child nodes of the node
+        index (the text childs are not included)"""
+        return [int(child) for child in self._read_node(index)[2] if type(child) is _NodeIndex]
+
+    def load(self, index = 0):
+        """Loads the subtree of the node index, returns a RenderedObject.
+
+        The nodes saved only once (see the module documentation) are
+        loaded as a single RenderedObject too.
+        """
+        # First: create the nodes, with the indexes of their child nodes
+        loaded = {}
+        stack = [index]
+        while stack:
+            node = stack.pop()
+            if node in loaded:
+                continue
+            tag, properties, childs = self._read_node(node)
+            loaded[node] = UI.RenderedObject(tag, properties, childs)
+            for child in childs:
+                if (type(child) is _NodeIndex) and (child not in loaded):
+                    stack.append(child)
+
+        # Then: replace the indexes by the nodes
+        for node in loaded.values():
+            childs = node._inner_content
+            for position, child in enumerate(childs):
+                if type(child) is _NodeIndex:
+                    childs[position] = loaded[child]
+        return loaded[index]
+
+class _NodeIndex(int):
+    """The index of a node, as returned by BinaryTree._read_value"""
+
+    __slots__ = ()
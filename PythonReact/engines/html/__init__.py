@@ -6,3 +6,5 @@ document.
 """
 
 from .treetohtml import *
+from .template import *
+from .fragmentcache import *
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the FragmentCache class, a cache of converted HTML.
+
+Pages usually repeat the same small subtrees many times (like the items
+of a menu or the cards of a product list), in the same page and between
+requests. When a TreeToHTML has a FragmentCache, each small subtree is
+converted only once: the next time the same subtree is found, the saved
+HTML is used.
+"""
+
+import collections
+import sys
+import threading
+
+from PythonReact.UI import RenderedObject
+
+__all__ = ["FragmentCache"]
+
+# The subtrees with these tags are never cached, their HTML depends on
+# more than the subtree (see TreeToHTML.iter_html and TreeToHTML.compile)
+UNCACHEABLE_TAGS = ("deferred", "slot")
+
+# The property values with these types are saved as they are in the
+# fingerprints: two of them are equal only if their types are equal too
+# (like 1 and "1", but not 1 and True or 1.0)
+PLAIN_TYPES = frozenset((str, int, type(None)))
+
+class FragmentCache:
+    """Represents a LRU cache of HTML fragments.
+
+    The keys are structural fingerprints of the subtrees (see
+    fingerprint): two subtrees have the same fingerprint only if they
+    have the same HTML. When the cache is full, the least recently used
+    fragments are removed.
+
+    The cache can be used from many threads at the same time. If the
+    converter is changed (like it's tag_dict), the cache must be cleared.
+    """
+
+    def __init__(self, max_entries = 4096, max_bytes = 4 * 1024 * 1024, max_nodes = 32):
+        """Creates the new FragmentCache.
+
+        The optional arguments are:
+
+        * max_entries: The maximum number of fragments.
+        * max_bytes: The maximum memory used by the fragments and their
+        keys (approximate).
+        * max_nodes: The maximum number of RenderedObjects of a cached
+        subtree. Bigger subtrees are converted normally (but their small
+        childs can be cached).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self._lock = threading.Lock()
+        self.clear()
+
+    def __getstate__(self):
+        # The fragments and the lock are not copied (see
+        # TreeToHTML.render_parallel)
+        return (self.max_entries, self.max_bytes, self.max_nodes)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def clear(self):
+        """Removes all fragments and resets the statistics."""
+        with self._lock:
+            self._entries = collections.OrderedDict()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def fingerprint(self, node, context, too_big = None):
+        """Returns the fingerprint of node (a RenderedObject) in context.
+
+        context is the ConvertContext of the node. Returns None if the
+        subtree can not be cached: it's too big, it contains elements
+        (or other objects) that are not rendered yet, lazy childs,
+        deferred elements or slots.
+
+        The fingerprint contains the tags, the properties and the text
+        of all nodes of the subtree, in pre-order. It's saved in the node
+        (like the cached hash, see RenderedObject.__hash__), so the next
+        conversions of the same tree only walk the subtrees that can not
+        be cached.
+
+        too_big is an optional dictionary shared by the calls of one
+        conversion (like in TreeToHTML.iter_html), see find_too_big:
+        when a subtree is too big, all the subtrees of it that are too
+        big are found at once, so they are skipped in O(1) instead of
+        walking their first max_nodes nodes again.
+        """
+        if (too_big is not None) and (id(node) in too_big):
+            return None
+        saved = node._fingerprint
+        if saved is None:
+            saved = self._walk(node, too_big)
+            if saved is None:
+                return None
+            node._fingerprint = saved
+        nodes, tokens = saved
+        if nodes > self.max_nodes:
+            return None
+        return (context.in_form(), tokens)
+
+    def _walk(self, node, too_big):
+        """Returns the number of nodes and the fingerprint of node.
+
+        Returns None if the subtree can not be cached (see fingerprint).
+        """
+        tokens = []
+        append = tokens.append
+        max_nodes = self.max_nodes
+        nodes = 0
+        stack = [node]
+        pop = stack.pop
+        while stack:
+            item = pop()
+            if type(item) is str:
+                # The texts start with None and the nodes with their tags,
+                # so they are never confused
+                append(None)
+                append(item)
+                continue
+            if (type(item) is not RenderedObject) or (item._tag_name in UNCACHEABLE_TAGS):
+                return None
+            nodes += 1
+            if nodes > max_nodes:
+                if too_big is not None:
+                    self.find_too_big(node, too_big)
+                return None
+            childs = item._inner_content
+            if type(childs) is not list:
+                # The lazy childs are never cached (see UI.LazyContent)
+                return None
+            # The tag, the properties and the number of childs
+            append(item._tag_name)
+            properties = item._properties
+            if set(map(type, properties.values())) <= PLAIN_TYPES:
+                append(tuple(properties.items()))
+            else:
+                # The other values are saved with their types, so 1.0
+                # and "1.0" (or lists and tuples) are never confused
+                append(tuple(
+                    (key, value if type(value) in PLAIN_TYPES else (type(value), repr(value)))
+                    for key, value in properties.items()
+                ))
+            append(len(childs))
+            stack.extend(reversed(childs))
+        return (nodes, tuple(tokens))
+
+    def find_too_big(self, node, too_big):
+        """Finds the subtrees of node with more than max_nodes nodes.
+
+        The nodes are counted in one pass. The roots of the subtrees
+        that are too big are saved in too_big (a dictionary), by their
+        ids: the nodes are saved too, so their ids are not reused while
+        too_big is used.
+        """
+        # The nodes in pre-order, with the indexes of their parents
+        nodes = [node]
+        parents = [-1]
+        index = 0
+        while index < len(nodes):
+            childs = nodes[index]._inner_content
+            if type(childs) is list:
+                for child in childs:
+                    if type(child) is RenderedObject:
+                        nodes.append(child)
+                        parents.append(index)
+            index += 1
+
+        # The childs are always after their parents, so each subtree is
+        # counted before it's parent
+        counts = [1] * len(nodes)
+        for index in range(len(nodes) - 1, 0, -1):
+            counts[parents[index]] += counts[index]
+        max_nodes = self.max_nodes
+        for index, count in enumerate(counts):
+            if count > max_nodes:
+                too_big[id(nodes[index])] = nodes[index]
+
+    def get(self, key):
+        """Returns the HTML saved with key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, html):
+        """Saves the HTML of the subtree with the fingerprint key."""
+        size = sys.getsizeof(html) + _key_size(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (html, size)
+            self._bytes += size
+            while (len(self._entries) > self.max_entries) or (self._bytes > self.max_bytes):
+                removed_key, removed = self._entries.popitem(last = False)
+                self._bytes -= removed[1]
+                self._evictions += 1
+
+    def cache_info(self):
+        """Returns a dictionary with the statistics of the cache.
+
+        The keys are "hits", "misses", "hit_rate" (between 0 and 1),
+        "entries", "bytes" (the approximate memory used by the fragments
+        and their keys) and "evictions".
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+            }
+
+def _key_size(key):
+    """Returns the approximate memory used by key (a fingerprint)."""
+    size = 0
+    stack = [key]
+    while stack:
+        token = stack.pop()
+        size += sys.getsizeof(token)
+        if type(token) is tuple:
+            stack.extend(token)
+    return size
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the CompiledTemplate class, a precompiled element tree.
+
+A CompiledTemplate is created by TreeToHTML.compile: all the static parts
+of the tree are converted to HTML once, and only the slots (see UI.Slot)
+are converted when the template is rendered.
+"""
+
+__all__ = ["CompiledTemplate"]
+
+class Hole:
+    """Represents a slot found while compiling a template.
+
+    The attributes are the name of the slot, if it's inside a form and
+    the abstract childs of the slot (the default content).
+    """
+
+    __slots__ = ("name", "iform", "default")
+
+    def __init__(self, name, iform, default):
+        self.name = name
+        self.iform = iform
+        self.default = default
+
+class CompiledTemplate:
+    """Represents a compiled template.
+
+    The template is a list of parts: strings (the HTML of the static
+    parts) and holes (the slots).
+    """
+
+    def __init__(self, converter, parts, chunk_size):
+        """Creates the new CompiledTemplate.
+
+        The arguments are the TreeToHTML that compiled the template, the
+        list of parts (strings and Hole objects) and the chunk size used
+        by iter_render.
+        """
+        self._converter = converter
+        self._chunk_size = chunk_size
+        self._parts = []
+        # The HTML of the default content of each hole
+        self._defaults = {}
+        for part in parts:
+            if isinstance(part, Hole):
+                self._parts.append(part)
+                self._defaults[id(part)] = "".join(
+                    converter._iter_html(part.default, None, False, None, part.iform)
+                )
+            elif part != "":
+                self._parts.append(part)
+
+    def slot_names(self):
+        """Returns a list with the names of the slots, in order."""
+        return [part.name for part in self._parts if isinstance(part, Hole)]
+
+    def render(self, **values):
+        """Renders the template, returns a HTML string.
+
+        Each keyword argument fills the slot with the same name, the
+        value can be an element, a RenderedObject, a string (already
+        converted HTML) or a list of them. The slots without value
+        display their default content.
+        """
+        parts = []
+        for part in self._parts:
+            if type(part) is str:
+                parts.append(part)
+            else:
+                parts.extend(self._fill(part, values, None))
+        return "".join(parts)
+
+    def iter_render(self, **values):
+        """Like render, but returns a generator of strings.
+
+        The static parts are generated as they are, and the values of the
+        slots are generated in chunks (see TreeToHTML.iter_html).
+        """
+        for part in self._parts:
+            if type(part) is str:
+                yield part
+            else:
+                for chunk in self._fill(part, values, self._chunk_size):
+                    yield chunk
+
+    def _fill(self, hole, values, chunk_size):
+        """Returns an iterable with the HTML of the value of hole."""
+        if hole.name not in values:
+            return [self._defaults[id(hole)]]
+        value = values[hole.name]
+        if type(value) is str:
+            return [value]
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        return self._converter._iter_html(
+            list(value), chunk_size, False, None, hole.iform
+        )
@@ -37,19 +37,133 @@ otherwise.
 * `sectiontitle`: Converted to `h3`
 * `raw-text`: Converted to `pre`
 * `code-text`: Converted to `code`
+* `deferred`: Converted to `div`, see UI.Deferred and TreeToHTML.iter_html
+* `document (lang=LANG)`: Converted to `html (lang=LANG)`, preceded by the
+doctype, see UI.Document and TreeToHTML.iter_document
+* `document-head`: Converted to `head`
+* `document-body`: Converted to `body`
+* `document-title`: Converted to `title`
+* `meta (meta-name=NAME)`: Converted to `meta (name=NAME)`
+* `stylesheet (href=HREF)`: Converted to `link (rel="stylesheet" href=HREF)`
+* `preload (href=HREF as=TYPE)`: Converted to `link (rel="preload" href=HREF as=TYPE)`
+* `script (src=SRC)`: Converted to `script (src=SRC defer)`
+* `slot`: Converted to it's childs (without tag), see UI.Slot and
+TreeToHTML.compile
+* `virtual-list (count=C offset=O limit=L row_height=H)`: Converted to
+`div (data-count=C data-offset=O data-limit=L data-row-height=H)`
+* `spacer (height=H)`: Converted to `div (style="height: Hpx")`
+* `table`: Converted to `table`, see UI.Table. The rows of the table (a
+UI.TableRows) are converted all at once, see TreeToHTML.iter_table_rows
+* `table-head`: Converted to `thead`
+* `table-body`: Converted to `tbody`
+* `table-row`: Converted to `tr`
+* `table-header`: Converted to `th`
+* `table-cell`: Converted to `td`
 
 Others tags will be not parsed.
+
+Thread safety: the conversion never modifies the abstract tree, the
+converter (while it's attributes, like tag_dict, are not changed) nor the
+context passed to convert_node. All the conversion state is kept in
+immutable ConvertContext objects and local variables, so the same
+TreeToHTML object (and the same abstract tree) can be used from many
+threads at the same time. The only shared state is the optional
+FragmentCache, which uses a lock.
 """
 
+import concurrent.futures
+import itertools
+from types import GeneratorType
+
 from PythonReact import UI
+from PythonReact.engines.html.template import CompiledTemplate, Hole
+
+# Default size (in characters) of the chunks generated by
+# TreeToHTML.iter_html and TreeToHTML.write_html
+DEFAULT_CHUNK_SIZE = 8192
+
+# Script that moves the content of a deferred element to it's placeholder,
+# {0} is the placeholder's id
+DEFERRED_SWAP_SCRIPT = (
+    "<script>(function(){{"
+    "var p=document.getElementById(\"{0}\"),"
+    "t=document.getElementById(\"{0}-content\");"
+    "p.replaceChildren(t.content);t.remove();"
+    "}})();</script>"
+)
+
+# Returned by next when the lazy childs end
+_END = object()
+
+# The doctype written before the document tag
+DOCTYPE = "<!DOCTYPE html>\n"
+
+# Number of table rows converted together by TreeToHTML.iter_table_rows
+TABLE_ROW_BATCH = 256
+
+# Placeholder of the cells in the row templates of the tables (it's never
+# found in the values of the cells, because they are not in the template)
+_CELL_MARKER = "\x00"
+
+class ConvertContext:
+    """Represents the state of a conversion at one node of the tree.
+
+    The contexts are immutable: the conversion uses a new context when
+    the state changes (like when it enters a form), so the same converter
+    can be used from many threads at the same time.
+
+    For compatibility, ConvertContext can be used as the old "data"
+    dictionary: context["iform"] is the same as context.in_form().
+    """
+
+    __slots__ = ("_iform",)
+
+    def __init__(self, iform = False):
+        """Creates the new ConvertContext.
+
+        iform is True if the node is inside a form.
+        """
+        self._iform = bool(iform)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_iform"):
+            raise AttributeError("ConvertContext objects are immutable")
+        super().__setattr__(name, value)
+
+    def __getitem__(self, key):
+        if key == "iform":
+            return self._iform
+        raise KeyError(key)
+
+    def in_form(self):
+        """Returns True if the node is inside a form"""
+        return self._iform
+
+    def entering_form(self):
+        """Returns the context for the childs of a form"""
+        return FORM_CONTEXT
+
+def as_context(data):
+    """Converts data (a ConvertContext or a dictionary) to a ConvertContext."""
+    if isinstance(data, ConvertContext):
+        return data
+    return FORM_CONTEXT if data.get("iform", False) else DEFAULT_CONTEXT
+
+# The context at the root of the document and inside a form
+DEFAULT_CONTEXT = ConvertContext(False)
+FORM_CONTEXT = ConvertContext(True)
 
 class TreeToHTML:
     """The TreeToHTML class exports a AbstractTree to a HTML ready-to-parse
     string.
     """
 
-    def __init__(self):
-        """Construct a empty TreeToHTML parser."""
+    def __init__(self, fragment_cache = None):
+        """Construct a empty TreeToHTML parser.
+
+        fragment_cache is an optional FragmentCache, used to convert the
+        repeated small subtrees only once.
+        """
 
         self.tag_dict = {
             "container": "div",
@@ -75,28 +189,51 @@ class TreeToHTML:
             "title": "h1",
             "subtitle": "h2",
             "sectiontitle": "h3",
-            "image": "img"
+            "image": "img",
+            "document": "html",
+            "document-head": "head",
+            "document-body": "body",
+            "document-title": "title",
+            "meta": "meta",
+            "stylesheet": "link",
+            "preload": "link",
+            "script": "script",
+            "virtual-list": "div",
+            "spacer": "div",
+            "table": "table",
+            "table-head": "thead",
+            "table-body": "tbody",
+            "table-row": "tr",
+            "table-header": "th",
+            "table-cell": "td"
         }
 
+        # Prefix of the ids of the deferred elements' placeholders
+        self.deferred_prefix = "deferred-"
+
+        self.fragment_cache = fragment_cache
+
     def get_tag_name(self, tag_name):
         return self.tag_dict[tag_name]
 
-    def convert_node(self, node, data):
-        if isinstance(node, str):
-            return node
+    def convert_head(self, node, data):
+        """Converts the tag and the properties of one node (not it's childs).
+
+        node is a RenderedObject of the abstract tree and data is the
+        context of the node (a ConvertContext, see convert_node).
 
+        Returns a tuple (tag, properties, prefix, childs) where tag and
+        properties are the HTML tag name and attributes, prefix is a list
+        of already converted HTML nodes that should be placed before the
+        childs (like the frame's legend) and childs is the list of the
+        abstract childs of the node that still need to be converted.
+        """
         ntg = node.tag_name()
         pp = node.properties()
         class_list = pp.get("style", "")
         expp = {}
-
-        if(ntg == "form"):
-            data["iform"] = True;
-
-        childs = [self.convert_node(i, data) for i in node.inner_content()]
-
-        if(ntg == "form"):
-            data["iform"] = False;
+        prefix = []
+        childs = node.inner_content()
 
         if ntg == "button":
             if pp.get("type", "button") == "link":
@@ -113,22 +250,29 @@ class TreeToHTML:
         elif ntg == "frame":
             if data["iform"]:
                 tag = "fieldset"
-                childs = [
+                prefix = [
                     UI.RenderedObject(
                         tag_name = "legend",
                         properties = {},
                         inner_content = [pp.get("title", "")]
                     )
-                ] + childs
+                ]
             else:
                 tag = "div"
-                childs = [
+                prefix = [
                     UI.RenderedObject(
                         tag_name = "div",
                         properties = {"align": "center"},
                         inner_content = [pp.get("title", "")]
                     )
-                ] + childs
+                ]
+        elif ntg == "deferred":
+            # The element is rendered when it's converted (or the fallback
+            # is used, see UI.deferred_element)
+            tag = "div"
+            element = UI.deferred_element(node)
+            if element is not None:
+                childs = [element]
         elif ntg == "heading":
             tag = "h" + str(pp.get("level", "1"))
         elif ntg == "text-tag":
@@ -204,6 +348,39 @@ class TreeToHTML:
                 expp["title"] = pp.get("title")
                 expp["src"] = node.inner_content()[0]
                 childs = []
+            elif ntg == "document":
+                if pp.get("lang") is not None:
+                    expp["lang"] = pp.get("lang")
+            elif ntg == "meta":
+                if pp.get("charset") is not None:
+                    expp["charset"] = pp.get("charset")
+                if pp.get("meta-name") is not None:
+                    expp["name"] = pp.get("meta-name")
+                if pp.get("content") is not None:
+                    expp["content"] = pp.get("content")
+            elif ntg == "stylesheet":
+                expp["rel"] = "stylesheet"
+                expp["href"] = pp.get("href", "#")
+            elif ntg == "preload":
+                expp["rel"] = "preload"
+                expp["href"] = pp.get("href", "#")
+                expp["as"] = pp.get("as", "fetch")
+            elif ntg == "virtual-list":
+                expp["data-count"] = pp.get("count", 0)
+                expp["data-offset"] = pp.get("offset", 0)
+                expp["data-limit"] = pp.get("limit", 0)
+                expp["data-row-height"] = pp.get("row_height", 0)
+            elif ntg == "spacer":
+                expp["style"] = "height: " + str(pp.get("height", 0)) + "px"
+                # The div tag can not be written as <div />
+                if (type(childs) is list) and (len(childs) == 0):
+                    childs = [""]
+            elif ntg == "script":
+                expp["src"] = pp.get("src", "#")
+                expp["defer"] = "defer"
+                # The script tag can not be written as <script />
+                if (type(childs) is list) and (len(childs) == 0):
+                    childs = [""]
 
             if entry_type:
                 if pp.get("form_name") is not None:
@@ -221,11 +398,448 @@ class TreeToHTML:
         if (pp.get("css") is not None) and (pp.get("css").strip() != ""):
             expp["style"] = pp.get("css")
 
-        return UI.RenderedObject(
-            tag_name = tag,
-            properties = expp,
-            inner_content = childs
-        )
+        return (tag, expp, prefix, childs)
+
+    def convert_node(self, node, data = DEFAULT_CONTEXT):
+        """Converts an abstract tree node to a HTML tree node.
+
+        data is the context of node, a ConvertContext or (for
+        compatibility) a dictionary with the "iform" key (True when the
+        node is inside a form). data is never modified.
+
+        The tree is walked using an explicit stack (not recursion), so
+        the depth of the tree is only limited by the available memory.
+
+        Returns a new RenderedObject tree with HTML tags.
+        """
+        if isinstance(node, str):
+            return node
+
+        # The converted root is appended to this list
+        result = []
+        # Each item of the stack is a tuple (abstract node, list of the
+        # converted parent's childs, context)
+        stack = [(node, result, as_context(data))]
+        while stack:
+            abstract, parent_childs, context = stack.pop()
+            if isinstance(abstract, str):
+                parent_childs.append(abstract)
+                continue
+            elif isinstance(abstract, UI.Element):
+                abstract = UI.render_tree(abstract)
+            elif not isinstance(abstract, UI.RenderedObject):
+                parent_childs.append(str(abstract))
+                continue
+
+            if abstract.tag_name() == "slot":
+                # The slot is only a wrapper for it's childs
+                for child in reversed(list(abstract.inner_content())):
+                    stack.append((child, parent_childs, context))
+                continue
+
+            tag, expp, prefix, abstract_childs = self.convert_head(abstract, context)
+            if type(abstract_childs) is not list:
+                # The HTML tree is complete, so the lazy childs (see
+                # UI.LazyContent) are created now
+                abstract_childs = list(abstract_childs)
+            childs = list(prefix)
+            parent_childs.append(UI.RenderedObject(tag, expp, childs))
+
+            # The stack is LIFO: push the childs in reverse order
+            if abstract.tag_name() == "form":
+                context = context.entering_form()
+            for child in reversed(abstract_childs):
+                stack.append((child, childs, context))
+
+        return result[0]
 
     def toHTML(self, tree):
-        return self.convert_node(tree, {"iform": False}).to_xml_string()
+        """Converts the abstract tree to a HTML string.
+
+        The HTML is generated in a single pass over the abstract tree,
+        without building the intermediate HTML tree of convert_node.
+        The deferred elements (see UI.Deferred) are rendered in place.
+        """
+        return "".join(self._iter_html(tree, None, False, None))
+
+    def render_parallel(self, element, executor = None, max_workers = None):
+        """Renders element and converts it to a HTML string, in parallel.
+
+        The childs of element are rendered and converted in other
+        processes (using executor, or a new
+        concurrent.futures.ProcessPoolExecutor with max_workers workers)
+        and their HTML is joined in order. This is useful when the
+        element have many independent and big childs, like the widgets
+        of a dashboard.
+
+        The childs (and this converter) are sent to the processes using
+        pickle, so they should not contain unpicklable values, like
+        lambda functions as event handlers.
+
+        Returns the same string as toHTML(element.render()).
+        """
+        tree = UI.render_shallow(element)
+
+        # Find the pending childs and if they are inside a form
+        pending = []
+        stack = [(tree, tree.tag_name() == "form")]
+        while stack:
+            node, iform = stack.pop()
+            childs = node.inner_content()
+            if type(childs) is not list:
+                # The lazy childs are rendered when they are converted
+                continue
+            for index, child in enumerate(childs):
+                if isinstance(child, UI.Element):
+                    pending.append((childs, index, iform))
+                elif isinstance(child, UI.RenderedObject):
+                    stack.append((child, iform or (child.tag_name() == "form")))
+
+        if executor is None:
+            with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+                return self._convert_pending(tree, pending, executor)
+        return self._convert_pending(tree, pending, executor)
+
+    def _convert_pending(self, tree, pending, executor):
+        """Implements render_parallel, once the pending childs are found.
+
+        The HTML of each pending child is saved in a dictionary (the tree
+        is not modified) and used when the child is found by _iter_html.
+        """
+        futures = [
+            executor.submit(_render_to_html, self, childs[index], iform)
+            for childs, index, iform in pending
+        ]
+        converted = {}
+        for (childs, index, iform), future in zip(pending, futures):
+            converted[(id(childs[index]), iform)] = future.result()
+        return "".join(self._iter_html(tree, None, False, None,
+                                       converted = converted))
+
+    def iter_html(self, tree, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+        """Converts the abstract tree to HTML, chunk by chunk.
+
+        Unlike convert_node, the HTML tree is never built: the abstract
+        tree is walked once and the HTML is generated as the walk advances.
+
+        Returns a generator of strings, each one of about chunk_size
+        characters (the last one may be smaller). If chunk_size is None,
+        all the HTML is generated as a single chunk.
+
+        The deferred elements (see UI.Deferred) are not rendered in
+        place: a placeholder (with the fallback content) is generated
+        instead, and the rest of the document is generated without
+        waiting for them. At the end of the document, each deferred
+        element is rendered and appended inside a template tag, followed
+        by a small script that moves it to the placeholder. If executor
+        (a concurrent.futures.Executor) is given, the deferred elements
+        are rendered in the executor as soon as they are found, so they
+        are rendered while the rest of the document is generated.
+
+        Without deferred elements, joining all chunks gives the same
+        string as toHTML.
+        """
+        return self._iter_html(tree, chunk_size, True, executor)
+
+    def _iter_html(self, tree, chunk_size, out_of_order, executor, iform = False,
+                   holes = False, converted = None):
+        """Implements toHTML, iter_html and compile.
+
+        tree can also be a list of abstract nodes. If out_of_order is
+        False, the deferred elements are rendered in place. iform is True
+        if tree is inside a form. If holes is True, the content of the
+        slots is not converted: a template.Hole is generated instead (after
+        the HTML before it). converted is a dictionary from (id of an
+        element, True if it's inside a form) to the HTML of the element,
+        used instead of rendering it (see render_parallel).
+        """
+        context = FORM_CONTEXT if iform else DEFAULT_CONTEXT
+        parts = []
+        append = parts.append
+        size = 0
+        cache = None if holes else self.fragment_cache
+        # The subtrees that are too big, see FragmentCache.fingerprint
+        too_big = {}
+        # Number of fragments being converted for the cache: while it's
+        # not zero, the parts are not joined (see _Fragment)
+        recording = 0
+        # The deferred elements found, as tuples (id, element or future,
+        # context)
+        deferred = []
+        # Number of deferred elements found (deferred is emptied while
+        # they are sent, so it can't be used for the ids)
+        deferred_count = 0
+        # Each item of the stack is a string (already converted HTML),
+        # a RenderedObject of the abstract tree, a UI.Element (which is
+        # rendered when found), a ConvertContext (the context of the
+        # next items), a list of items, a generator of items (the lazy
+        # childs), a template.Hole or a _Fragment.
+        stack = [tree]
+        pop = stack.pop
+        push = stack.append
+        while stack or deferred:
+            if not stack:
+                # The document is done: send it before waiting for the
+                # deferred elements
+                if parts:
+                    yield "".join(parts)
+                    parts.clear()
+                    size = 0
+                node_id, pending, pending_context = deferred.pop(0)
+                if isinstance(pending, UI.Element):
+                    content = UI.render_tree(pending)
+                else:
+                    content = pending.result()
+                push(DEFERRED_SWAP_SCRIPT.format(node_id))
+                push("</template>")
+                push(context)
+                push(content)
+                push(pending_context)
+                push("<template id=\"" + node_id + "-content\" >")
+                continue
+
+            item = pop()
+            if type(item) is str:
+                append(item)
+                if chunk_size is None:
+                    continue
+                size += len(item)
+            elif isinstance(item, UI.RenderedObject):
+                if (cache is not None) and (recording == 0):
+                    key = cache.fingerprint(item, context, too_big)
+                    if key is not None:
+                        html = cache.get(key)
+                        if html is None:
+                            # Convert it normally, and save the HTML
+                            # when it's done
+                            recording += 1
+                            push(_Fragment(key, len(parts)))
+                        else:
+                            push(html)
+                            continue
+                if item.tag_name() == "slot":
+                    # The slot is only a wrapper for it's childs
+                    if holes:
+                        push(Hole(item.properties().get("slot"), context.in_form(),
+                                  item.inner_content()))
+                    else:
+                        push(item.inner_content())
+                    continue
+                tag, expp, prefix, childs = self.convert_head(item, context)
+                if out_of_order and (item.tag_name() == "deferred") and \
+                   (UI.deferred_element(item) is not None):
+                    # Generate the placeholder and remember the element
+                    deferred_count += 1
+                    if "id" not in expp:
+                        expp["id"] = self.deferred_prefix + str(deferred_count)
+                    element = childs[0]
+                    if executor is not None:
+                        element = executor.submit(UI.render_tree, element)
+                    deferred.append((expp["id"], element, context))
+                    childs = item.inner_content()
+                start = len(parts)
+                if item.tag_name() == "document":
+                    append(DOCTYPE)
+                append("<" + tag + " ")
+                for key, value in expp.items():
+                    append(key + "=\"" + str(value) + "\" ")
+                lazy = type(childs) is not list
+                if (len(prefix) == 0) and (not lazy) and (len(childs) == 0):
+                    append("/>")
+                else:
+                    append(">")
+                    # The stack is LIFO: push the end tag first and
+                    # the childs in reverse order
+                    push("</" + tag + ">")
+                    is_form = item.tag_name() == "form"
+                    if is_form:
+                        # Restore the current context after the childs
+                        push(context)
+                    if isinstance(childs, UI.TableRows):
+                        # The rows of a table are converted in batches
+                        push(self.iter_table_rows(childs, context))
+                    elif lazy:
+                        # The lazy childs (see UI.LazyContent) are
+                        # converted one by one, as they are created
+                        push(iter(childs))
+                    else:
+                        for child in reversed(childs):
+                            push(child)
+                    if is_form:
+                        push(context.entering_form())
+                    for child in reversed(prefix):
+                        push(child.to_xml_string())
+                if chunk_size is None:
+                    continue
+                for part in parts[start:]:
+                    size += len(part)
+            elif isinstance(item, UI.Element):
+                if converted is not None:
+                    html = converted.get((id(item), context.in_form()))
+                    if html is not None:
+                        push(html)
+                        continue
+                push(UI.render_tree(item))
+                continue
+            elif isinstance(item, ConvertContext):
+                context = item
+                continue
+            elif type(item) is list:
+                for child in reversed(item):
+                    push(child)
+                continue
+            elif type(item) is GeneratorType:
+                child = next(item, _END)
+                if child is not _END:
+                    push(item)
+                    push(child)
+                continue
+            elif type(item) is _Fragment:
+                cache.put(item.key, "".join(parts[item.start:]))
+                recording -= 1
+                continue
+            elif isinstance(item, Hole):
+                if parts:
+                    yield "".join(parts)
+                    parts.clear()
+                    size = 0
+                yield item
+                continue
+            else:
+                push(str(item))
+                continue
+
+            if (size >= chunk_size) and (recording == 0):
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+
+        if parts:
+            yield "".join(parts)
+
+    def iter_table_rows(self, rows, data = DEFAULT_CONTEXT):
+        """Converts the rows of a table (see UI.TableRows) to HTML.
+
+        data is the context of the rows (see convert_node). The row nodes
+        are not created: the first row is converted to a template (with a
+        placeholder for each cell), and the values of all the rows are
+        formatted with it, TABLE_ROW_BATCH rows at a time.
+
+        Returns a generator of HTML strings (one for each batch), the
+        joined strings are the same as converting the row nodes.
+        """
+        columns = rows.get_columns()
+        if len(columns) == 0:
+            return
+        sample = UI.TableRows.row_node([_CELL_MARKER] * len(columns))
+        # The sample has no slots, holes is True only for not saving it in
+        # the fragment cache
+        template = "".join(self._iter_html(sample, None, False, None,
+                                           as_context(data).in_form(), True))
+        template = template.replace("{", "{{").replace("}", "}}")
+        template = template.replace(_CELL_MARKER, "{}")
+        converted = map(template.format, *[map(str, column) for column in columns])
+        while True:
+            batch = "".join(itertools.islice(converted, TABLE_ROW_BATCH))
+            if len(batch) == 0:
+                return
+            yield batch
+
+    def compile(self, element, chunk_size = DEFAULT_CHUNK_SIZE):
+        """Compiles element (or a rendered abstract tree) to a template.
+
+        The tree is rendered and converted now, except the content of the
+        slots (see UI.Slot). Returns a CompiledTemplate, which renders
+        the same HTML as toHTML, but only converts the values of the
+        slots. chunk_size is used by CompiledTemplate.iter_render.
+        """
+        if isinstance(element, UI.Element):
+            element = UI.render_tree(element)
+        parts = list(self._iter_html(element, None, False, None, holes = True))
+        return CompiledTemplate(self, parts, chunk_size)
+
+    def document_head(self, document):
+        """Converts the start of a UI.Document to HTML.
+
+        Returns the doctype, the html and head tags and the start tag of
+        the body, as a string. The body element is not rendered.
+        """
+        tree = UI.render_shallow(document)
+        head, body = tree.inner_content()
+
+        parts = [DOCTYPE, self._start_tag(tree)]
+        parts.extend(self._iter_html(head, None, False, None))
+        parts.append(self._start_tag(body))
+        return "".join(parts)
+
+    def iter_document_body(self, document, body = None,
+                           chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+        """Converts the body of a UI.Document to HTML, chunk by chunk.
+
+        body is the RenderedObject of the document's body element, if it
+        was already rendered (like with Element.render_async). Otherwise,
+        the body element is rendered when the generator is started.
+
+        Returns a generator of strings, like iter_html. The last string
+        closes the body and html tags.
+        """
+        if body is None:
+            body = document.get_body()
+        for chunk in self._iter_html(body, chunk_size, True, executor):
+            yield chunk
+        yield "</" + self.get_tag_name("document-body") + "></" + \
+            self.get_tag_name("document") + ">"
+
+    def iter_document(self, document, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+        """Converts a UI.Document to HTML, chunk by chunk.
+
+        The first string is the start of the document (see document_head):
+        it's generated before rendering the body element, so the browser
+        can download the stylesheets and scripts while the body is
+        rendered and generated (see iter_html).
+
+        Without deferred elements, joining all chunks gives the same
+        string as toHTML(document.render()).
+        """
+        yield self.document_head(document)
+        for chunk in self.iter_document_body(document, None, chunk_size, executor):
+            yield chunk
+
+    def _start_tag(self, node):
+        """Converts the start tag of node (a RenderedObject) to HTML."""
+        tag, expp, prefix, childs = self.convert_head(node, DEFAULT_CONTEXT)
+        parts = ["<" + tag + " "]
+        for key, value in expp.items():
+            parts.append(key + "=\"" + str(value) + "\" ")
+        parts.append(">")
+        return "".join(parts)
+
+    def write_html(self, tree, fp, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+        """Converts the abstract tree to HTML and writes it to fp.
+
+        fp is any object with a write method (a file, a socket file or
+        a io.StringIO), the HTML is written chunk by chunk (see iter_html).
+        """
+        for chunk in self.iter_html(tree, chunk_size, executor):
+            fp.write(chunk)
+
+class _Fragment:
+    """Marks the end of a subtree converted for the FragmentCache.
+
+    key is the subtree's fingerprint and start the index of the first
+    part of it's HTML (see TreeToHTML._iter_html).
+    """
+
+    __slots__ = ("key", "start")
+
+    def __init__(self, key, start):
+        self.key = key
+        self.start = start
+
+def _render_to_html(converter, element, iform):
+    """Renders element and converts it to HTML, see render_parallel.
+
+    This function runs in the worker processes.
+    """
+    tree = UI.render_tree(element)
+    return "".join(converter._iter_html(tree, None, False, None, iform))
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""The JSON engine converts a RenderedObject tree to JSON, and loads it
+back (see TreeToJSON).
+"""
+
+from .treetojson import *
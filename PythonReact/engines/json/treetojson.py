@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the TreeToJSON class.
+
+This class converts a RenderedObject tree to JSON and back, so the tree
+can be sent to the client-side code (for example, to hydrate the page) or
+saved in a key-value store.
+
+Each node is an array [tag name, properties, childs], where properties is
+an object and childs is an array. The text childs are strings and the
+other values (numbers, booleans and null) are written as they are, so
+the tree can be loaded without losing their types. For example:
+
+    ["container", {"style": "box"}, ["Some text", ["separator", {}, []]]]
+
+The conversion is done without recursion, so the depth of the tree is
+only limited by the available memory.
+"""
+
+import json
+from json.encoder import encode_basestring
+
+from PythonReact import UI
+
+__all__ = ["TreeToJSON"]
+
+# Default size (in characters) of the chunks generated by
+# TreeToJSON.iter_json and TreeToJSON.write_json
+DEFAULT_CHUNK_SIZE = 8192
+
+class TreeToJSON:
+    """The TreeToJSON class exports a RenderedObject tree to JSON, and
+    imports it back.
+    """
+
+    def __init__(self):
+        """Construct a empty TreeToJSON converter."""
+
+        self._decoder = json.JSONDecoder()
+
+    def to_json(self, tree):
+        """Converts tree to a JSON string."""
+        return "".join(self.iter_json(tree, None))
+
+    def iter_json(self, tree, chunk_size = DEFAULT_CHUNK_SIZE):
+        """Converts tree to JSON, chunk by chunk.
+
+        Returns a generator of strings, each one of about chunk_size
+        characters (the last one may be smaller). If chunk_size is None,
+        all the JSON is generated as a single chunk.
+
+        Raises a ValueError if the root is not a RenderedObject or the
+        tree contains values that can not be converted to JSON (like
+        elements that are not rendered).
+        """
+        if type(tree) is not UI.RenderedObject:
+            raise ValueError("The root of the tree should be a RenderedObject")
+        parts = []
+        append = parts.append
+        size = 0
+        # The stack contains the pending nodes and strings (already
+        # converted JSON, like the end of the arrays)
+        stack = [tree]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            item = pop()
+            kind = type(item)
+            if kind is str:
+                append(item)
+                if chunk_size is None:
+                    continue
+                size += len(item)
+            elif kind is UI.RenderedObject:
+                properties = []
+                for key, value in item._properties.items():
+                    if type(value) is str:
+                        value = encode_basestring(value)
+                    else:
+                        value = _encode_value(value)
+                    properties.append(encode_basestring(key) + ":" + value)
+                properties = "{" + ",".join(properties) + "}"
+                start = encode_basestring(item._tag_name)
+                childs = item._inner_content
+                if type(childs) is not list:
+                    # The lazy childs (see UI.LazyContent) are converted
+                    # one by one, as they are created
+                    append("[" + start + "," + properties + ",[")
+                    push("]]")
+                    push(_LazyChilds(iter(childs)))
+                    continue
+                for child in childs:
+                    if type(child) is UI.RenderedObject:
+                        break
+                else:
+                    # Only texts and values (the most common case, like
+                    # labels): the node is written at once
+                    push("[" + start + "," + properties + ",[" + ",".join([
+                        encode_basestring(child) if type(child) is str else _encode_value(child)
+                        for child in childs
+                    ]) + "]]")
+                    continue
+                part = "[" + start + "," + properties + ",["
+                append(part)
+                # The stack is LIFO: push the end first and the childs
+                # in reverse order, with the commas between them
+                push("]]")
+                last = len(childs) - 1
+                for index in range(last, -1, -1):
+                    child = childs[index]
+                    if type(child) is str:
+                        child = encode_basestring(child)
+                    push(child)
+                    if index != 0:
+                        push(",")
+                if chunk_size is None:
+                    continue
+                size += len(part)
+            elif kind is _LazyChilds:
+                child = next(item.childs, _END)
+                if child is not _END:
+                    # The stack is LIFO: the comma, the child and then
+                    # the next childs
+                    push(item)
+                    push(encode_basestring(child) if type(child) is str else child)
+                    if item.started:
+                        push(",")
+                    item.started = True
+                continue
+            else:
+                push(_encode_value(item))
+                continue
+
+            if size >= chunk_size:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+
+        if parts:
+            yield "".join(parts)
+
+    def write_json(self, tree, fp, chunk_size = DEFAULT_CHUNK_SIZE):
+        """Converts tree to JSON and writes it to fp.
+
+        fp is any object with a write method (a file, a socket file or
+        a io.StringIO), the JSON is written chunk by chunk (see iter_json).
+        """
+        for chunk in self.iter_json(tree, chunk_size):
+            fp.write(chunk)
+
+    def from_json(self, text):
+        """Converts a JSON string (see to_json) to a RenderedObject tree.
+
+        Raises a ValueError if text is not valid JSON or it's not a tree.
+        """
+        try:
+            data = json.loads(text)
+        except RecursionError:
+            # The JSON parser is recursive, use a slower (but iterative)
+            # parser for the very deep trees
+            data = self._parse_deep(text)
+        return _from_lists(data)
+
+    def load_json(self, fp):
+        """Like from_json, but reads the JSON from fp (a file)."""
+        return self.from_json(fp.read())
+
+    def _parse_deep(self, text):
+        """Parses text like json.loads, but the arrays are parsed without
+        recursion (the other values are parsed by json.JSONDecoder)."""
+        raw_decode = self._decoder.raw_decode
+        whitespace = " \t\n\r"
+        length = len(text)
+        # The arrays being parsed, the last is the innermost
+        stack = []
+        # True after a "[" or a ",", when the next item must be a value
+        # (or, after "[", the end of the array)
+        expect_value = True
+        position = 0
+        while True:
+            while (position < length) and (text[position] in whitespace):
+                position += 1
+            if position >= length:
+                raise ValueError("Unexpected end of the JSON data")
+            char = text[position]
+            if expect_value and (char == "["):
+                array = []
+                if stack:
+                    stack[-1].append(array)
+                stack.append(array)
+                position += 1
+                continue
+            if (char == "]") and stack and \
+               ((not expect_value) or (len(stack[-1]) == 0)):
+                value = stack.pop()
+                position += 1
+            elif (char == ",") and stack and (not expect_value):
+                expect_value = True
+                position += 1
+                continue
+            elif expect_value:
+                value, position = raw_decode(text, position)
+                if stack:
+                    stack[-1].append(value)
+            else:
+                raise ValueError("Unexpected " + repr(char) + " at " + str(position))
+
+            if not stack:
+                break
+            expect_value = False
+
+        while (position < length) and (text[position] in whitespace):
+            position += 1
+        if position != length:
+            raise ValueError("Extra data at " + str(position))
+        return value
+
+# Returned by next when the lazy childs end
+_END = object()
+
+class _LazyChilds:
+    """The lazy childs being converted by TreeToJSON.iter_json"""
+
+    __slots__ = ("childs", "started")
+
+    def __init__(self, childs):
+        self.childs = childs
+        # False until the first child is converted (the next childs are
+        # preceded by a comma)
+        self.started = False
+
+def _encode_value(value):
+    """Converts value (a number, a boolean or None) to JSON."""
+    if value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif value is None:
+        return "null"
+    elif type(value) is int:
+        return int.__repr__(value)
+    elif type(value) is float:
+        # Like the json module (the infinite values are not valid JSON)
+        if value != value:
+            return "NaN"
+        elif value == float("inf"):
+            return "Infinity"
+        elif value == -float("inf"):
+            return "-Infinity"
+        return float.__repr__(value)
+    raise ValueError("Can not convert a " + type(value).__name__ + " to JSON")
+
+def _from_lists(data):
+    """Converts the nested lists of a parsed JSON tree to RenderedObjects."""
+    root = _list_to_node(data)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        childs = node._inner_content
+        for index, child in enumerate(childs):
+            if type(child) is list:
+                childs[index] = _list_to_node(child)
+                stack.append(childs[index])
+            elif type(child) is dict:
+                raise ValueError("A child can not be an object")
+    return root
+
+def _list_to_node(data):
+    """Converts a single [tag, properties, childs] list to a node."""
+    if (type(data) is not list) or (len(data) != 3) or (type(data[0]) is not str) or \
+       (type(data[1]) is not dict) or (type(data[2]) is not list):
+        raise ValueError("A node should be an array [tag, properties, childs]")
+    return UI.RenderedObject(data[0], data[1], data[2])
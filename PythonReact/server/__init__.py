@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""The server module provides WSGI and ASGI applications.
+
+The applications map URL paths to functions that create the root element
+of the page, render it and stream the HTML document (see
+engines.html.TreeToHTML.iter_html) as it's generated.
+
+The testing module provides test clients, which call the applications
+directly (without network).
+"""
+
+from .request import *
+from .application import *
+from .wsgi import *
+from .asgi import *
+from .testing import *
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Application class, the base of the WSGI and ASGI apps."""
+
+from PythonReact import UI, engines
+
+__all__ = ["Application"]
+
+class Application:
+    """Represents a web application.
+
+    The routes are a dictionary that maps URL paths (like "/users") to
+    page factories: functions that receive a server.Request and return
+    the root element of the page (an UI.Document, or any other element,
+    which is used as the body of a document).
+
+    The head of the document is sent before rendering the body (see
+    engines.html.TreeToHTML.iter_document), so the status of the
+    responses is always "200 OK" once the page is found.
+    """
+
+    def __init__(self, routes, converter = None, timeout = None,
+                 max_concurrency = None, chunk_size = engines.html.DEFAULT_CHUNK_SIZE,
+                 title = ""):
+        """Creates the new Application.
+
+        The arguments are:
+
+        * routes: The dictionary of page factories (see above).
+        * converter: The engines.html.TreeToHTML used (a new one by default).
+        * timeout: The maximum time (in seconds) for each request, or None.
+        If the time ends while the page is being rendered or sent, the rest
+        of the page is not sent.
+        * max_concurrency: The maximum number of requests handled at the
+        same time, or None. The requests wait for a free slot until their
+        timeout, and then the response is a "503 Service Unavailable".
+        * chunk_size: The size of the chunks sent (in characters).
+        * title: The title of the pages that are not an UI.Document.
+        """
+        self.routes = dict(routes)
+        self.converter = converter or engines.html.TreeToHTML()
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.title = title
+
+    def find_page(self, request):
+        """Returns the page factory for request, or None."""
+        return self.routes.get(request.path)
+
+    def make_document(self, page):
+        """Returns the UI.Document of page (the result of a page factory)."""
+        if isinstance(page, UI.Document):
+            return page
+        return UI.Document(title = self.title, body = page)
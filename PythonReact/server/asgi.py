@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the ASGIApp class, an ASGI 3 application."""
+
+import asyncio
+import time
+
+from PythonReact import UI
+from PythonReact.server import Application, Request
+
+__all__ = ["ASGIApp"]
+
+class ASGIApp(Application):
+    """Represents an ASGI application.
+
+    The head of the document is sent first, then the body is rendered
+    with Element.render_async (so the elements can load their data
+    concurrently) and sent chunk by chunk. Each chunk is sent only after the server accepted the last one,
+    so a slow client slows down the generation, instead of filling the
+    memory.
+
+    The chunks are converted in a thread of the event loop's default
+    executor, and the deferred elements (see UI.Deferred) are rendered
+    with render_async in the event loop, so a slow deferred element
+    never blocks the other requests. The timeout applies to them too.
+
+    See Application for the arguments.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # The semaphore is created in the event loop (see _get_slots)
+        self._slots = None
+
+    def _get_slots(self):
+        if (self._slots is None) and (self.max_concurrency is not None):
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await _lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError("Unsupported ASGI scope type " + str(scope["type"]))
+
+        start = time.monotonic()
+        request = Request.from_asgi(scope)
+
+        factory = self.find_page(request)
+        if factory is None:
+            await _error(send, 404, "404 Not Found")
+            return
+
+        slots = self._get_slots()
+        if slots is not None:
+            try:
+                await asyncio.wait_for(slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                await _error(send, 503, "503 Service Unavailable")
+                return
+
+        try:
+            await self._respond(factory, request, send, start)
+        finally:
+            if slots is not None:
+                slots.release()
+
+    async def _respond(self, factory, request, send, start):
+        """Renders the page and sends it."""
+        document = self.make_document(factory(request))
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/html; charset=utf-8")],
+        })
+        await _send_chunk(send, self.converter.document_head(document))
+
+        body = document.get_body()
+        if isinstance(body, UI.Element):
+            if self.timeout is None:
+                body = await body.render_async()
+            else:
+                remaining = self.timeout - (time.monotonic() - start)
+                try:
+                    body = await asyncio.wait_for(body.render_async(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    body = None
+
+        if body is not None:
+            loop = asyncio.get_running_loop()
+            renderer = _AsyncRenderer(loop)
+            chunks = self.converter.iter_document_body(document, body, self.chunk_size,
+                                                       renderer)
+            try:
+                while True:
+                    step = loop.run_in_executor(None, next, chunks, None)
+                    if self.timeout is None:
+                        chunk = await step
+                    else:
+                        remaining = self.timeout - (time.monotonic() - start)
+                        try:
+                            chunk = await asyncio.wait_for(step, max(remaining, 0))
+                        except asyncio.TimeoutError:
+                            break
+                    if chunk is None:
+                        break
+                    await _send_chunk(send, chunk)
+            finally:
+                # The deferred elements not rendered in time are cancelled
+                renderer.cancel()
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+class _AsyncRenderer:
+    """Renders the deferred elements with render_async, in the event loop.
+
+    It's used as the executor of TreeToHTML.iter_document_body, which
+    runs in other thread: the returned futures are waited there.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._futures = []
+
+    def submit(self, function, element):
+        # function renders element synchronously (see TreeToHTML.iter_html),
+        # render_async is used instead
+        future = asyncio.run_coroutine_threadsafe(element.render_async(), self._loop)
+        self._futures.append(future)
+        return future
+
+    def cancel(self):
+        """Cancels the renders not done yet."""
+        for future in self._futures:
+            future.cancel()
+
+async def _send_chunk(send, chunk):
+    """Sends a chunk of the body."""
+    await send({
+        "type": "http.response.body",
+        "body": chunk.encode("utf-8"),
+        "more_body": True,
+    })
+
+async def _lifespan(receive, send):
+    """Handles the lifespan protocol (there is nothing to start or stop)."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def _error(send, status, text):
+    """Sends an error response."""
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+    })
+    await send({"type": "http.response.body", "body": text.encode("utf-8")})
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the Request class, the request passed to the page factories."""
+
+import urllib.parse
+
+__all__ = ["Request"]
+
+class Request:
+    """Represents an HTTP request.
+
+    The attributes are:
+
+    * method: The HTTP method, like "GET".
+    * path: The URL path, like "/users".
+    * query: A dictionary with the query string values (each value is a
+    list of strings).
+    * headers: A dictionary with the headers (the names are lowercase).
+    """
+
+    def __init__(self, method = "GET", path = "/", query_string = "", headers = None):
+        """Creates the new Request."""
+        self.method = method
+        self.path = path
+        self.query = urllib.parse.parse_qs(query_string)
+        self.headers = dict(headers or {})
+
+    @staticmethod
+    def from_wsgi(environ):
+        """Creates a Request from a WSGI environ dictionary."""
+        headers = {}
+        for key, value in environ.items():
+            if key.startswith("HTTP_"):
+                headers[key[5:].replace("_", "-").lower()] = value
+        if "CONTENT_TYPE" in environ:
+            headers["content-type"] = environ["CONTENT_TYPE"]
+        return Request(
+            environ.get("REQUEST_METHOD", "GET"),
+            environ.get("PATH_INFO", "/") or "/",
+            environ.get("QUERY_STRING", ""),
+            headers
+        )
+
+    @staticmethod
+    def from_asgi(scope):
+        """Creates a Request from an ASGI HTTP scope dictionary."""
+        headers = {}
+        for name, value in scope.get("headers", []):
+            headers[name.decode("latin-1").lower()] = value.decode("latin-1")
+        return Request(
+            scope.get("method", "GET"),
+            scope.get("path", "/") or "/",
+            scope.get("query_string", b"").decode("latin-1"),
+            headers
+        )
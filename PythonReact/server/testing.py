@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides test clients for the WSGI and ASGI applications.
+
+The clients call the applications directly, without network, and record
+each chunk of the response.
+"""
+
+import asyncio
+import urllib.parse
+
+__all__ = ["TestResponse", "WSGITestClient", "ASGITestClient"]
+
+class TestResponse:
+    """Represents a response received by a test client.
+
+    The attributes are the status code (an integer), the headers (a
+    dictionary with lowercase names) and the chunks of the body (a list
+    of bytes).
+    """
+
+    def __init__(self, status, headers, chunks):
+        self.status = status
+        self.headers = headers
+        self.chunks = chunks
+
+    def body(self):
+        """Returns the body (bytes)."""
+        return b"".join(self.chunks)
+
+    def text(self):
+        """Returns the body as a string."""
+        return self.body().decode("utf-8")
+
+class WSGITestClient:
+    """Represents a test client for a WSGI application."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, url, headers = None):
+        """Sends a GET request, returns a TestResponse."""
+        parsed = urllib.parse.urlsplit(url)
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": parsed.path or "/",
+            "QUERY_STRING": parsed.query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.url_scheme": "http",
+        }
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+        started = []
+
+        def start_response(status, response_headers, exc_info = None):
+            started.append((status, response_headers))
+
+        body = self.app(environ, start_response)
+        try:
+            chunks = [chunk for chunk in body]
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+
+        status, response_headers = started[0]
+        return TestResponse(
+            int(status.split(" ")[0]),
+            {name.lower(): value for name, value in response_headers},
+            chunks
+        )
+
+class ASGITestClient:
+    """Represents a test client for an ASGI application."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, url, headers = None):
+        """Sends a GET request, returns a TestResponse."""
+        return asyncio.run(self.get_async(url, headers))
+
+    async def get_async(self, url, headers = None):
+        """Like get, but must be awaited (for concurrent requests)."""
+        parsed = urllib.parse.urlsplit(url)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parsed.path or "/",
+            "query_string": parsed.query.encode("latin-1"),
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in (headers or {}).items()
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+
+        start = messages[0]
+        return TestResponse(
+            start["status"],
+            {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in start.get("headers", [])
+            },
+            [m["body"] for m in messages[1:] if m.get("body")]
+        )
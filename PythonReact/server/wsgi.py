@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the WSGIApp class, a WSGI application (PEP 3333)."""
+
+import threading
+import time
+
+from PythonReact.server import Application, Request
+
+__all__ = ["WSGIApp"]
+
+class WSGIApp(Application):
+    """Represents a WSGI application.
+
+    The page is rendered in the server's thread, and the HTML document is
+    returned as an iterable of chunks, generated when the server asks for
+    them (so a slow client slows down the generation, instead of filling
+    the memory). The first chunk is the head of the document, sent before
+    rendering the body.
+
+    See Application for the arguments.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if self.max_concurrency is None:
+            self._slots = None
+        else:
+            self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def __call__(self, environ, start_response):
+        start = time.monotonic()
+        request = Request.from_wsgi(environ)
+
+        factory = self.find_page(request)
+        if factory is None:
+            return _error(start_response, "404 Not Found")
+
+        if self._slots is not None:
+            if self.timeout is None:
+                acquired = self._slots.acquire()
+            else:
+                acquired = self._slots.acquire(timeout = self.timeout)
+            if not acquired:
+                return _error(start_response, "503 Service Unavailable")
+            release = self._slots.release
+        else:
+            release = None
+
+        try:
+            document = self.make_document(factory(request))
+        except BaseException:
+            if release is not None:
+                release()
+            raise
+
+        start_response("200 OK", [("Content-Type", "text/html; charset=utf-8")])
+        deadline = None if self.timeout is None else start + self.timeout
+        chunks = self.converter.iter_document(document, self.chunk_size)
+        return _Body(chunks, deadline, release)
+
+class _Body:
+    """The iterable returned by WSGIApp (the response body).
+
+    Encodes the chunks, stops when the deadline is reached and releases
+    the concurrency slot when closed.
+    """
+
+    def __init__(self, chunks, deadline, release):
+        self._chunks = chunks
+        self._deadline = deadline
+        self._release = release
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if (self._deadline is not None) and (time.monotonic() > self._deadline):
+                break
+            yield chunk.encode("utf-8")
+
+    def close(self):
+        """Called by the server when the response is done."""
+        self._chunks.close()
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+def _error(start_response, status):
+    """Sends an error response."""
+    start_response(status, [("Content-Type", "text/plain; charset=utf-8")])
+    return [status.encode("utf-8")]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares the binary format (engines.binary) with pickle and JSON.
+
+For each format, measures the size of the serialized tree and the time
+to save and load it. The JSON format is the one of engines.json.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-binary.py
+"""
+
+import pickle
+import time
+
+from PythonReact import UI, engines
+
+def make_tree(rows, columns):
+    """Creates a rendered tree with rows * columns widgets."""
+    root = UI.Container(style = ["root"])
+    for i in range(rows):
+        row = UI.Container(style = ["row"])
+        for j in range(columns):
+            row.add(UI.Label(label = "Cell " + str(i) + "x" + str(j), style = ["cell"]))
+            row.add(UI.Button(label = "Edit", type = "link", href = "#" + str(j)))
+        root.add(row)
+    return root.render()
+
+def best_time(function, repeat = 5):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return (best, result)
+
+def main():
+    tree = make_tree(200, 10)
+    binary = engines.binary.TreeToBinary()
+    to_json = engines.json.TreeToJSON()
+
+    formats = [
+        ("binary", lambda: binary.to_bytes(tree),
+         lambda data: engines.binary.BinaryTree(data).load()),
+        ("pickle", lambda: pickle.dumps(tree, pickle.HIGHEST_PROTOCOL),
+         pickle.loads),
+        ("json", lambda: to_json.to_json(tree).encode("utf-8"),
+         lambda data: to_json.from_json(data.decode("utf-8"))),
+    ]
+
+    print("{0:>8} {1:>12} {2:>12} {3:>12}".format("format", "size (KiB)", "save (ms)", "load (ms)"))
+    for name, save, load in formats:
+        save_time, data = best_time(save)
+        load_time, loaded = best_time(lambda: load(data))
+        assert loaded == tree
+        print("{0:>8} {1:12.1f} {2:12.2f} {3:12.2f}".format(
+            name, len(data) / 1024, save_time * 1000, load_time * 1000
+        ))
+
+    # The lazy loader only decodes the requested nodes
+    data = binary.to_bytes(tree)
+
+    def load_row():
+        loaded = engines.binary.BinaryTree(data)
+        return loaded.load(loaded.child_nodes()[100])
+
+    lazy_time, row = best_time(load_row)
+    assert row == tree.inner_content()[100]
+    print("")
+    print("Loading a single row lazily: {0:.2f} ms".format(lazy_time * 1000))
+
+if __name__ == "__main__":
+    main()
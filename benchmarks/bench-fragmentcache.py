@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares the HTML conversion with and without a FragmentCache.
+
+The page is a list of product cards (only 20 different cards) and menu
+items, converted many times, like the same page served to many requests.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-fragmentcache.py
+"""
+
+import benchutils
+from PythonReact import UI, engines
+
+def make_tree(cards):
+    """Creates a page with a menu and cards product cards."""
+    menu = UI.Container(style = ["menu"], items = [
+        UI.Link(label = "Section " + str(i), href = "/s/" + str(i), style = ["link"])
+        for i in range(20)
+    ])
+    products = UI.Container(style = ["products"])
+    for i in range(cards):
+        products.add(UI.Container(style = ["card"], items = [
+            UI.Image(data = "p" + str(i % 20) + ".png", alt = "Product", width = 64, height = 64),
+            UI.Label(label = "Product " + str(i % 20), style = ["title"]),
+            UI.Label(label = "Price: " + str(i % 20) + ".99", style = ["price"]),
+            UI.Button(label = "Buy", type = "link", href = "/buy/" + str(i % 20), style = ["button"])
+        ]))
+    return UI.Container(items = [menu, products]).render()
+
+def measure(converter, tree, repeat):
+    """Returns the best time of converting tree, in seconds."""
+    times, peak = benchutils.measure(lambda: converter.toHTML(tree), repeat)
+    return times[0]
+
+def main():
+    tree = make_tree(2000)
+    plain = engines.html.TreeToHTML()
+    cache = engines.html.FragmentCache()
+    cached = engines.html.TreeToHTML(fragment_cache = cache)
+
+    assert plain.toHTML(tree) == cached.toHTML(tree)
+
+    slow = measure(plain, tree, 5)
+    fast = measure(cached, tree, 5)
+    info = cache.cache_info()
+    print("Without cache: {0:8.2f} ms".format(slow * 1000))
+    print("   With cache: {0:8.2f} ms".format(fast * 1000))
+    print("")
+    print("Speedup: {0:.2f}x".format(slow / fast))
+    print("Hit rate: {0:.1%}   Entries: {1}   Memory: {2:.1f} KiB".format(
+        info["hit_rate"], info["entries"], info["bytes"] / 1024
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares the two-pass and the single-pass HTML conversion.
+
+The two-pass conversion builds a HTML RenderedObject tree with
+TreeToHTML.convert_node and then serializes it with to_xml_string, the
+single-pass conversion (TreeToHTML.toHTML) generates the HTML directly
+from the abstract tree.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-html.py
+"""
+
+import benchutils
+from PythonReact import UI, engines
+
+def make_tree(rows, columns):
+    """Creates an abstract tree with rows * columns widgets."""
+    root = UI.Container(style = ["root"])
+    for i in range(rows):
+        row = UI.Container(style = ["row"])
+        for j in range(columns):
+            row.add(UI.Label(label = "Cell " + str(i) + "x" + str(j)))
+            row.add(UI.Button(label = "Edit", type = "link", href = "#" + str(j)))
+        form = UI.Form(items = [
+            UI.Frame(title = "Row " + str(i), items = [
+                UI.Image(data = "row" + str(i) + ".png", alt = "Row")
+            ])
+        ])
+        row.add(form)
+        root.add(row)
+    return root.render()
+
+def two_pass(converter, tree):
+    return converter.convert_node(tree, {"iform": False}).to_xml_string()
+
+def single_pass(converter, tree):
+    return converter.toHTML(tree)
+
+def main():
+    converter = engines.html.TreeToHTML()
+    tree = make_tree(200, 10)
+    nodes = benchutils.count_nodes(tree)
+
+    assert two_pass(converter, tree) == single_pass(converter, tree)
+
+    print("Abstract tree with " + str(nodes) + " nodes")
+    print("The two-pass conversion allocates " + str(nodes) +
+          " intermediate HTML nodes, the single-pass conversion none")
+    print("(except the frame titles)")
+    print("")
+
+    results = {}
+    for name, function in (("two-pass", two_pass), ("single-pass", single_pass)):
+        times, peak = benchutils.measure(lambda: function(converter, tree), 5)
+        best = times[0]
+        results[name] = (best, peak)
+        print("{0:>12}: {1:8.2f} ms   peak memory {2:8.1f} KiB".format(
+            name, best * 1000, peak / 1024
+        ))
+
+    print("")
+    print("Speedup: {0:.2f}x   Peak memory: {1:.2f}x smaller".format(
+        results["two-pass"][0] / results["single-pass"][0],
+        results["two-pass"][1] / results["single-pass"][1]
+    ))
+
+if __name__ == "__main__":
+    main()
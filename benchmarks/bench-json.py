@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares the JSON export (engines.json) with to_xml_string.
+
+Measures the size of the output and the time of the export (and of the
+import, for JSON: the XML export can not be loaded back).
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-json.py
+"""
+
+import time
+
+from PythonReact import UI, engines
+
+def make_tree(rows, columns):
+    """Creates a rendered tree with rows * columns widgets."""
+    root = UI.Container(style = ["root"])
+    for i in range(rows):
+        row = UI.Container(style = ["row"])
+        for j in range(columns):
+            row.add(UI.Label(label = "Cell " + str(i) + "x" + str(j), style = ["cell"]))
+            row.add(UI.Button(label = "Edit", type = "link", href = "#" + str(j)))
+        root.add(row)
+    return root.render()
+
+def best_time(function, repeat = 5):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return (best, result)
+
+def main():
+    tree = make_tree(200, 10)
+    converter = engines.json.TreeToJSON()
+
+    xml_time, xml = best_time(tree.to_xml_string)
+    json_time, text = best_time(lambda: converter.to_json(tree))
+    load_time, loaded = best_time(lambda: converter.from_json(text))
+    assert loaded == tree
+
+    print("{0:>14} {1:>12} {2:>12}".format("format", "size (KiB)", "time (ms)"))
+    print("{0:>14} {1:12.1f} {2:12.2f}".format("to_xml_string", len(xml) / 1024, xml_time * 1000))
+    print("{0:>14} {1:12.1f} {2:12.2f}".format("to_json", len(text) / 1024, json_time * 1000))
+    print("{0:>14} {1:>12} {2:12.2f}".format("from_json", "", load_time * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Measures the construction time and the memory of RenderedObjects.
+
+The current RenderedObject is compared with a copy of the previous
+implementation (which kept all the keyword arguments in a dictionary and
+checked the types of it's attributes on every construction).
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-renderedobject.py
+"""
+
+import timeit
+import tracemalloc
+
+from PythonReact import UI
+
+class LegacyRenderedObject:
+    """The RenderedObject constructor before __slots__."""
+
+    def __init__(self, *args, **kwargs):
+        self._props = kwargs
+        self._tag_name = self._try_to_access("tag_name")
+        self._properties = self._try_to_access("properties")
+        self._inner_content = self._try_to_access("inner_content")
+
+        if type(self._tag_name) != str:
+            raise ValueError("The tag_name attribute should be a string")
+        if type(self._properties) != dict:
+            raise ValueError("The properties attribute should be a dictionary")
+        if type(self._inner_content) != list:
+            raise ValueError("the inner_content attribute should be a list")
+
+    def _try_to_access(self, key):
+        result = self._props.get(key)
+        if result is None:
+            raise KeyError("The key " + key + " is required")
+        return result
+
+NODES = 100000
+
+def memory_per_node(factory):
+    """Returns the memory (in bytes) used by each node created by factory.
+
+    The properties and inner content are shared by all the nodes, so only
+    the memory of the node itself is measured.
+    """
+    properties = {"style": "button"}
+    inner_content = ["Text"]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory(properties, inner_content) for i in range(NODES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Do not count the list that holds the nodes
+    return (after - before - nodes.__sizeof__()) / NODES
+
+def construction_time(statement):
+    """Returns the best time (in nanoseconds) for one construction."""
+    timer = timeit.Timer(
+        statement,
+        setup = "p = {'style': 'button'}; c = ['Text']",
+        globals = {"UI": UI, "LegacyRenderedObject": LegacyRenderedObject}
+    )
+    best = min(timer.repeat(repeat = 5, number = NODES))
+    return best / NODES * 1e9
+
+def main():
+    cases = (
+        ("legacy (keywords)",
+         "LegacyRenderedObject(tag_name = 'button', properties = p, inner_content = c)",
+         lambda p, c: LegacyRenderedObject(tag_name = "button", properties = p, inner_content = c)),
+        ("slots (keywords)",
+         "UI.RenderedObject(tag_name = 'button', properties = p, inner_content = c)",
+         lambda p, c: UI.RenderedObject(tag_name = "button", properties = p, inner_content = c)),
+        ("slots (positional)",
+         "UI.RenderedObject('button', p, c)",
+         lambda p, c: UI.RenderedObject("button", p, c)),
+    )
+
+    for name, statement, factory in cases:
+        print("{0:>20}: {1:8.1f} ns per node   {2:8.1f} bytes per node".format(
+            name, construction_time(statement), memory_per_node(factory)
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Measures the render and the conversion of synthetic element trees.
+
+The suite creates trees of different shapes (see SHAPES) and measures,
+for each one:
+
+* `render`: Element.render of the root (rendering all the tree).
+* `convert_node`: TreeToHTML.convert_node of the rendered tree.
+* `to_xml_string`: RenderedObject.to_xml_string of the rendered tree.
+* `toHTML`: TreeToHTML.toHTML of the rendered tree.
+
+For each measure it reports the throughput (rendered nodes per second, at
+the median time), the latency percentiles (p50, p95 and p99 of the
+samples) and the peak of memory allocated while running it once (with
+tracemalloc, in a separate run because tracemalloc slows the code).
+
+The results can be saved as a baseline (a JSON file), and the next runs
+are compared with it: the measures whose throughput drops or whose memory
+grows more than the threshold are reported as regressions, and then the
+exit status is 1.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-suite.py           # Compare
+    PYTHONPATH=. python3 benchmarks/bench-suite.py --save    # New baseline
+
+The baseline depends on the machine, save a new one before comparing the
+changes on other machine. The times of a busy (or virtual) machine can
+change a lot between runs, use more samples or a bigger threshold there;
+the memory peaks are stable.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import benchutils
+from PythonReact import UI, engines
+
+# The default baseline file, next to this script
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench-suite-baseline.json")
+
+def make_wide(scale):
+    """A single container with many labels and buttons."""
+    root = UI.Container(style = ["wide"])
+    for i in range(int(2000 * scale)):
+        root.add(UI.Label(label = "Item " + str(i), style = ["item"]))
+        root.add(UI.Button(label = "Open", type = "link", href = "#" + str(i)))
+    return root
+
+def make_deep(scale):
+    """A chain of nested containers, with a label at each level."""
+    root = UI.Container(style = ["level"])
+    current = root
+    for i in range(int(2000 * scale)):
+        child = UI.Container(style = ["level"])
+        current.add(UI.Label(label = "Level " + str(i)), child)
+        current = child
+    return root
+
+def make_text(scale):
+    """Text views with long, formatted texts."""
+    words = " ".join("word" + str(i) for i in range(60))
+    root = UI.Container(style = ["article"])
+    for i in range(int(200 * scale)):
+        view = UI.TextView()
+        view.add_text("Section " + str(i), UI.TextView.TEXT_VIEW_HEADING_TITLE)
+        view.add_text(words, UI.TextView.TEXT_VIEW_NORMAL)
+        view.add_text(words, UI.TextView.TEXT_VIEW_RAW)
+        view.add_text("print(" + str(i) + ")", UI.TextView.TEXT_VIEW_CODE)
+        label = UI.Label()
+        label.add(UI.TextTag(text = words, type = UI.TextTag.TEXT_TAG_BOLD))
+        label.add(UI.TextTag(text = "link", type = UI.TextTag.TEXT_TAG_LINK,
+                             href = "#" + str(i)))
+        root.add(view, label)
+    return root
+
+def make_form(scale):
+    """Forms with frames, labels and buttons (converted in the form context)."""
+    root = UI.Container(style = ["forms"])
+    for i in range(int(200 * scale)):
+        frame = UI.Frame(title = "Record " + str(i), items = [
+            UI.Label(label = "Name"),
+            UI.Label(label = "Password"),
+            UI.Frame(title = "Options", items = [
+                UI.Label(label = "Option " + str(j)) for j in range(4)
+            ]),
+            UI.Button(label = "Save", type = "submit"),
+            UI.Button(label = "Cancel")
+        ])
+        root.add(UI.Form(act = "/save/" + str(i), method = "POST", items = [frame]))
+    return root
+
+def make_image(scale):
+    """A gallery of images with links."""
+    root = UI.Container(style = ["gallery"])
+    for i in range(int(1000 * scale)):
+        image = UI.Image(data = "/images/" + str(i) + ".png", alt = "Image " + str(i),
+                         title = "Image " + str(i), width = "128", height = "128")
+        root.add(UI.Link(label = "Image " + str(i), href = "/view/" + str(i),
+                         items = [image]))
+    return root
+
+# The shapes of the trees, and their functions
+SHAPES = [
+    ("wide", make_wide),
+    ("deep", make_deep),
+    ("text-heavy", make_text),
+    ("form-heavy", make_form),
+    ("image-heavy", make_image)
+]
+
+def operations(converter, element, tree):
+    """Returns the measured operations, as (name, function) pairs."""
+    return [
+        ("render", element.render),
+        ("convert_node", lambda: converter.convert_node(tree)),
+        ("to_xml_string", tree.to_xml_string),
+        ("toHTML", lambda: converter.toHTML(tree))
+    ]
+
+def percentile(samples, percent):
+    """Returns the percentile of the sorted samples (nearest rank)."""
+    index = max(0, -(-len(samples) * percent // 100) - 1)
+    return samples[int(index)]
+
+def measure(function, nodes, samples, warmup):
+    """Runs function and returns the dictionary with it's results."""
+    times, peak = benchutils.measure(function, samples, warmup)
+    return {
+        "nodes": nodes,
+        "throughput": nodes / percentile(times, 50),
+        "p50": percentile(times, 50) * 1000,
+        "p95": percentile(times, 95) * 1000,
+        "p99": percentile(times, 99) * 1000,
+        "peak": peak
+    }
+
+def run(scale, samples, warmup, shapes):
+    """Runs the suite, returns a dictionary from "shape/operation" to the results."""
+    converter = engines.html.TreeToHTML()
+    results = {}
+    for shape, make in SHAPES:
+        if shapes and (shape not in shapes):
+            continue
+        element = make(scale)
+        tree = element.render()
+        nodes = benchutils.count_nodes(tree)
+        for name, function in operations(converter, element, tree):
+            results[shape + "/" + name] = measure(function, nodes, samples, warmup)
+    return results
+
+def compare(result, baseline, threshold):
+    """Compares a result with it's baseline.
+
+    Returns a pair (text, regression), where text describes the changes
+    and regression is True if the throughput or the memory are worse than
+    the threshold (a fraction).
+    """
+    if baseline is None:
+        return ("(new)", False)
+    speed = result["throughput"] / baseline["throughput"] - 1
+    memory = result["peak"] / max(baseline["peak"], 1) - 1
+    regression = (speed < -threshold) or (memory > threshold)
+    text = "{0:+6.1f}% speed {1:+6.1f}% mem".format(speed * 100, memory * 100)
+    if regression:
+        text += "  REGRESSION"
+    return (text, regression)
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[0])
+    parser.add_argument("--baseline", default = BASELINE,
+                        help = "the baseline file (default: %(default)s)")
+    parser.add_argument("--save", action = "store_true",
+                        help = "save the results as the new baseline")
+    parser.add_argument("--samples", type = int, default = 20,
+                        help = "number of timed runs of each measure")
+    parser.add_argument("--warmup", type = int, default = 2,
+                        help = "number of untimed runs before the samples")
+    parser.add_argument("--scale", type = float, default = 1.0,
+                        help = "size of the trees (1.0 is the default size)")
+    parser.add_argument("--threshold", type = float, default = 0.25,
+                        help = "allowed slowdown or memory growth (a fraction)")
+    parser.add_argument("--shape", action = "append", default = [],
+                        choices = [shape for shape, make in SHAPES],
+                        help = "only run this shape (can be repeated)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if (not args.save) and os.path.exists(args.baseline):
+        with open(args.baseline) as fp:
+            saved = json.load(fp)
+        if saved.get("scale") == args.scale:
+            baseline = saved["results"]
+        else:
+            print("The baseline was saved with other scale, it's ignored")
+
+    results = run(args.scale, args.samples, args.warmup, args.shape)
+
+    print("{0:<26} {1:>7} {2:>11} {3:>9} {4:>9} {5:>9} {6:>10}".format(
+        "measure", "nodes", "nodes/s", "p50 ms", "p95 ms", "p99 ms", "peak KiB"))
+    regressions = 0
+    for key, result in results.items():
+        text, regression = compare(result, baseline.get(key), args.threshold)
+        regressions += regression
+        print("{0:<26} {1:>7} {2:>11.0f} {3:>9.2f} {4:>9.2f} {5:>9.2f} {6:>10.1f}  {7}".format(
+            key, result["nodes"], result["throughput"], result["p50"], result["p95"],
+            result["p99"], result["peak"] / 1024, text if baseline else ""))
+
+    if args.save:
+        with open(args.baseline, "w") as fp:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "scale": args.scale,
+                "results": results
+            }, fp, indent = 2, sort_keys = True)
+            fp.write("\n")
+        print("")
+        print("Baseline saved to " + args.baseline)
+    elif baseline:
+        print("")
+        print(str(regressions) + " regressions (threshold " +
+              str(args.threshold * 100) + "%)")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
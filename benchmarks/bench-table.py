@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares rendering a big report with containers and with UI.Table.
+
+The report has ROWS rows and COLUMNS columns. Without UI.Table, each row
+is a UI.Container with a UI.Label for each cell. With UI.Table, the data
+is passed by columns and the rows are converted with a row template.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-table.py
+"""
+
+import array
+
+import benchutils
+from PythonReact import UI, engines
+
+ROWS = 20000
+COLUMNS = 10
+
+def make_columns():
+    """Creates the data of the report, by columns."""
+    return [array.array("l", range(column, column + ROWS)) for column in range(COLUMNS)]
+
+def with_containers(converter, columns):
+    rows = UI.Container(style = ["report"])
+    for values in zip(*columns):
+        rows.add(UI.Container(items = [UI.Label(label = str(value)) for value in values]))
+    return converter.toHTML(rows.render())
+
+def with_table(converter, columns):
+    table = UI.Table(columns = [("C" + str(index), column)
+                                for index, column in enumerate(columns)])
+    return converter.toHTML(table.render())
+
+def measure(function, converter, columns):
+    """Returns the time (best of 3, in seconds) and the memory peak."""
+    times, peak = benchutils.measure(lambda: function(converter, columns), 3)
+    return (times[0], peak)
+
+def main():
+    converter = engines.html.TreeToHTML()
+    columns = make_columns()
+
+    slow, slow_peak = measure(with_containers, converter, columns)
+    fast, fast_peak = measure(with_table, converter, columns)
+    print("{0} cells".format(ROWS * COLUMNS))
+    print("Containers: {0:8.1f} ms {1:8.1f} MiB".format(slow * 1000, slow_peak / 2 ** 20))
+    print("     Table: {0:8.1f} ms {1:8.1f} MiB".format(fast * 1000, fast_peak / 2 ** 20))
+    print("")
+    print("Speedup: {0:.1f}x, memory: {1:.1f}x less".format(
+        slow / fast, slow_peak / fast_peak))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Compares rendering a mostly-static page with and without a template.
+
+Without a template, each request creates the element tree, renders it and
+converts it (TreeToHTML.toHTML). With a template (TreeToHTML.compile),
+only the content of the slots is rendered and converted.
+
+Run it from the repository root:
+
+    PYTHONPATH=. python3 benchmarks/bench-template.py
+"""
+
+import time
+
+from PythonReact import UI, engines
+
+def make_page(greeting, items):
+    """Creates a page with a big static menu and footer."""
+    menu = UI.Container(style = ["menu"])
+    for i in range(100):
+        menu.add(UI.Link(label = "Section " + str(i), href = "/s/" + str(i)))
+    footer = UI.Container(style = ["footer"])
+    for i in range(100):
+        footer.add(UI.Label(label = "Footer line " + str(i)))
+    return UI.Container(items = [menu, greeting, UI.Separator(), items, footer])
+
+def dynamic_parts(request):
+    """Returns the greeting and the items for the request number."""
+    greeting = UI.Label(label = "Hello user " + str(request))
+    items = UI.Container(items = [
+        UI.Label(label = "Item " + str(request) + "." + str(i)) for i in range(5)
+    ])
+    return (greeting, items)
+
+def measure(function, requests):
+    """Returns the time per request in seconds (best of 3)."""
+    best = None
+    for i in range(3):
+        start = time.perf_counter()
+        for request in range(requests):
+            function(request)
+        elapsed = (time.perf_counter() - start) / requests
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+def main():
+    converter = engines.html.TreeToHTML()
+    template = converter.compile(
+        make_page(UI.Slot(slot = "greeting"), UI.Slot(slot = "items"))
+    )
+
+    def without_template(request):
+        greeting, items = dynamic_parts(request)
+        return converter.toHTML(make_page(greeting, items).render())
+
+    def with_template(request):
+        greeting, items = dynamic_parts(request)
+        return template.render(greeting = greeting, items = items)
+
+    assert without_template(7) == with_template(7)
+
+    slow = measure(without_template, 200)
+    fast = measure(with_template, 200)
+    print("Without template: {0:8.3f} ms per request".format(slow * 1000))
+    print("   With template: {0:8.3f} ms per request".format(fast * 1000))
+    print("")
+    print("Speedup: {0:.1f}x".format(slow / fast))
+
+if __name__ == "__main__":
+    main()
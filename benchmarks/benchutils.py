@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Provides the helpers shared by the benchmarks.
+
+The benchmarks are run as scripts (see their docstrings), so this module
+is imported from the directory of the script:
+
+    import benchutils
+"""
+
+import time
+import tracemalloc
+
+from PythonReact import UI
+
+def count_nodes(tree):
+    """Counts the RenderedObjects in tree."""
+    count = 0
+    work = [tree]
+    while work:
+        node = work.pop()
+        if isinstance(node, UI.RenderedObject):
+            count += 1
+            work.extend(node.inner_content())
+    return count
+
+def measure(function, samples, warmup = 0):
+    """Runs function (without arguments) and measures it.
+
+    function is run warmup times, then samples times measuring each run,
+    and then once more with tracemalloc (in a separate run, because
+    tracemalloc slows the code).
+
+    Returns a pair (times, peak): the sorted times of the samples in
+    seconds (so times[0] is the best one) and the peak of memory
+    allocated in bytes.
+    """
+    for i in range(warmup):
+        function()
+    times = []
+    for i in range(samples):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    times.sort()
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (times, peak)
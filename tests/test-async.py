@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the asynchronous render (Element.render_async).
+
+The components load their data from a fake data source that answers only
+when all the requests are waiting, so the components must be rendered at
+the same time (a sequential render would time out).
+"""
+
+import asyncio
+
+from PythonReact import UI, engines
+
+COMPONENTS = 10
+# Only to avoid waiting forever if the render is sequential
+TIMEOUT = 10
+
+class FakeDataSource:
+    """A data source that answers when expected requests are waiting."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.requests = 0
+        self.running = 0
+        self.max_running = 0
+        self._ready = None
+
+    async def fetch(self, key):
+        # The event is created in the event loop of the render
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        self.requests += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        if self.running == self.expected:
+            self._ready.set()
+        await asyncio.wait_for(self._ready.wait(), TIMEOUT)
+        self.running -= 1
+        return "Data of " + key
+
+class DataLabel(UI.Label):
+    """A label that loads it's text from a data source."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._source = super().register_argument("source", None)
+        self._data_key = super().register_argument("data_key", "")
+
+    async def render_async(self):
+        self.set_label(await self._source.fetch(self._data_key))
+        return await super().render_async()
+
+source = FakeDataSource(COMPONENTS)
+widgets = [DataLabel(source = source, data_key = str(i)) for i in range(COMPONENTS)]
+# Some of the components are nested
+root = UI.Container(items = [
+    UI.Container(items = widgets[:COMPONENTS // 2]),
+    UI.Frame(title = "Frame", items = [
+        UI.Container(items = widgets[COMPONENTS // 2:])
+    ]),
+])
+
+tree = asyncio.run(root.render_async())
+
+assert source.requests == COMPONENTS
+assert source.max_running == COMPONENTS
+
+expected = root.render()
+assert tree.to_xml_string() == expected.to_xml_string()
+html = engines.html.TreeToHTML().toHTML(tree)
+for i in range(COMPONENTS):
+    assert "<span >Data of " + str(i) + "</span>" in html
+
+print("Async render OK")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the binary format (engines.binary)."""
+
+import mmap
+import os
+import tempfile
+
+from PythonReact import UI, engines
+
+converter = engines.binary.TreeToBinary()
+
+def node(tag, properties, *childs):
+    return UI.RenderedObject(tag, properties, list(childs))
+
+# Round trip, with all the value types
+tree = node("container", {"style": "box", "name": "", "width": 640, "offset": -3,
+                          "ratio": 0.5, "visible": True, "hidden": False, "key": None},
+    node("label", {}, "Hello ", node("text-tag", {"type": "bold"}, "World")),
+    42,
+    "text with ñ and 日本",
+    node("separator", {})
+)
+data = converter.to_bytes(tree)
+assert data.startswith(engines.binary.MAGIC)
+loaded = engines.binary.BinaryTree(data).load()
+assert loaded == tree
+assert loaded.properties()["width"] == 640 and type(loaded.properties()["width"]) is int
+assert loaded.properties()["offset"] == -3
+assert loaded.properties()["visible"] is True
+assert loaded.properties()["key"] is None
+assert loaded.inner_content()[1] == 42
+
+# The nodes are only supported as childs, not as property values
+for value in (node("label", {}, "In a property"), [1, 2], object()):
+    try:
+        converter.to_bytes(node("container", {"value": value}))
+        assert False
+    except ValueError:
+        pass
+try:
+    converter.to_bytes(node("container", {}, {"a": 1}))
+    assert False
+except ValueError:
+    pass
+
+# A rendered page
+page = UI.Container(items = [
+    UI.Container(items = [UI.Button(label = "Edit", style = ["button"]), UI.Separator(),
+                          UI.Label(label = "Row " + str(i % 10))])
+    for i in range(100)
+]).render()
+html = engines.html.TreeToHTML().toHTML(page)
+loaded = engines.binary.BinaryTree(converter.to_bytes(page)).load()
+assert loaded == page
+assert engines.html.TreeToHTML().toHTML(loaded) == html
+
+# The shared nodes are saved and loaded only once
+interned = UI.Interner().intern(page)
+data = converter.to_bytes(interned)
+assert len(data) < len(converter.to_bytes(page)) / 5
+binary = engines.binary.BinaryTree(data)
+assert len(binary) == 23, len(binary)
+loaded = binary.load()
+assert loaded == page
+assert loaded.inner_content()[0].inner_content()[0] is loaded.inner_content()[1].inner_content()[0]
+
+# Lazy reads
+binary = engines.binary.BinaryTree(converter.to_bytes(page))
+assert binary.tag_name() == "container"
+rows = binary.child_nodes()
+assert len(rows) == 100
+row = binary.load(rows[5])
+assert row == page.inner_content()[5]
+assert binary.tag_name(binary.child_nodes(rows[5])[2]) == "label"
+
+# From a mmap
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "tree.bin")
+    with open(path, "wb") as fp:
+        converter.write(page, fp)
+    with open(path, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ) as mapped:
+            binary = engines.binary.BinaryTree(mapped)
+            assert binary.load(rows[99]) == page.inner_content()[99]
+            del binary
+
+# Deep trees
+deep = node("container", {}, "end")
+for i in range(20000):
+    deep = node("container", {}, deep)
+assert engines.binary.BinaryTree(converter.to_bytes(deep)).load() == deep
+
+# Errors
+try:
+    converter.to_bytes(node("container", {}, UI.Label(label = "Pending")))
+    assert False
+except ValueError:
+    pass
+try:
+    engines.binary.BinaryTree(b"not a tree")
+    assert False
+except ValueError:
+    pass
+
+print("Binary OK")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Renders, converts and serializes very deep trees.
+
+All tree walkers use explicit stacks, so trees deeper than the Python
+recursion limit should work.
+"""
+
+import io
+import sys
+
+from PythonReact import UI, engines
+
+DEPTH = 20000
+
+assert DEPTH > sys.getrecursionlimit()
+
+# Nested containers:
+# <container><container>...<label>Leaf</label>...</container></container>
+leaf = UI.Label(label = "Leaf")
+node = leaf
+for i in range(DEPTH):
+    node = UI.Container(items = [node], style = ["level"])
+root = node
+
+tree = root.render()
+
+xml = tree.to_xml_string()
+expected_xml = (
+    "<container style=\"level\" name=\"\" >" * DEPTH +
+    "<label style=\"\" name=\"\" >Leaf</label>" +
+    "</container>" * DEPTH
+)
+assert xml == expected_xml
+
+fp = io.StringIO()
+tree.write_xml(fp)
+assert fp.getvalue() == expected_xml
+
+converter = engines.html.TreeToHTML()
+expected_html = (
+    "<div class=\"level\" >" * DEPTH +
+    "<span >Leaf</span>" +
+    "</div>" * DEPTH
+)
+assert converter.toHTML(tree) == expected_html
+assert converter.convert_node(tree, {"iform": False}).to_xml_string() == expected_html
+
+fp = io.StringIO()
+converter.write_html(tree, fp, chunk_size = 1024)
+assert fp.getvalue() == expected_html
+
+# Chained text tags (TextTag.mix)
+tag = UI.TextTag(text = "Text")
+for i in range(DEPTH):
+    outer = UI.TextTag(type = UI.TextTag.TEXT_TAG_BOLD)
+    outer.mix(tag)
+    tag = outer
+
+html = converter.toHTML(tag.render())
+assert html == "<b >" * DEPTH + "<span >Text</span>" + "</b>" * DEPTH
+
+# The tree string is indented by depth, so it grows quadratically:
+# test it with a smaller tree.
+node = UI.Separator()
+for i in range(3000):
+    node = UI.Container(items = [node])
+lines = node.render().to_tree_string(" ").split("\n")
+assert len(lines) == 3001
+for depth, line in enumerate(lines[:-1]):
+    assert line == " " * depth + "container (style=\"\" name=\"\" ):"
+assert lines[-1] == " " * 3000 + "separator (style=\"\" name=\"\" mode=\"1\" )"
+
+print("Deep trees OK")
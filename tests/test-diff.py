@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the diff engine (UI.diff and UI.apply_patches)."""
+
+import time
+
+from PythonReact import UI
+
+def check(old_element, change):
+    """Renders old_element, applies change and renders it again.
+
+    Checks that the patches transform the old tree into the new one and
+    returns the patches.
+    """
+    old = old_element.render()
+    change(old_element)
+    new = old_element.render()
+    patches = UI.diff(old, new)
+    assert UI.apply_patches(old, patches).to_xml_string() == new.to_xml_string()
+    return patches
+
+# Same tree: no patches
+label = UI.Label(label = "Hello")
+assert UI.diff(label.render(), label.render()) == []
+
+# Text change
+patches = check(UI.Container(items = [UI.Label(label = "Hello")]),
+                lambda c: c.get_items()[0].set_label("World"))
+assert patches == [UI.Patch(UI.PATCH_SET_TEXT, (0, 0), value = "World")]
+
+# Attribute changes
+patches = check(UI.Label(label = "Hello", style = ["a"]),
+                lambda l: l.add_class("b"))
+assert patches == [UI.Patch(UI.PATCH_SET_ATTRIBUTE, (), "style", "a b")]
+
+old = UI.RenderedObject("a", {"href": "#", "title": "Link"}, [])
+new = UI.RenderedObject("a", {"href": "#top"}, [])
+assert UI.diff(old, new) == [
+    UI.Patch(UI.PATCH_SET_ATTRIBUTE, (), "href", "#top"),
+    UI.Patch(UI.PATCH_REMOVE_ATTRIBUTE, (), "title"),
+]
+
+# Insertions and removals
+patches = check(UI.Container(items = [UI.Label(label = "1")]),
+                lambda c: c.add(UI.Label(label = "2"), UI.Separator()))
+assert [(p.op, p.path) for p in patches] == [
+    (UI.PATCH_INSERT, (1,)),
+    (UI.PATCH_INSERT, (2,)),
+]
+
+patches = check(UI.Container(items = [UI.Label(label = str(i)) for i in range(4)]),
+                lambda c: c.get_items().__delitem__(slice(1, 4)))
+assert [(p.op, p.path) for p in patches] == [
+    (UI.PATCH_REMOVE, (3,)),
+    (UI.PATCH_REMOVE, (2,)),
+    (UI.PATCH_REMOVE, (1,)),
+]
+
+# Replacement (different tag names)
+patches = check(UI.Container(items = [UI.Label(label = "1")]),
+                lambda c: c.get_items().__setitem__(0, UI.Separator()))
+assert [(p.op, p.path) for p in patches] == [(UI.PATCH_REPLACE, (0,))]
+
+# Big trees
+rows = UI.Container(items = [UI.Label(label = "Row " + str(i)) for i in range(10000)])
+def change_rows(container):
+    container.get_items()[5000].set_label("Changed")
+    container.add(UI.Label(label = "New"))
+patches = check(rows, change_rows)
+assert len(patches) == 2
+
+# Keyed childs
+def keyed_rows(keys):
+    return UI.Container(items = [
+        UI.Label(label = "Row " + str(key), key = key) for key in keys
+    ])
+
+old = keyed_rows(range(10000)).render()
+new = keyed_rows([-1] + list(range(10000))).render()
+patches = UI.diff(old, new)
+assert [(p.op, p.path) for p in patches] == [(UI.PATCH_INSERT, (0,))]
+assert UI.apply_patches(old, patches).to_xml_string() == new.to_xml_string()
+
+old = keyed_rows(range(10)).render()
+new = keyed_rows([9] + list(range(9))).render()
+patches = UI.diff(old, new)
+assert patches == [UI.Patch(UI.PATCH_MOVE, (9,), value = 0)]
+
+random = __import__("random").Random(1)
+for i in range(200):
+    old_keys = random.sample(range(30), random.randint(0, 20))
+    new_keys = random.sample(range(30), random.randint(0, 20))
+    old = keyed_rows(old_keys).render()
+    new = keyed_rows(new_keys).render()
+    # Change the text of a row, so the matched childs are compared
+    if new_keys:
+        new.inner_content()[0].inner_content()[0] = "Changed"
+    patches = UI.diff(old, new)
+    assert UI.apply_patches(old, patches).to_xml_string() == new.to_xml_string()
+
+# A big reorder is not quadratic (when each move searched the list of
+# childs, a full reversal of 40000 childs took about 12 seconds)
+def keyed_nodes(keys):
+    return UI.RenderedObject("list", {}, [
+        UI.RenderedObject("row", {"key": key}, []) for key in keys
+    ])
+
+count = 100000
+old = keyed_nodes(range(count))
+new = keyed_nodes(reversed(range(count)))
+start = time.perf_counter()
+patches = UI.diff(old, new)
+assert time.perf_counter() - start < 10
+assert len(patches) == count - 1
+assert all(patch.op == UI.PATCH_MOVE for patch in patches)
+small = keyed_nodes(range(50))
+patches = UI.diff(small, keyed_nodes(reversed(range(50))))
+assert UI.apply_patches(small, patches) == keyed_nodes(reversed(range(50)))
+
+print("Diff OK")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the UI.Document element and TreeToHTML.iter_document."""
+
+from PythonReact import UI, engines
+
+class CountingLabel(UI.Label):
+    """A label that counts it's renders."""
+
+    renders = 0
+
+    def render(self):
+        CountingLabel.renders += 1
+        return super().render()
+
+converter = engines.html.TreeToHTML()
+
+document = UI.Document(
+    title = "Document test",
+    lang = "en",
+    meta = {"viewport": "width=device-width, initial-scale=1"},
+    stylesheets = ["test.css"],
+    scripts = ["app.js"],
+    preload = [("logo.png", "image")],
+    body = UI.Container(items = [CountingLabel(label = "Body")], style = ["container"])
+)
+
+html = converter.toHTML(document.render())
+assert html == (
+    "<!DOCTYPE html>\n<html lang=\"en\" >"
+    "<head ><meta charset=\"utf-8\" />"
+    "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />"
+    "<title >Document test</title>"
+    "<link rel=\"stylesheet\" href=\"test.css\" />"
+    "<link rel=\"preload\" href=\"logo.png\" as=\"image\" />"
+    "<script src=\"app.js\" defer=\"defer\" ></script></head>"
+    "<body ><div class=\"container\" ><span >Body</span></div></body></html>"
+), html
+
+# The head is generated before the body is rendered
+CountingLabel.renders = 0
+chunks = converter.iter_document(document, 16)
+head = next(chunks)
+assert CountingLabel.renders == 0
+assert head.endswith("</head><body >")
+assert head + "".join(chunks) == html
+assert CountingLabel.renders == 1
+
+# Already rendered body
+body = document.get_body().render()
+assert converter.document_head(document) + "".join(
+    converter.iter_document_body(document, body)
+) == html
+
+# Changes
+document.add_stylesheet("other.css")
+document.set_title("Other")
+assert "<link rel=\"stylesheet\" href=\"other.css\" />" in converter.document_head(document)
+assert "<title >Other</title>" in converter.document_head(document)
+
+print("Document OK")
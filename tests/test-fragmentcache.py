@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the FragmentCache of the HTML engine."""
+
+import pickle
+import sys
+
+from PythonReact import UI, engines
+
+def make_tree(rows):
+    """Creates a tree with repeated widgets (the cards) and forms."""
+    root = UI.Container(style = ["root"])
+    for i in range(rows):
+        card = UI.Container(items = [
+            UI.Label(label = "Product " + str(i % 5), style = ["title"]),
+            UI.Button(label = "Buy", type = "link", href = "/buy/" + str(i % 5))
+        ], style = ["card"])
+        form = UI.Form(act = "/search", items = [
+            UI.Frame(title = "Search", items = [UI.Label(label = "Query")])
+        ])
+        root.add(card, form, UI.Separator())
+    return root.render()
+
+plain = engines.html.TreeToHTML()
+cache = engines.html.FragmentCache()
+cached = engines.html.TreeToHTML(fragment_cache = cache)
+
+tree = make_tree(100)
+expected = plain.toHTML(tree)
+
+# The HTML is the same, with and without cache
+assert cached.toHTML(tree) == expected
+assert cached.toHTML(tree) == expected
+assert "".join(cached.iter_html(tree, 64)) == expected
+
+info = cache.cache_info()
+# Each card, form and separator of the first render are misses, but only
+# 5 cards, 1 form and 1 separator are different
+assert info["entries"] == 7, info
+assert info["misses"] == 7 and info["hits"] == 3 * 300 - 7, info
+assert info["hit_rate"] > 0.99
+assert info["bytes"] > 0
+
+# The label inside the form is converted to a label tag, not a span
+assert "<label >Query</label>" in cached.toHTML(tree)
+
+# The big trees are not cached, but their childs are
+cache.clear()
+small = engines.html.FragmentCache(max_nodes = 4)
+converter = engines.html.TreeToHTML(fragment_cache = small)
+assert converter.toHTML(tree) == expected
+assert small.fingerprint(tree, engines.html.DEFAULT_CONTEXT) is None
+assert small.cache_info()["entries"] == 7
+
+# The fingerprints are saved in the nodes, but the number of nodes is
+# checked again by each cache
+card = tree.inner_content()[0]
+assert card._fingerprint is not None
+assert engines.html.FragmentCache(max_nodes = 2).fingerprint(card, engines.html.DEFAULT_CONTEXT) is None
+
+# The subtrees that are too big are found in one pass
+too_big = {}
+assert cache.fingerprint(tree, engines.html.DEFAULT_CONTEXT, too_big) is None
+assert set(too_big) == {id(tree)}
+deep = UI.RenderedObject("div", {}, ["x"])
+for i in range(50):
+    deep = UI.RenderedObject("div", {}, [deep])
+too_big = {}
+assert cache.fingerprint(deep, engines.html.DEFAULT_CONTEXT, too_big) is None
+assert len(too_big) == 51 - cache.max_nodes
+
+# The patched nodes are converted again (see UI.apply_patches)
+old = UI.Container(items = [UI.Label(label = "Old")]).render()
+new = UI.Container(items = [UI.Label(label = "New")]).render()
+converter = engines.html.TreeToHTML(fragment_cache = engines.html.FragmentCache(max_nodes = 1))
+assert converter.toHTML(old) == plain.toHTML(old)
+UI.apply_patches(old, UI.diff(old, new))
+assert converter.toHTML(old) == plain.toHTML(new)
+
+# Eviction by count and by size
+lru = engines.html.FragmentCache(max_entries = 3)
+converter = engines.html.TreeToHTML(fragment_cache = lru)
+assert converter.toHTML(tree) == expected
+assert lru.cache_info()["entries"] == 3
+assert lru.cache_info()["evictions"] > 0
+
+tiny = engines.html.FragmentCache(max_bytes = 400)
+converter = engines.html.TreeToHTML(fragment_cache = tiny)
+assert converter.toHTML(tree) == expected
+assert tiny.cache_info()["bytes"] <= 400
+
+# The elements and the deferred elements are not cached
+deferred = UI.Container(items = [
+    UI.Deferred(element = UI.Label(label = "Later"), fallback = "Loading")
+]).render()
+assert cached.toHTML(deferred) == plain.toHTML(deferred)
+assert "".join(cached.iter_html(deferred)) == "".join(plain.iter_html(deferred))
+
+# The property values are compared with their types
+typed = engines.html.TreeToHTML(fragment_cache = engines.html.FragmentCache())
+for content in (None, "None", 1, "1"):
+    meta = UI.RenderedObject("meta", {"content": content}, [])
+    assert typed.toHTML(meta) == plain.toHTML(meta)
+assert typed.fragment_cache.cache_info()["entries"] == 4
+
+# The size of the keys is counted too
+sized = engines.html.FragmentCache()
+key = sized.fingerprint(tree.inner_content()[0], engines.html.DEFAULT_CONTEXT)
+assert key is not None
+sized.put(key, "")
+assert sized.cache_info()["bytes"] > sys.getsizeof("") + sys.getsizeof(key)
+
+# The converter can be pickled (the cache is copied empty)
+copy = pickle.loads(pickle.dumps(cached))
+assert copy.fragment_cache.cache_info()["entries"] == 0
+assert copy.toHTML(tree) == expected
+
+print("Fragment cache OK")
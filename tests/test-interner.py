@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the structural equality of RenderedObject and the Interner."""
+
+import pickle
+
+from PythonReact import UI, engines
+
+def node(tag, properties, *childs):
+    return UI.RenderedObject(tag, properties, list(childs))
+
+# Equality and hash
+a = node("container", {"style": "x", "name": ""}, node("label", {}, "Hi"), "text")
+b = node("container", {"name": "", "style": "x"}, node("label", {}, "Hi"), "text")
+c = node("container", {"style": "x", "name": ""}, node("label", {}, "Bye"), "text")
+assert a == b and hash(a) == hash(b)
+assert a != c
+assert a != node("container", {"style": "x", "name": ""}, node("label", {}, "Hi"))
+assert a != "container"
+assert len({a, b, c}) == 2
+
+# Deep trees are compared and hashed without recursion
+def deep(depth, text):
+    tree = node("container", {}, text)
+    for i in range(depth):
+        tree = node("container", {}, tree)
+    return tree
+
+assert deep(20000, "a") == deep(20000, "a")
+assert deep(20000, "a") != deep(20000, "b")
+assert hash(deep(20000, "a")) == hash(deep(20000, "a"))
+
+# The hashes are cached in the nodes, so the next hashes are O(1)
+big = node("container", {}, *[node("row", {"n": i}, "Row " + str(i)) for i in range(100000)])
+value = hash(big)
+assert big._hash == value
+assert all(row._hash is not None for row in big.inner_content())
+assert hash(big) == value
+assert hash(pickle.loads(pickle.dumps(big))) == value
+table = {big: "found"}
+assert table[node("container", {}, *big.inner_content())] == "found"
+
+# The patched nodes are hashed again
+old = node("list", {}, node("item", {"n": 1}, "a"), node("item", {"n": 2}, "b"))
+new = node("list", {}, node("item", {"n": 1}, "a"), node("item", {"n": 3}, "c"))
+hash(old)
+assert hash(UI.apply_patches(old, UI.diff(old, new))) == hash(new)
+
+# The lazy childs are iterated (once) and their hashes are not cached
+lazy = node("container", {}, node("list", {}, "x"))
+lazy.inner_content()[0]._inner_content = UI.LazyContent(lambda: iter(["a", "b"]))
+expected = node("container", {}, node("list", {}, "a", "b"))
+assert hash(lazy) == hash(expected) and lazy._hash is None
+lazy.inner_content()[0]._inner_content = UI.LazyContent(lambda: iter(["c"]))
+assert hash(lazy) != hash(expected)
+
+# Interning
+buttons = [UI.Button(label = "Edit", style = ["button"]) for i in range(1000)]
+root = UI.Container(items = [
+    UI.Container(items = [buttons[i], UI.Separator(), UI.Label(label = "Row " + str(i % 10))])
+    for i in range(1000)
+])
+tree = root.render()
+html = engines.html.TreeToHTML().toHTML(tree)
+
+interner = UI.Interner()
+interned = interner.intern(tree)
+assert interned == tree
+assert engines.html.TreeToHTML().toHTML(interned) == html
+
+rows = interned.inner_content()
+# Equal subtrees are the same object
+assert all(row.inner_content()[0] is rows[0].inner_content()[0] for row in rows)
+assert rows[0] is rows[10]
+assert rows[0] is not rows[1]
+# 1 button + 1 separator + 10 labels + 10 rows + the root
+assert len(interner) == 23, len(interner)
+assert interner.cache_info()["hits"] > 0
+
+# The original tree is not modified
+assert tree.inner_content()[0] is not tree.inner_content()[10]
+
+# Equal values of different types are not shared
+one = interner.intern(node("image", {"width": 1}, "a.png"))
+true = interner.intern(node("image", {"width": True}, "a.png"))
+assert one is not true
+
+# Other trees share the same nodes
+again = interner.intern(UI.Container(items = [UI.Button(label = "Edit", style = ["button"])]).render())
+assert again.inner_content()[0] is rows[0].inner_content()[0]
+
+# The nodes with pending elements are not interned, but their childs are
+pending = node("container", {}, UI.Label(label = "Pending"), node("separator", {}))
+result = interner.intern(pending)
+assert result is not interner.intern(node("container", {}, UI.Label(label = "Pending"), node("separator", {})))
+assert result.inner_content()[1] is interner.intern(node("separator", {}))
+
+# Unhashable properties
+result = interner.intern(node("container", {"data": [1, 2]}, node("separator", {})))
+assert result.properties()["data"] == [1, 2]
+
+print("Interner OK")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the JSON export and import (engines.json)."""
+
+import io
+import json
+
+from PythonReact import UI, engines
+
+converter = engines.json.TreeToJSON()
+
+def node(tag, properties, *childs):
+    return UI.RenderedObject(tag, properties, list(childs))
+
+tree = node("container", {"style": "box", "width": 640, "visible": True, "key": None},
+    node("label", {}, "Hello \"world\"", node("text-tag", {"type": "bold"}, "ñ")),
+    42,
+    node("separator", {})
+)
+text = converter.to_json(tree)
+assert text == (
+    '["container",{"style":"box","width":640,"visible":true,"key":null},['
+    '["label",{},["Hello \\"world\\"",["text-tag",{"type":"bold"},["ñ"]]]],'
+    '42,'
+    '["separator",{},[]]]]'
+), text
+assert json.loads(text)[2][1] == 42
+loaded = converter.from_json(text)
+assert loaded == tree
+assert loaded.properties()["visible"] is True
+
+# A rendered page, chunk by chunk
+page = UI.Container(items = [
+    UI.Form(items = [UI.Label(label = "Row " + str(i)), UI.Button(label = "Edit")])
+    for i in range(200)
+]).render()
+text = converter.to_json(page)
+chunks = list(converter.iter_json(page, 256))
+assert len(chunks) > 10
+assert "".join(chunks) == text
+fp = io.StringIO()
+converter.write_json(page, fp)
+fp.seek(0)
+assert converter.load_json(fp) == page
+assert engines.html.TreeToHTML().toHTML(converter.from_json(text)) == \
+    engines.html.TreeToHTML().toHTML(page)
+
+# Deep trees (deeper than the limit of the JSON parser)
+deep = node("container", {}, "end")
+for i in range(20000):
+    deep = node("container", {}, deep)
+assert converter.from_json(converter.to_json(deep)) == deep
+assert converter._parse_deep(text) == json.loads(text)
+assert converter._parse_deep(' [ 1 , [ ] , [ [ "a" ] ] ] ') == [1, [], [["a"]]]
+
+# Errors
+for invalid in ('[1 2]', '[1,]', '[,1]', '[1]]', '[[1]', '["a", {}, []] x'):
+    try:
+        converter._parse_deep(invalid)
+        assert False, invalid
+    except ValueError:
+        pass
+for invalid in ('"text"', '["a", {}]', '["a", {}, [{}]]'):
+    try:
+        converter.from_json(invalid)
+        assert False, invalid
+    except ValueError:
+        pass
+try:
+    converter.to_json(node("container", {}, UI.Label(label = "Pending")))
+    assert False
+except ValueError:
+    pass
+for root in ("text", "with \"quotes\"", 1, None):
+    try:
+        list(converter.iter_json(root))
+        assert False, root
+    except ValueError:
+        pass
+
+print("JSON OK")
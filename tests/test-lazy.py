@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the lazy childs (UI.LazyContent and lazy containers)."""
+
+import tracemalloc
+
+from PythonReact import UI, engines
+
+converter = engines.html.TreeToHTML()
+
+def rows(count):
+    for i in range(count):
+        yield UI.Label(label = "Row " + str(i))
+
+def eager(count):
+    return UI.Container(items = list(rows(count)), style = ["table"])
+
+# A generator is consumed lazily, and only once
+lazy = UI.Container(items = rows(3), style = ["table"])
+assert lazy.is_lazy()
+tree = lazy.render()
+assert converter.toHTML(tree) == converter.toHTML(eager(3).render())
+try:
+    converter.toHTML(tree)
+    assert False
+except RuntimeError:
+    pass
+
+# Comparing and hashing a generator does not consume it (the nodes are
+# compared by identity)
+tree = UI.Container(items = rows(3), style = ["table"]).render()
+other = UI.Container(items = rows(3), style = ["table"]).render()
+assert tree.inner_content().is_one_shot()
+assert (tree == tree) and (tree != other) and (hash(tree) == hash(tree))
+parent = UI.RenderedObject("div", {}, [tree])
+assert parent == UI.RenderedObject("div", {}, [tree])
+assert parent != UI.RenderedObject("div", {}, [other])
+assert {parent: 1}[UI.RenderedObject("div", {}, [tree])] == 1
+assert converter.toHTML(tree) == converter.toHTML(eager(3).render())
+mixed = UI.LazyContent(rows(1)).map(UI.render_tree) + UI.LazyContent(lambda: rows(1))
+assert mixed.is_one_shot() and not UI.LazyContent(lambda: rows(1)).map(str).is_one_shot()
+
+# A function can be iterated many times
+lazy = UI.Container(items = UI.LazyContent(lambda: rows(3)), style = ["table"])
+tree = lazy.render()
+expected = eager(3).render()
+assert converter.toHTML(tree) == converter.toHTML(expected)
+assert "".join(converter.iter_html(tree, 16)) == converter.toHTML(expected)
+assert converter.convert_node(tree).to_xml_string() == \
+    converter.convert_node(expected).to_xml_string()
+assert tree.to_xml_string() == expected.to_xml_string()
+assert tree.to_tree_string() == expected.to_tree_string()
+assert tree == expected and hash(tree) == hash(expected)
+assert UI.render_tree(lazy) == expected
+
+# The lazy childs of other consumers
+to_json = engines.json.TreeToJSON()
+assert to_json.to_json(tree) == to_json.to_json(expected)
+binary = engines.binary.TreeToBinary()
+assert binary.to_bytes(tree) == binary.to_bytes(expected)
+assert UI.Interner().intern(tree) is tree
+cached = engines.html.TreeToHTML(fragment_cache = engines.html.FragmentCache())
+assert cached.toHTML(tree) == converter.toHTML(expected)
+
+# An empty lazy container is not written as <div />
+empty = UI.Container(items = iter([])).render()
+assert converter.toHTML(empty) == "<div ></div>"
+
+# Adding items, labels with lazy items and forms
+lazy = UI.Container(items = UI.LazyContent(lambda: rows(2)))
+lazy.add(UI.Label(label = "Last"))
+assert converter.toHTML(lazy.render()) == \
+    "<div ><span >Row 0</span><span >Row 1</span><span >Last</span></div>"
+label = UI.Label(label = "Title: ", items = UI.LazyContent(lambda: rows(1)))
+assert converter.toHTML(label.render()) == "<span >Title: <span >Row 0</span></span>"
+form = UI.Form(items = UI.LazyContent(lambda: rows(1)))
+assert converter.toHTML(form.render()) == \
+    "<form action=\"\" method=\"GET\" ><label >Row 0</label></form>"
+
+# The lazy nodes are always replaced by diff
+old = UI.Container(items = UI.LazyContent(lambda: rows(2))).render()
+new = UI.Container(items = UI.LazyContent(lambda: rows(2))).render()
+assert [patch.op for patch in UI.diff(old, new)] == [UI.PATCH_REPLACE]
+
+# The memory does not grow with the number of rows
+class NullFile:
+    """A file that discards the written data."""
+
+    def write(self, data):
+        pass
+
+def peak_memory(count):
+    container = UI.Container(items = UI.LazyContent(lambda: rows(count)))
+    tracemalloc.start()
+    converter.write_html(container.render(), NullFile(), 1024)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+small = peak_memory(1000)
+big = peak_memory(20000)
+assert big < small * 2, (small, big)
+
+print("Lazy OK")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the parallel render (TreeToHTML.render_parallel)."""
+
+import concurrent.futures
+import pickle
+
+from PythonReact import UI, engines
+
+def make_section(number):
+    """Creates a dashboard section."""
+    section = UI.Container(style = ["section"])
+    section.add(UI.Label(label = "Section " + str(number)))
+    for i in range(50):
+        section.add(UI.Button(label = "Item " + str(i), type = "link", href = "#" + str(i)))
+    return section
+
+class CountingContainer(UI.Container):
+    """A container that counts it's renders."""
+
+    renders = 0
+
+    def render(self):
+        CountingContainer.renders += 1
+        return super().render()
+
+def main():
+    root = UI.Container(items = [make_section(i) for i in range(8)])
+    root.add(UI.Form(items = [
+        UI.Frame(title = "Filters", items = [UI.Label(label = "In form")])
+    ]))
+
+    # The rendered objects and the elements can be pickled
+    tree = root.render()
+    assert pickle.loads(pickle.dumps(tree)).to_xml_string() == tree.to_xml_string()
+    section = pickle.loads(pickle.dumps(root.get_items()[0]))
+    assert section.get_parents() == []
+    assert section.render().to_xml_string() == tree.inner_content()[0].to_xml_string()
+
+    converter = engines.html.TreeToHTML()
+    expected = converter.toHTML(tree)
+
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        assert converter.render_parallel(root, executor) == expected
+    assert converter.render_parallel(root, max_workers = 2) == expected
+    assert "<fieldset >" in expected
+
+    # The root is rendered only once
+    counting = CountingContainer(items = [make_section(i) for i in range(3)])
+    expected = converter.toHTML(counting.render())
+    CountingContainer.renders = 0
+    assert converter.render_parallel(counting, max_workers = 2) == expected
+    assert CountingContainer.renders == 1
+
+    print("Parallel render OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the render of element trees.
+
+Memoization, dirty tracking and batched state updates.
+"""
+
+from PythonReact import UI, engines
+
+class Footer(UI.PureElement, UI.Container):
+    """A pure container that counts it's renders."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return super().render()
+
+    def render_inputs(self):
+        inputs = super().render_inputs()
+        del inputs["renders"]
+        return inputs
+
+footer = Footer(items = [UI.Label(label = "(c) 2016")], style = ["footer"])
+page = UI.Container(items = [UI.Label(label = "Body"), footer])
+
+first = page.render()
+second = page.render()
+assert footer.renders == 1
+assert first.inner_content()[1] is second.inner_content()[1]
+assert footer.cache_info() == {"hits": 1, "misses": 1}
+
+footer.add_class("dark")
+third = page.render()
+assert footer.renders == 2
+assert footer.cache_info() == {"hits": 1, "misses": 2}
+assert third.inner_content()[1].properties()["style"] == "footer dark"
+
+html = engines.html.TreeToHTML().toHTML(third)
+assert html == (
+    "<div ><span >Body</span>"
+    "<div class=\"footer dark\" ><span >(c) 2016</span></div></div>"
+)
+
+# A change inside a pure container is detected
+footer.get_items()[0].set_label("(c) 2017")
+fourth = page.render()
+assert footer.renders == 3
+assert "(c) 2017" in fourth.to_xml_string()
+
+# Incremental render
+class CountingLabel(UI.Label):
+    """A label that counts it's renders."""
+
+    renders = 0
+
+    def render(self):
+        CountingLabel.renders += 1
+        return super().render()
+
+sections = [
+    UI.Container(items = [CountingLabel(label = str(i) + "." + str(j)) for j in range(10)])
+    for i in range(10)
+]
+root = UI.Container(items = sections)
+
+full = UI.render_tree(root, incremental = True)
+assert CountingLabel.renders == 100
+assert not root.is_dirty()
+
+same = UI.render_tree(root, incremental = True)
+assert same is full
+assert CountingLabel.renders == 100
+
+changed = sections[3].get_items()[7]
+changed.set_label("Changed")
+assert changed.is_dirty() and sections[3].is_dirty() and root.is_dirty()
+assert not sections[4].is_dirty()
+
+updated = UI.render_tree(root, incremental = True)
+assert CountingLabel.renders == 101
+for i in range(10):
+    if i != 3:
+        assert updated.inner_content()[i] is full.inner_content()[i]
+assert updated.to_xml_string() == root.render().to_xml_string()
+patches = UI.diff(full, updated)
+assert patches == [UI.Patch(UI.PATCH_SET_TEXT, (3, 7, 0), value = "Changed")]
+
+renders = CountingLabel.renders
+sections[9].add(CountingLabel(label = "New"))
+updated = UI.render_tree(root, incremental = True)
+assert CountingLabel.renders == renders + 1
+assert updated.inner_content()[9].inner_content()[-1].inner_content() == ["New"]
+
+# Batched state updates
+class Counter(UI.Element):
+    """Displays the "count" state."""
+
+    renders = 0
+
+    def render(self):
+        Counter.renders += 1
+        return UI.Label(label = str(self.get_state().get("count", 0))).render()
+
+class CountingContainer(UI.Container):
+    """A container that counts it's renders."""
+
+    renders = 0
+
+    def render(self):
+        CountingContainer.renders += 1
+        return super().render()
+
+counters = [Counter(), Counter()]
+panel = CountingContainer(items = counters)
+
+def click():
+    for i in range(3):
+        counters[0].set_state(count = i + 1)
+    counters[1].set_state({"count": 10})
+    # The updates are applied when the handler returns
+    assert counters[0].get_state() == {}
+
+button = UI.Button(label = "+", onclick = click)
+page = UI.Container(items = [panel, button])
+UI.render_tree(page, incremental = True)
+assert (Counter.renders, CountingContainer.renders) == (2, 1)
+
+renders = []
+UI.get_scheduler().on_render = lambda root, rendered: renders.append((root, rendered))
+button.emit(UI.EVENT_NAME_CLICK)
+UI.get_scheduler().on_render = None
+
+assert counters[0].get_state() == {"count": 3}
+assert (Counter.renders, CountingContainer.renders) == (4, 2)
+assert len(renders) == 1 and renders[0][0] is page
+assert "<label style=\"\" name=\"\" >3</label>" in renders[0][1].to_xml_string()
+assert "<label style=\"\" name=\"\" >10</label>" in renders[0][1].to_xml_string()
+
+# Outside a batch the update is applied immediately
+counters[1].set_state(count = 11)
+assert counters[1].get_state() == {"count": 11}
+assert (Counter.renders, CountingContainer.renders) == (5, 3)
+
+# A failed render does not mark the rendered elements as clean
+class Failing(UI.Label):
+    fail = False
+
+    def render(self):
+        if Failing.fail:
+            raise RuntimeError("Render failed")
+        return super().render()
+
+label = UI.Label(label = "old")
+failing = Failing(label = "x")
+root = UI.Container(items = [UI.Container(items = [label]), failing])
+UI.render_tree(root, incremental = True)
+label.set_label("new")
+failing.set_label("y")
+Failing.fail = True
+try:
+    UI.render_tree(root, incremental = True)
+    assert False
+except RuntimeError:
+    pass
+assert label.is_dirty() and root.is_dirty()
+Failing.fail = False
+assert "new" in UI.render_tree(root, incremental = True).to_xml_string()
+
+# An element that updates it's state each time it's rendered does not
+# render forever
+class Looping(UI.Label):
+    def render(self):
+        self.set_state(renders = self.get_state().get("renders", 0) + 1)
+        return super().render()
+
+looping = Looping(label = "loop")
+UI.get_scheduler().max_passes = 10
+try:
+    UI.render_tree(looping, incremental = True)
+    assert False
+except RuntimeError:
+    pass
+UI.get_scheduler().max_passes = 100
+assert looping.get_state()["renders"] == 10
+assert not UI.get_scheduler().is_batching()
+
+# The replaced childs are detached from their containers
+old_body = UI.Label(label = "Old")
+new_body = UI.Label(label = "New")
+document = UI.Document(body = old_body)
+document.set_body(new_body)
+assert old_body.get_parents() == [] and new_body.get_parents() == [document]
+UI.render_tree(document, incremental = True)
+old_body.set_label("Changed")
+assert not document.is_dirty()
+
+bold = UI.TextTag(text = "bold")
+text = UI.TextTag(text = "text")
+text.mix(bold)
+text.mix(UI.TextTag(text = "italic"))
+assert bold.get_parents() == []
+
+print("Render OK")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the WSGI and ASGI applications, using the test clients."""
+
+import asyncio
+import threading
+import time
+
+from PythonReact import UI, server
+
+class SlowLabel(UI.Label):
+    """A label that takes "delay" seconds to load it's text."""
+
+    def __init__(self, *args, delay = 0.2, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+
+    def render(self):
+        time.sleep(self.delay)
+        return super().render()
+
+    async def render_async(self):
+        await asyncio.sleep(self.delay)
+        return super().render()
+
+def home(request):
+    name = request.query.get("name", ["World"])[0]
+    return UI.Container(items = [
+        UI.Label(label = "Hello " + name),
+        UI.Container(items = [UI.Label(label = "Row " + str(i)) for i in range(500)])
+    ], name = "home")
+
+class CountingLabel(UI.Label):
+    """A label that counts the concurrent renders (see state).
+
+    When state["expected"] renders are running, all of them end. If
+    they can't run at the same time, they end after state["limit"]
+    seconds (and the label is "Blocked").
+    """
+
+    async def render_async(self):
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        if state["running"] >= state["expected"]:
+            state["event"].set()
+        try:
+            await asyncio.wait_for(state["event"].wait(), state["limit"])
+            text = "Ready"
+        except asyncio.TimeoutError:
+            text = "Blocked"
+        state["running"] -= 1
+        return UI.Label(label = text).render()
+
+state = {}
+
+def reset_state(expected, limit):
+    state.update(running = 0, max_running = 0, expected = expected,
+                 limit = limit, event = asyncio.Event())
+
+def slow(request):
+    return UI.Container(items = [SlowLabel(label = "Slow")])
+
+def counting(request):
+    return UI.Container(items = [CountingLabel(label = "Counting")])
+
+def deferred(request):
+    return UI.Container(items = [
+        UI.Label(label = "Before"),
+        UI.Deferred(element = CountingLabel(label = "Deferred"), fallback = "Wait")
+    ])
+
+routes = {"/": home, "/slow": slow, "/counting": counting, "/deferred": deferred}
+
+expected = UI.Container(items = [
+    UI.Label(label = "Hello Test"),
+    UI.Container(items = [UI.Label(label = "Row " + str(i)) for i in range(500)])
+], name = "home")
+
+# WSGI
+app = server.WSGIApp(routes, chunk_size = 1024, title = "Test")
+client = server.WSGITestClient(app)
+
+response = client.get("/?name=Test")
+assert response.status == 200
+assert response.headers["content-type"].startswith("text/html")
+assert len(response.chunks) > 3
+text = response.text()
+assert text.startswith("<!DOCTYPE html>")
+assert "<title >Test</title>" in text
+assert text.endswith("</body></html>")
+assert app.converter.toHTML(expected.render()) in text
+
+assert client.get("/missing").status == 404
+
+# The head is sent, but the body is not rendered in time
+app = server.WSGIApp(routes, timeout = 0.1)
+response = server.WSGITestClient(app).get("/slow")
+assert response.status == 200
+assert "<head >" in response.text()
+assert "</html>" not in response.text()
+
+# Only one request at a time, the others wait for 0.1 seconds
+app = server.WSGIApp(routes, timeout = 0.1, max_concurrency = 1)
+responses = []
+threads = [
+    threading.Thread(target = lambda: responses.append(server.WSGITestClient(app).get("/slow")))
+    for i in range(3)
+]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert sorted(r.status for r in responses) == [200, 503, 503]
+# The slots are released
+assert server.WSGITestClient(app).get("/").status == 200
+
+print("WSGI OK")
+
+# ASGI
+app = server.ASGIApp(routes, chunk_size = 1024, title = "Test")
+client = server.ASGITestClient(app)
+
+response = client.get("/?name=Test")
+assert response.status == 200
+assert len(response.chunks) > 3
+assert response.text() == server.WSGITestClient(
+    server.WSGIApp(routes, chunk_size = 1024, title = "Test")
+).get("/?name=Test").text()
+
+assert client.get("/missing").status == 404
+
+app = server.ASGIApp(routes, timeout = 0.1)
+response = server.ASGITestClient(app).get("/slow")
+assert response.status == 200
+assert "<head >" in response.text()
+assert "</html>" not in response.text()
+
+# Two requests at a time: the others wait for a slot
+app = server.ASGIApp(routes, max_concurrency = 2)
+client = server.ASGITestClient(app)
+
+async def main():
+    reset_state(2, 0.1)
+    return await asyncio.gather(*[client.get_async("/counting") for i in range(5)])
+
+responses = asyncio.run(main())
+assert all(r.text().endswith("</html>") for r in responses)
+assert state["max_running"] == 2, state
+
+# The deferred elements of many requests are rendered at the same time
+app = server.ASGIApp(routes)
+client = server.ASGITestClient(app)
+
+async def main():
+    reset_state(4, 10)
+    return await asyncio.gather(*[client.get_async("/deferred") for i in range(4)])
+
+responses = asyncio.run(main())
+for response in responses:
+    text = response.text()
+    assert "<span >Ready</span>" in text, text
+    assert text.endswith("</html>")
+assert state["max_running"] == 4, state
+
+# The timeout applies to the deferred elements
+app = server.ASGIApp(routes, timeout = 0.1)
+
+async def main():
+    reset_state(2, 10)
+    return await server.ASGITestClient(app).get_async("/deferred")
+
+response = asyncio.run(main())
+assert "Before" in response.text() and "Ready" not in response.text()
+assert "</html>" not in response.text()
+
+# Only one request at a time, the others wait for 0.1 seconds
+app = server.ASGIApp(routes, timeout = 0.1, max_concurrency = 1)
+client = server.ASGITestClient(app)
+
+async def main():
+    return await asyncio.gather(*[client.get_async("/slow") for i in range(3)])
+
+assert [r.status for r in asyncio.run(main())] == [200, 503, 503]
+assert client.get("/").status == 200
+
+print("ASGI OK")
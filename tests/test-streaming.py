@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the streaming HTML output with deferred elements."""
+
+import concurrent.futures
+import gc
+import time
+import weakref
+
+from PythonReact import UI, engines
+
+DELAY = 0.3
+
+class SlowLabel(UI.Label):
+    """A label that takes DELAY seconds to render."""
+
+    def render(self):
+        time.sleep(DELAY)
+        return super().render()
+
+root = UI.Container(items = [
+    UI.Label(label = "Header"),
+    UI.Deferred(element = SlowLabel(label = "Slow"), fallback = "Loading..."),
+    UI.Form(items = [
+        UI.Deferred(element = UI.Label(label = "In form"), name = "in-form"),
+    ]),
+    UI.Label(label = "Footer"),
+])
+
+converter = engines.html.TreeToHTML()
+tree = root.render()
+
+# The deferred elements are rendered in place by toHTML
+assert converter.toHTML(tree) == (
+    "<div ><span >Header</span><div ><span >Slow</span></div>"
+    "<form action=\"\" method=\"GET\" ><div id=\"in-form\" >"
+    "<label >In form</label></div></form><span >Footer</span></div>"
+)
+
+# And streamed out of order by iter_html
+with concurrent.futures.ThreadPoolExecutor() as executor:
+    start = time.perf_counter()
+    chunks = []
+    footer_time = None
+    for chunk in converter.iter_html(tree, 16, executor):
+        chunks.append(chunk)
+        if (footer_time is None) and ("Footer" in "".join(chunks)):
+            footer_time = time.perf_counter() - start
+    total_time = time.perf_counter() - start
+
+assert footer_time < DELAY / 2, footer_time
+assert total_time >= DELAY
+
+assert "".join(chunks) == (
+    "<div ><span >Header</span><div id=\"deferred-1\" >Loading...</div>"
+    "<form action=\"\" method=\"GET\" ><div id=\"in-form\" ></div></form>"
+    "<span >Footer</span></div>"
+    "<template id=\"deferred-1-content\" ><span >Slow</span></template>" +
+    engines.html.DEFERRED_SWAP_SCRIPT.format("deferred-1") +
+    "<template id=\"in-form-content\" ><label >In form</label></template>" +
+    engines.html.DEFERRED_SWAP_SCRIPT.format("in-form")
+)
+
+# The deferred elements inside deferred elements get new ids
+inner = UI.Deferred(element = UI.Label(label = "Inner"), fallback = "Wait")
+outer = UI.Deferred(element = UI.Container(items = [
+    UI.Deferred(element = UI.Label(label = "Nested"), fallback = "Wait"), inner
+]), fallback = "Wait")
+tree = UI.Container(items = [outer, UI.Deferred(element = UI.Label(label = "Last"))]).render()
+html = "".join(converter.iter_html(tree, 16))
+for index in range(1, 5):
+    node_id = "deferred-" + str(index)
+    assert html.count("id=\"" + node_id + "\"") == 1, html
+    assert html.count("id=\"" + node_id + "-content\"") == 1, html
+assert "deferred-5" not in html
+
+# The wrapped elements are not saved in the rendered objects, but they
+# are kept while the rendered objects exist
+label = UI.Label(label = "Kept")
+tree = UI.Container(items = [UI.Deferred(element = label, fallback = "Wait")]).render()
+node = tree.inner_content()[0]
+assert UI.deferred_element(node) is label
+assert not any(isinstance(value, UI.Element) for value in node.properties().values())
+assert "Kept" not in tree.to_xml_string()
+assert engines.json.TreeToJSON().from_json(engines.json.TreeToJSON().to_json(tree)) == tree
+assert engines.binary.BinaryTree(engines.binary.TreeToBinary().to_bytes(tree)).load() == tree
+label = weakref.ref(label)
+assert "Kept" in converter.toHTML(tree)
+del tree, node
+gc.collect()
+assert label() is None
+
+print("Streaming OK")
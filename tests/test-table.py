@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the tables of column-oriented data (UI.Table)."""
+
+import array
+import tracemalloc
+
+from PythonReact import UI, engines
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+converter = engines.html.TreeToHTML()
+
+def nested(headers, columns):
+    """Returns the abstract tree of the table, without UI.TableRows."""
+    rows = [UI.TableRows.row_node([str(value) for value in values])
+            for values in zip(*columns)]
+    return UI.RenderedObject("table", {"style": "report", "name": ""}, [
+        UI.RenderedObject("table-head", {}, [
+            UI.RenderedObject("table-row", {}, [
+                UI.RenderedObject("table-header", {}, [header]) for header in headers
+            ])
+        ]),
+        UI.RenderedObject("table-body", {}, rows)
+    ])
+
+ids = array.array("i", range(5))
+names = ["Name {" + str(i) + "}" for i in range(5)]
+prices = (1.5, 2.0, 3.25, None, True)
+table = UI.Table(columns = [("Id", ids), ("Name", names), ("Price", prices)],
+                 style = ["report"])
+assert table.get_headers() == ["Id", "Name", "Price"]
+assert table.get_row_count() == 5
+tree = table.render()
+expected = nested(["Id", "Name", "Price"], [ids, names, prices])
+
+# The batched rows are the same as the generic conversion
+html = converter.toHTML(tree)
+assert html.startswith(
+    "<table class=\"report\" ><thead ><tr ><th >Id</th><th >Name</th>"
+    "<th >Price</th></tr></thead><tbody ><tr ><td >0</td><td >Name {0}</td>"
+    "<td >1.5</td></tr>"
+)
+assert html.endswith("<td >True</td></tr></tbody></table>")
+assert html == converter.toHTML(expected)
+assert "<td >Name {3}</td>" in html
+assert "".join(converter.iter_html(tree, 64)) == html
+assert converter.convert_node(tree).to_xml_string() == \
+    converter.convert_node(expected).to_xml_string()
+
+# The generic consumers see a normal tree
+assert tree == expected
+assert tree.to_xml_string() == expected.to_xml_string()
+assert len(list(tree.inner_content()[1].inner_content())) == 5
+
+# Inside a form, and with the fragment cache
+properties = UI.Form().render().properties()
+assert converter.toHTML(UI.RenderedObject("form", properties, [tree])) == \
+    converter.toHTML(UI.RenderedObject("form", properties, [expected]))
+cached = engines.html.TreeToHTML(fragment_cache = engines.html.FragmentCache())
+assert cached.toHTML(tree) == html
+assert cached.toHTML(tree) == html
+
+# More batches than one
+many = UI.Table(columns = {"N": range(1000), "Square": [i * i for i in range(1000)]})
+tree = many.render()
+html = converter.toHTML(tree)
+assert html.count("<tr >") == 1001
+assert html == "".join(converter.iter_html(tree, 100))
+
+# Empty tables and errors
+assert "<tbody ></tbody>" in converter.toHTML(UI.Table().render())
+try:
+    UI.Table(columns = [("A", [1, 2]), ("B", [1])])
+    assert False
+except ValueError:
+    pass
+
+if numpy is not None:
+    values = numpy.arange(10, dtype = numpy.float64)
+    table = UI.Table(columns = [("X", values)])
+    assert converter.toHTML(table.render()) == \
+        converter.toHTML(UI.Table(columns = [("X", values.tolist())]).render())
+
+# The batched rows use less memory than the containers and labels
+def labels(count):
+    return UI.Container(items = [
+        UI.Container(items = [UI.Label(label = str(i)), UI.Label(label = str(i * 2))])
+        for i in range(count)
+    ])
+
+def peak(function):
+    tracemalloc.start()
+    function()
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+count = 20000
+table_peak = peak(lambda: converter.toHTML(UI.Table(columns = [
+    ("A", range(count)), ("B", range(0, count * 2, 2))
+]).render()))
+labels_peak = peak(lambda: converter.toHTML(labels(count).render()))
+assert table_peak * 2 < labels_peak, (table_peak, labels_peak)
+
+print("Table OK")
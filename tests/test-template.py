@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the template compilation (TreeToHTML.compile and UI.Slot)."""
+
+from PythonReact import UI, engines
+
+converter = engines.html.TreeToHTML()
+
+def page(title, rows):
+    """Creates the page, with the slots filled (title and rows are elements)."""
+    return UI.Container(items = [
+        UI.Container(items = [
+            UI.Link(label = "Home", href = "/", style = ["link"]),
+            UI.Link(label = "About", href = "/about", style = ["link"])
+        ], style = ["menu"]),
+        title,
+        UI.Separator(),
+        UI.Form(act = "/search", method = "GET", items = [
+            UI.Frame(title = "Results", items = [rows])
+        ]),
+        UI.Label(label = "Footer", style = ["footer"])
+    ], name = "page")
+
+def slotted_page():
+    return page(
+        UI.Slot(slot = "title", default = UI.Label(label = "Untitled")),
+        UI.Slot(slot = "rows")
+    )
+
+template = converter.compile(slotted_page())
+assert template.slot_names() == ["title", "rows"]
+
+# Defaults
+assert template.render() == converter.toHTML(slotted_page().render())
+assert "<span >Untitled</span>" in template.render()
+
+# Values (the labels of the rows are inside a form)
+title = UI.Label(label = "Title", style = ["title"])
+rows = [UI.Label(label = "Row " + str(i)) for i in range(10)]
+expected = converter.toHTML(page(title, UI.Container(items = rows)).render())
+html = template.render(title = title, rows = UI.Container(items = rows))
+assert html == expected, html
+assert "<label >Row 1</label>" in html
+assert "".join(template.iter_render(title = title, rows = UI.Container(items = rows))) == expected
+
+# Rendered objects, lists and strings
+assert template.render(title = title.render(), rows = [UI.Container(items = rows)]) == expected
+assert template.render(title = "<b>Title</b>").count("<b>Title</b>") == 1
+
+# The slots are transparent in a normal conversion
+slotted = UI.Container(items = [UI.Slot(slot = "a", default = UI.Label(label = "A"))])
+assert converter.toHTML(slotted.render()) == "<div ><span >A</span></div>"
+assert converter.convert_node(slotted.render()).to_xml_string() == "<div ><span >A</span></div>"
+
+print("Template OK")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Stress test: renders and converts shared trees from many threads.
+
+All the outputs must be identical to the single-threaded output.
+"""
+
+import concurrent.futures
+import io
+import sys
+
+from PythonReact import UI, engines
+
+def make_page():
+    """Creates a page with forms, frames and memoized elements."""
+    class Footer(UI.PureElement, UI.Container):
+        pass
+
+    root = UI.Container(style = ["page"])
+    for i in range(20):
+        root.add(UI.Form(act = "/save/" + str(i), items = [
+            UI.Frame(title = "Form " + str(i), items = [
+                UI.Label(label = "Field " + str(j)) for j in range(5)
+            ]),
+        ]))
+        root.add(UI.Frame(title = "Outside " + str(i), items = [
+            UI.Label(label = "Label " + str(i)),
+        ]))
+    root.add(Footer(items = [UI.Label(label = "Footer")]))
+    return root
+
+def work(converter, page, tree, shared_data):
+    """Renders and converts the shared page in all the possible ways."""
+    results = []
+    results.append(converter.toHTML(page.render()))
+    results.append(converter.toHTML(tree))
+    results.append("".join(converter.iter_html(tree, 64)))
+    fp = io.StringIO()
+    converter.write_html(tree, fp, 256)
+    results.append(fp.getvalue())
+    results.append(converter.convert_node(tree, shared_data).to_xml_string())
+    results.append(converter.convert_node(tree).to_xml_string())
+    return results
+
+def main():
+    # Switch between the threads as often as possible
+    sys.setswitchinterval(1e-6)
+
+    converter = engines.html.TreeToHTML()
+    page = make_page()
+    tree = page.render()
+    shared_data = {"iform": False}
+
+    expected = work(converter, page, tree, shared_data)
+    assert len(set(expected)) == 1
+
+    with concurrent.futures.ThreadPoolExecutor(16) as executor:
+        futures = [
+            executor.submit(work, converter, page, tree, shared_data)
+            for i in range(200)
+        ]
+        for future in futures:
+            assert future.result() == expected
+
+    assert shared_data == {"iform": False}
+    assert tree.to_xml_string() == page.render().to_xml_string()
+
+    # The lists passed by the caller are not shared
+    style = ["a"]
+    first = UI.Label(style = style)
+    second = UI.Label(style = style)
+    first.add_class("b")
+    assert second.get_class_list() == ["a"] and style == ["a"]
+
+    print("Threads OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""Tests the virtual lists (UI.VirtualList)."""
+
+from PythonReact import UI, engines
+
+converter = engines.html.TreeToHTML()
+
+created = []
+
+def row(index):
+    created.append(index)
+    return UI.Label(label = "Row " + str(index))
+
+# Only the rows of the window are created, when the list is converted
+lst = UI.VirtualList(count = 1000, row_factory = row, offset = 10, limit = 3,
+                     row_height = 20, style = ["table"])
+assert lst.get_window() == (10, 13)
+tree = lst.render()
+assert created == []
+html = converter.toHTML(tree)
+assert created == [10, 11, 12]
+assert html.count("Row ") == 3
+assert 'data-count="1000"' in html and 'data-offset="10"' in html
+assert 'data-limit="3"' in html and 'data-row-height="20"' in html
+assert '<div style="height: 200px" ></div>' in html
+assert '<div style="height: 19740px" ></div>' in html
+
+# The streamed HTML is the same
+assert "".join(converter.iter_html(lst.render(), 16)) == html
+
+# The window is clamped to the list
+lst.set_window(995, 10)
+assert lst.is_dirty()
+assert lst.get_window() == (995, 1000)
+tree = UI.render_tree(lst)
+assert tree.properties()["limit"] == 5
+html = converter.toHTML(tree)
+assert html.count("Row ") == 5
+assert '<div style="height: 0px" ></div>' in html
+lst.set_window(2000)
+assert lst.get_window() == (1000, 1000)
+assert "Row " not in converter.toHTML(lst.render())
+
+# Without limit, all the rows after offset are rendered
+lst = UI.VirtualList(count = 4, row_factory = row, offset = 1)
+assert converter.toHTML(lst.render()).count("Row ") == 3
+lst.set_count(6)
+assert lst.get_count() == 6
+assert converter.toHTML(lst.render()).count("Row ") == 5
+
+# The rows use the window of the render, even if it changes later
+lst = UI.VirtualList(count = 100, row_factory = row, offset = 0, limit = 2)
+tree = lst.render()
+lst.set_window(50, 3)
+html = converter.toHTML(tree)
+assert 'data-offset="0" data-limit="2"' in html
+assert html.count("Row ") == 2 and "Row 0" in html and "Row 1" in html
+assert converter.toHTML(lst.render()).count("Row 5") == 3
+
+# Only the window is created, even for a huge list
+created.clear()
+lst = UI.VirtualList(count = 10 ** 9, row_factory = row, offset = 5 * 10 ** 8,
+                     limit = 50)
+html = converter.toHTML(lst.render())
+assert created == list(range(5 * 10 ** 8, 5 * 10 ** 8 + 50))
+assert html.count("<span >") == 50
+
+print("VirtualList OK")